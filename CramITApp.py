@@ -21,7 +21,17 @@ Follows MVC (Model-View-Controller) pattern for clean separation of concerns:
 - View: MainWindow, Widgets
 - Controller: ActivityController
 """
+import os
 import sys
+
+# Instrumentation is decided when modules are imported, so handle the flags first:
+#   --instrument          time hot paths (debug overlay, JSON dump at exit)
+#   --profile-op NAME     also run operation NAME (e.g. controller.add_activity) under cProfile
+if "--instrument" in sys.argv or "--profile-op" in sys.argv:
+    os.environ["CRAMIT_INSTRUMENT"] = "1"
+if "--profile-op" in sys.argv[:-1]:
+    os.environ["CRAMIT_PROFILE_OP"] = sys.argv[sys.argv.index("--profile-op") + 1]
+
 from PyQt6.QtWidgets import QApplication
 from ui import MainWindow
 
@@ -31,7 +41,10 @@ def main():
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    # Write any changes still queued in the background writer
+    window.controller.close()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
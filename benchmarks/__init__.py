@@ -0,0 +1 @@
+"""Benchmarks for CramIt (run from the repository root, e.g. ``python -m benchmarks.activity_memory``)."""
@@ -0,0 +1,96 @@
+"""Memory footprint of Activity objects.
+
+Measures bytes per activity for records parsed from JSON, comparing the
+current ``Activity`` against the previous ``__dict__``-based layout without
+interned strings.
+
+Usage:
+    python -m benchmarks.activity_memory [--count N]
+"""
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from utils.models import Activity
+
+
+TYPES = ("work", "school", "hobbies")
+
+
+class DictActivity:
+    """The pre-``__slots__`` Activity layout, kept only for comparison."""
+
+    @classmethod
+    def from_dict(cls, data):
+        act = cls()
+        act.id = data.get("id")
+        act.name = data.get("name", "")
+        act.type = data.get("type", "work")
+        act.start = datetime.fromisoformat(data["start"])
+        act.end = datetime.fromisoformat(data["end"])
+        act.executed = data.get("executed", False)
+        act.category = data.get("category", "general")
+        act.subcategory = data.get("subcategory", "")
+        return act
+
+
+def make_lines(count, seed=0):
+    """Return ``count`` activity records as JSON lines, like the snapshot."""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, 8)
+    lines = []
+    for i in range(count):
+        start = base + timedelta(minutes=30 * rng.randrange(24 * 2 * 365))
+        record = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "name": f"Activity {i}",
+            "type": rng.choice(TYPES),
+            "start": start.isoformat(),
+            "end": (start + timedelta(minutes=30 * rng.randint(1, 6))).isoformat(),
+            "executed": rng.random() < 0.5,
+            "category": "general",
+            "subcategory": "",
+        }
+        lines.append(json.dumps(record))
+    return lines
+
+
+def bytes_per_activity(factory, lines):
+    """Average traced bytes retained per object built by ``factory``.
+
+    Every line is parsed separately, so string values are fresh objects
+    just as they are when loading the snapshot.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(json.loads(line)) for line in lines]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the objects is not part of the per-activity cost
+    overhead = len(objects) * 8
+    return (after - before - overhead) / len(objects)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000,
+                        help="number of activities to build (default: 100000)")
+    args = parser.parse_args()
+
+    lines = make_lines(args.count)
+    before = bytes_per_activity(DictActivity.from_dict, lines)
+    after = bytes_per_activity(Activity.from_dict, lines)
+    print(f"activities: {args.count}")
+    print(f"dict-based Activity: {before:8.1f} bytes/activity")
+    print(f"slotted Activity:    {after:8.1f} bytes/activity")
+    print(f"saved:               {before - after:8.1f} bytes/activity "
+          f"({(before - after) / before:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+"""Benchmark suite for CramIt.
+
+Times storage, controller mutations, the date_helpers statistics, the
+scheduling optimizer, ``MainWindow.refresh_ui`` and widget painting (on the Qt ``offscreen``
+platform) against synthetic histories, and writes the results as JSON.
+Passing ``--baseline`` compares against an earlier results file and exits
+with status 1 if anything got slower than ``--threshold``.
+
+Usage:
+    python -m benchmarks.run [--sizes 1000 10000 100000] [--output FILE]
+                             [--baseline FILE] [--groups storage stats ...]
+
+Storage runs in a scratch home directory, so ``~/.cramit`` is never touched.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from benchmarks.synthetic import generate_activities
+
+
+GROUPS = ("storage", "controller", "stats", "scheduler", "gui")
+DEFAULT_SIZES = (1000, 10000, 100000)
+# Mutations timed per operation type in the controller group
+MUTATIONS = 500
+# Tasks placed per run in the scheduler group
+SCHEDULER_TASKS = 300
+
+
+def _prepare_environment(backend):
+    """Point storage at a scratch home and select the Qt offscreen platform.
+
+    Must run before any module reading ``Path.home()`` is imported.
+    """
+    home = tempfile.mkdtemp(prefix="cramit-bench-")
+    os.environ["HOME"] = os.environ["USERPROFILE"] = home
+    os.environ["CRAMIT_BACKEND"] = backend
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return home
+
+
+def _summary(times, ops=1):
+    """Summarize raw timings as seconds per operation."""
+    return {
+        "median": statistics.median(times) / ops,
+        "min": min(times) / ops,
+        "runs": len(times),
+        "ops": ops,
+    }
+
+
+def measure(fn, repeat, ops=1, setup=None):
+    """Time ``fn`` ``repeat`` times.
+
+    Args:
+        fn: Callable to time
+        repeat: Number of runs
+        ops: Operations performed per call; results are per operation
+        setup: Optional untimed callable run before each call
+
+    Returns:
+        dict: median/min seconds per operation, runs and ops
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return _summary(times, ops)
+
+
+def bench_storage(activities, repeat):
+    """Snapshot save/load and single journal writes."""
+    from utils import storage
+    from utils.models import Activity
+
+    results = {}
+    results["storage.save_activities"] = measure(
+        lambda: storage.save_activities(activities), repeat)
+    results["storage.load_activities"] = measure(storage.load_activities, repeat)
+    results["storage.load_activities_json"] = measure(
+        lambda: [Activity.from_dict(r) for r in storage.iter_activity_records()], repeat)
+    week_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start -= timedelta(days=week_start.weekday())
+    results["storage.load_current_week"] = measure(
+        lambda: storage.load_activities_split(week_start)[0], repeat)
+
+    backend = storage.JsonStorage()
+    sample = activities[:MUTATIONS]
+    results["storage.journal_put"] = measure(
+        lambda: [backend.put(a) for a in sample], repeat, ops=len(sample))
+    # Fold the journal back so later groups start from a clean snapshot
+    storage.save_activities(activities)
+    return results
+
+
+def bench_controller(activities, repeat):
+    """Controller construction, single-activity mutations and conflict checks."""
+    from controllers.activity_controller import ActivityController
+
+    results = {}
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        controller = ActivityController()
+        times.append(time.perf_counter() - started)
+        controller.close()
+    results["controller.init"] = _summary(times)
+
+    # Background load as driven by ActivityLoader; each load_batch blocks the GUI thread
+    since = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    since -= timedelta(days=since.weekday())
+    batch_times = []
+    for _ in range(repeat):
+        controller = ActivityController(load=False)
+        controller.begin_loading()
+        for batch in controller.read_batches(since):
+            started = time.perf_counter()
+            controller.load_batch(batch)
+            batch_times.append(time.perf_counter() - started)
+        controller.finish_loading()
+        controller.close()
+    results["controller.load_batch"] = _summary(batch_times)
+    results["controller.load_batch.worst"] = _summary([max(batch_times)])
+
+    controller = ActivityController()
+    base = datetime.now().replace(minute=0, second=0, microsecond=0)
+    count = min(MUTATIONS, len(activities))
+    added = []
+
+    def add():
+        added.clear()
+        for i in range(count):
+            start = base + timedelta(hours=i)
+            added.append(controller.add_activity(f"Bench {i}", "work", start,
+                                                 start + timedelta(hours=1)))
+
+    def update():
+        for a in added:
+            controller.update_activity(a.id, a.name, "school", a.start,
+                                       a.end + timedelta(minutes=30), a.executed)
+
+    def toggle():
+        for a in added:
+            controller.toggle_executed(a.id)
+
+    def delete():
+        for a in added:
+            controller.delete_activity(a.id)
+
+    for name, fn in (("add_activity", add), ("update_activity", update),
+                     ("toggle_executed", toggle), ("delete_activity", delete)):
+        times = []
+        for run in range(repeat):
+            if name == "add_activity" and run:
+                delete()
+            elif name == "delete_activity" and run:
+                add()
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+        results[f"controller.{name}"] = _summary(times, count)
+    probes = [(base + timedelta(minutes=37 * i), base + timedelta(minutes=37 * i + 90))
+              for i in range(count)]
+    results["controller.conflicts"] = measure(
+        lambda: [controller.conflicts(s, e) for s, e in probes], repeat, ops=count)
+    results["controller.find_overlaps"] = measure(controller.find_overlaps, repeat)
+    results["controller.flush"] = measure(controller.flush, 1)
+    controller.close()
+    return results
+
+
+def bench_stats(activities, repeat):
+    """date_helpers statistics on the indexed controller and a plain list."""
+    from controllers.activity_controller import ActivityController
+    from utils import date_helpers
+
+    controller = ActivityController()
+    week_start, week_end = date_helpers.get_current_week_range()
+    month_start, month_end = date_helpers.get_period_range("month", datetime.now())
+    cases = {
+        "filter_activities_by_week": lambda s: date_helpers.filter_activities_by_week(s),
+        "activities_in_range.month": lambda s: date_helpers.activities_in_range(
+            s, month_start, month_end),
+        "calculate_activity_stats.week": lambda s: date_helpers.calculate_activity_stats(
+            s, week_start, week_end),
+        "calculate_stats_by_type.week": lambda s: date_helpers.calculate_stats_by_type(
+            s, "work", week_start, week_end),
+        "calculate_bucket_sums.month": lambda s: date_helpers.calculate_bucket_sums(
+            s, "day", month_start, month_end),
+        "sum_day_slices.month": lambda s: date_helpers.sum_day_slices(
+            s, month_start, month_end),
+    }
+    for period in ("day", "week", "month", "year"):
+        cases[f"calculate_period_stats.{period}"] = (
+            lambda s, p=period: date_helpers.calculate_period_stats(s, p))
+
+    results = {}
+    for source_name, source in (("controller", controller), ("list", activities)):
+        for name, fn in cases.items():
+            results[f"stats.{source_name}.{name}"] = measure(lambda: fn(source), repeat)
+    controller.close()
+    return results
+
+
+def bench_scheduler(activities, repeat):
+    """Fit pending tasks into the free time of the next two weeks."""
+    import random
+    from controllers.activity_controller import ActivityController
+    from utils.scheduler import Task, schedule
+
+    rng = random.Random(0)
+    now = datetime.now()
+    tasks = [Task(f"Task {i}", timedelta(minutes=15 * rng.randint(2, 8)),
+                  rng.choice(("work", "school", "hobbies")),
+                  deadline=now + timedelta(days=rng.randint(1, 14)),
+                  allowed_hours=(8, 20), priority=rng.randint(0, 3))
+             for i in range(SCHEDULER_TASKS)]
+    controller = ActivityController()
+    results = {}
+    for source_name, source in (("controller", controller), ("list", activities)):
+        results[f"scheduler.{source_name}.schedule"] = measure(
+            lambda: schedule(tasks, source, start=now), repeat)
+    controller.close()
+    return results
+
+
+def bench_gui(activities, repeat):
+    """Window startup, refresh_ui and widget painting."""
+    from PyQt6.QtWidgets import QApplication
+    from ui import MainWindow
+    from widgets.timeline_widget import WeekTimelineWidget
+    from widgets.donut_widget import DonutWidget
+    from utils.colors import ACTIVITY_COLORS
+
+    app = QApplication.instance() or QApplication([])
+    results = {}
+
+    first_batch, loaded = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        window = MainWindow()
+        window.show()
+        while not len(window.controller):
+            app.processEvents()
+        first_batch.append(time.perf_counter() - started)
+        while window.controller.is_loading():
+            app.processEvents()
+        loaded.append(time.perf_counter() - started)
+        window.close()
+        window.controller.close()
+    results["gui.startup_first_batch"] = _summary(first_batch)
+    results["gui.startup_loaded"] = _summary(loaded)
+
+    window = MainWindow()
+    window.show()
+    while window.controller.is_loading():
+        app.processEvents()
+
+    def refresh():
+        window.refresh_ui()
+        app.processEvents()  # the hub recomputes its visible page on the next pass
+
+    results["gui.refresh_ui"] = measure(refresh, repeat)
+
+    timeline = WeekTimelineWidget()
+    timeline.resize(1000, 520)
+    results["paint.timeline.set_activities"] = measure(
+        lambda: timeline.set_activities(window.controller), repeat)
+    results["paint.timeline.first"] = measure(
+        timeline.grab, repeat,
+        setup=lambda: setattr(timeline, "_static_layer", None))
+    results["paint.timeline"] = measure(timeline.grab, repeat)
+
+    donut = DonutWidget("Work", ACTIVITY_COLORS["work"])
+    donut.set_values(12.5, 20.0)
+    results["paint.donut"] = measure(donut.grab, repeat)
+
+    window.close()
+    window.controller.close()
+    return results
+
+
+def run(sizes, groups, repeat, seed):
+    """Run the selected groups for every size; returns the results dict."""
+    from utils.storage import get_backend
+
+    results = {}
+    for size in sizes:
+        print(f"== {size} activities", file=sys.stderr)
+        activities = generate_activities(size, seed=seed)
+        backend = get_backend()
+        backend.save_all(activities)
+        backend.close()
+        size_results = results[str(size)] = {}
+        for group in groups:
+            started = time.perf_counter()
+            size_results.update(BENCHMARKS[group](activities, repeat))
+            print(f"   {group}: {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return results
+
+
+BENCHMARKS = {
+    "storage": bench_storage,
+    "controller": bench_controller,
+    "stats": bench_stats,
+    "scheduler": bench_scheduler,
+    "gui": bench_gui,
+}
+
+
+def _metadata(args):
+    from utils.columnar import HAS_NUMPY
+    from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "numpy": HAS_NUMPY,
+        "backend": args.backend,
+        "repeat": args.repeat,
+        "seed": args.seed,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison with a baseline results dict.
+
+    Returns:
+        list: (size, name, ratio) for every benchmark slower than ``threshold``
+    """
+    regressions = []
+    for size, entries in results.items():
+        base_entries = baseline.get("results", {}).get(size, {})
+        for name, entry in entries.items():
+            base = base_entries.get(name)
+            if base is None or not base["median"]:
+                continue
+            ratio = entry["median"] / base["median"]
+            flag = ""
+            if ratio > threshold:
+                flag = "  SLOWER"
+                regressions.append((size, name, ratio))
+            elif ratio < 1 / threshold:
+                flag = "  faster"
+            print(f"{size:>8} {name:<48} {base['median'] * 1e3:10.3f}ms -> "
+                  f"{entry['median'] * 1e3:10.3f}ms  x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the CramIt benchmark suite.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="history sizes to generate (default: 1000 10000 100000)")
+    parser.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS),
+                        help="benchmark groups to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic data")
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json",
+                        help="storage backend to benchmark (default: json)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression (default: 1.25)")
+    args = parser.parse_args()
+
+    home = _prepare_environment(args.backend)
+    try:
+        results = run(args.sizes, args.groups, args.repeat, args.seed)
+        report = {"meta": _metadata(args), "results": results}
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than x{args.threshold}",
+                  file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Synthetic activity histories for benchmarks.
+
+Activities are spread over a history sized to the requested count (about
+eight per day) that ends two weeks from today, so the current week, month
+and year always hold data.
+"""
+import math
+import random
+import uuid
+from datetime import datetime, timedelta
+from utils.models import Activity
+
+
+# (type, share of activities)
+TYPE_MIX = (("work", 0.5), ("school", 0.3), ("hobbies", 0.2))
+ACTIVITIES_PER_DAY = 8
+# Share of activities spanning one to three days (trips, events)
+MULTI_DAY_SHARE = 0.02
+# Share of past activities marked as executed
+EXECUTED_SHARE = 0.7
+
+
+def _duration(rng):
+    """Return a realistic duration: mostly 30 min to 3 h, some multi-day."""
+    if rng.random() < MULTI_DAY_SHARE:
+        return timedelta(hours=rng.randint(24, 72))
+    # Log-normal around 90 minutes, rounded to quarter hours, 15 min to 8 h
+    minutes = rng.lognormvariate(math.log(90), 0.5)
+    minutes = min(max(15, round(minutes / 15) * 15), 8 * 60)
+    return timedelta(minutes=minutes)
+
+
+def generate_activities(count, seed=0, now=None):
+    """Generate ``count`` reproducible activities.
+
+    Args:
+        count: Number of activities (1k to 1M are typical)
+        seed: Random seed; the same seed always yields the same history
+        now: Reference time; defaults to the current time
+
+    Returns:
+        list: Activity objects in random order
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    days = max(28, count // ACTIVITIES_PER_DAY)
+    first_day = today - timedelta(days=days - 14)
+    types = [name for name, _ in TYPE_MIX]
+    weights = [share for _, share in TYPE_MIX]
+
+    activities = []
+    for i in range(count):
+        activity_type = rng.choices(types, weights)[0]
+        start = first_day + timedelta(days=rng.randrange(days),
+                                      hours=rng.randint(6, 21),
+                                      minutes=15 * rng.randrange(4))
+        end = start + _duration(rng)
+        activities.append(Activity(
+            name=f"{activity_type.title()} {i}",
+            activity_type=activity_type,
+            start=start,
+            end=end,
+            executed=end < now and rng.random() < EXECUTED_SHARE,
+            activity_id=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        ))
+    return activities
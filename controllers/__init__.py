@@ -1,4 +1,9 @@
 """Controllers package for CramIt application."""
 from .activity_controller import ActivityController
+from .events import (ChangeEvent, ActivityAdded, ActivitiesAdded, ActivityUpdated,
+                     ActivityRemoved, ActivitiesChanged, RecurrenceChanged,
+                     RecurrencesRemoved, ActivitiesReset)
 
-__all__ = ['ActivityController']
+__all__ = ['ActivityController', 'ChangeEvent', 'ActivityAdded', 'ActivitiesAdded',
+           'ActivityUpdated', 'ActivityRemoved', 'ActivitiesChanged', 'RecurrenceChanged',
+           'RecurrencesRemoved', 'ActivitiesReset']
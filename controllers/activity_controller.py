@@ -1,7 +1,20 @@
 """Activity controller - handles business logic for activity management."""
+from contextlib import contextmanager
+from itertools import islice
 from PyQt6.QtWidgets import QMessageBox
 from utils.models import Activity
-from utils.storage import load_activities, save_activities
+from utils.storage import get_backend
+from utils.writer import BackgroundWriter
+from utils.interval_index import IntervalIndex
+from utils.columnar import ColumnarStore, HAS_NUMPY
+from utils.aggregates import AggregateCache
+from utils.busy_index import BusyIndex
+from utils.recurrence import (RecurrenceRule, ExpansionCache, OVERRIDE_FIELDS,
+                              split_occurrence_id)
+from controllers.events import (ActivityAdded, ActivitiesAdded, ActivityUpdated,
+                                ActivityRemoved, ActivitiesChanged, RecurrenceChanged,
+                                RecurrencesRemoved, ActivitiesReset)
+from utils.instrumentation import timed
 
 
 class ActivityController:
@@ -10,24 +23,402 @@ class ActivityController:
     Separates business logic from UI concerns following MVC pattern.
     """
     
-    def __init__(self):
-        """Initialize controller and load activities from storage."""
-        self.activities = load_activities()
+    @timed("controller.init")
+    def __init__(self, storage=None, load=True):
+        """Initialize controller and load activities from storage.
+        
+        Args:
+            storage: StorageBackend to use; defaults to the configured backend
+            load: If False, start empty; activities are then delivered with
+                begin_loading/load_batch/finish_loading (e.g. from a worker
+                thread reading read_batches)
+        """
+        self._storage = storage or get_backend()
         self._observers = []
+        self._error_observers = []
+        # Errors reported before any error observer is registered (e.g. while
+        # loading in this constructor), replayed to the first one
+        self._pending_errors = []
+        self._storage.set_error_handler(self._report_error)
+        loaded = self._storage.load() if load else []
+        self._loading = False
+        self._removed_while_loading = set()
+        # State of an open batch(): nesting depth, queued writes and changes
+        self._batch_depth = 0
+        self._batch_writes = {}     # id -> Activity, or None for a delete
+        self._batch_added = {}
+        self._batch_updated = {}
+        self._batch_removed = {}
+        self._build_store(loaded)
+        self._writer = BackgroundWriter(self._storage, on_error=self._report_error)
+    
+    def _build_store(self, activities):
+        """(Re)build the in-memory store and its indexes from ``activities``."""
+        # id -> Activity; dicts keep insertion order, so this is also the ordered storage
+        self._activities = {a.id: a for a in activities}
+        self._index = IntervalIndex(self._activities.values())
+        # Vectorized statistics, built on first use of ``columns``
+        self._columns = None
+        # Running totals per day/week/month/year bucket for the dashboards
+        self.aggregates = AggregateCache(self._activities.values())
+        # Per-day busy bitmaps for conflict checks while an activity is edited
+        self.busy = BusyIndex(self._activities.values())
+        # Recurrence rules are few and small, so they are always read up front;
+        # their occurrences are expanded per queried window
+        self._rules = {r.id: r for r in self._storage.load_rules()}
+        self._expanded = ExpansionCache()
     
     def add_observer(self, callback):
-        """Register a callback to be notified when activities change."""
+        """Register a callback to be notified when activities change.
+        
+        The callback receives a ChangeEvent describing the change.
+        """
         self._observers.append(callback)
     
-    def _notify_observers(self):
-        """Notify all observers that activities have changed."""
+    def add_error_observer(self, callback):
+        """Register a callback receiving storage error messages.
+        
+        Callbacks may be invoked from the writer, loader or compaction
+        threads, so UI code must forward the message to the GUI thread
+        (e.g. through a signal). Messages reported before the first
+        observer was added are delivered to it right away.
+        """
+        self._error_observers.append(callback)
+        pending, self._pending_errors = self._pending_errors, []
+        for message in pending:
+            callback(message)
+    
+    def _report_error(self, message):
+        """Forward a storage error to error observers, or keep it for the first one."""
+        if not self._error_observers:
+            self._pending_errors.append(message)
+        for callback in self._error_observers:
+            callback(message)
+    
+    def flush(self):
+        """Block until all pending changes are written to storage."""
+        self._writer.flush()
+    
+    def close(self):
+        """Write pending changes and release storage; call on exit."""
+        self._writer.close()
+        self._storage.close()
+    
+    def _notify_observers(self, event):
+        """Notify all observers of a change event."""
         for callback in self._observers:
-            callback()
+            callback(event)
+    
+    def read_batches(self, since, batch_size=5000):
+        """Yield stored activities in batches, recent ones first.
+        
+        Only reads storage, so it can run on a worker thread; the batches
+        must be handed to load_batch on the thread owning the controller.
+        
+        Args:
+            since: datetime; the first batch holds every activity ending at
+                or after it, later batches the older ones
+            batch_size: Size of the batches after the first
+        """
+        recent, older = self._storage.load_split(since)
+        yield recent
+        while True:
+            batch = list(islice(older, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    def is_loading(self):
+        """Return True between begin_loading and finish_loading."""
+        return self._loading
+    
+    def begin_loading(self):
+        """Replace the in-memory store with activities delivered in batches.
+        
+        Pending writes are flushed, the store is emptied (rules are read
+        again) and observers receive ActivitiesReset; load_batch then fills
+        it. Works both right after construction and as a full reload.
+        Edits made meanwhile apply in memory right away, but their writes
+        are held until finish_loading so storage does not change under the
+        reader.
+        """
+        self._writer.flush()
+        self._build_store(())
+        self._loading = True
+        self._writer.hold()
+        self._notify_observers(ActivitiesReset(self))
+    
+    @timed("controller.load_batch")
+    def load_batch(self, activities):
+        """Add a batch of loaded activities and notify observers once.
+        
+        Activities already present (re-created by an edit) or deleted
+        since loading began are skipped.
+        """
+        batch = [a for a in activities
+                 if a.id not in self._activities and a.id not in self._removed_while_loading]
+        self._register_many(batch)
+        if batch:
+            self._notify_observers(ActivitiesAdded(batch))
+        return len(batch)
+    
+    def finish_loading(self):
+        """End batch loading and write the changes queued meanwhile."""
+        self._loading = False
+        self._removed_while_loading.clear()
+        self._writer.resume()
+    
+    def _register(self, activity):
+        """Add an activity to the lookup table, index and aggregates."""
+        self._activities[activity.id] = activity
+        self._index.add(activity)
+        if self._columns is not None:
+            self._columns.add(activity)
+        self.aggregates.add(activity)
+        self.busy.add(activity)
+    
+    def _register_many(self, activities):
+        """Register several activities, sorting the interval index only once."""
+        for activity in activities:
+            self._activities[activity.id] = activity
+            if self._columns is not None:
+                self._columns.add(activity)
+            self.aggregates.add(activity)
+            self.busy.add(activity)
+        self._index.add_many(activities)
+    
+    @property
+    def columns(self):
+        """Columnar copy of the activities for vectorized statistics.
+        
+        Built from the loaded activities the first time it is read and
+        kept in sync by later mutations; None without NumPy, in which case
+        date_helpers falls back to plain iteration.
+        """
+        if self._columns is None and HAS_NUMPY:
+            self._columns = ColumnarStore(self._activities.values())
+        return self._columns
+    
+    def __len__(self):
+        """Number of activities currently loaded."""
+        return len(self._activities)
     
     def get_activities(self):
-        """Get all activities."""
-        return self.activities
+        """Get all activities in insertion order."""
+        return list(self._activities.values())
+    
+    def get_activity(self, activity_id):
+        """Get an activity by ID in constant time, or None if not found.
+        
+        Occurrence IDs of recurrence rules (``<rule id>@<date>``) return the
+        expanded occurrence.
+        """
+        activity = self._activities.get(activity_id)
+        if activity is None and self._rules:
+            return self._find_occurrence(activity_id)
+        return activity
+    
+    def activities_in_range(self, start, end):
+        """Get activities overlapping the half-open range [start, end).
+        
+        Answered from the interval index, so the cost scales with the
+        number of matches rather than the size of the history. Occurrences
+        of recurrence rules in the range are included.
+        """
+        found = self._index.overlapping(start, end)
+        if self._rules:
+            found = found + self.occurrences_in_range(start, end)
+        return found
+    
+    def activities_starting_in(self, start, end):
+        """Get activities (occurrences included) whose start lies in [start, end)."""
+        found = self._index.starting_in(start, end)
+        if self._rules:
+            found = found + self.occurrences_starting_in(start, end)
+        return found
+    
+    def occurrences_in_range(self, start, end):
+        """Get occurrences of all recurrence rules overlapping [start, end).
+        
+        Windows are expanded on first use and kept in an LRU cache until a
+        rule changes; callers must not modify the returned list.
+        """
+        if not self._rules:
+            return []
+        return self._expanded.get(start, end, self._expand)
+    
+    def occurrences_starting_in(self, start, end):
+        """Get occurrences of all recurrence rules starting in [start, end)."""
+        return [a for a in self.occurrences_in_range(start, end) if a.start >= start]
+    
+    @timed("controller.expand_recurrences")
+    def _expand(self, start, end):
+        """Expand every rule over [start, end), sorted by start."""
+        occurrences = []
+        for rule in self._rules.values():
+            occurrences.extend(rule.occurrences(start, end))
+        occurrences.sort(key=lambda a: a.start)
+        return occurrences
+    
+    def _find_occurrence(self, activity_id):
+        """Return the occurrence with ``activity_id``, or None."""
+        parts = split_occurrence_id(activity_id)
+        if parts is None:
+            return None
+        rule = self._rules.get(parts[0])
+        return rule.occurrence_on(parts[1]) if rule else None
+    
+    @timed("controller.conflicts")
+    def conflicts(self, start, end, exclude_id=None):
+        """Get the activities overlapping [start, end), occurrences included.
+        
+        Answered from the busy bitmaps, so it is cheap enough to call on
+        every edit of a start/end field.
+        
+        Args:
+            start: Start of the range
+            end: End of the range
+            exclude_id: Activity (or recurrence rule, for all its
+                occurrences) being edited, which never conflicts with itself
+            
+        Returns:
+            List of Activity objects sorted by start
+        """
+        found = [self._activities[i] for i in self.busy.conflicts(start, end, exclude_id)]
+        for occurrence in self.occurrences_in_range(start, end):
+            parts = split_occurrence_id(occurrence.id)
+            if occurrence.id != exclude_id and parts[0] != exclude_id and occurrence.end > start:
+                found.append(occurrence)
+        found.sort(key=lambda a: a.start)
+        return found
+    
+    @timed("controller.find_overlaps")
+    def find_overlaps(self):
+        """Find every pair of overlapping stored activities in one pass.
+        
+        Returns:
+            List of (Activity, Activity) pairs
+        """
+        return [(self._activities[a], self._activities[b])
+                for a, b in self.busy.overlapping_pairs()]
+    
+    def get_recurrences(self):
+        """Get all recurrence rules."""
+        return list(self._rules.values())
+    
+    def get_recurrence(self, rule_id):
+        """Get a recurrence rule by ID, or None if not found."""
+        return self._rules.get(rule_id)
+    
+    @timed("controller.add_recurrence")
+    def add_recurrence(self, name, activity_type, start, end, freq, interval=1,
+                       by_weekday=None, until=None, count=None):
+        """Add a recurring activity.
+        
+        Args:
+            name: Activity name
+            activity_type: Type of activity (work, school, hobbies)
+            start: Start datetime of the first occurrence
+            end: End datetime of the first occurrence
+            freq: 'daily', 'weekly' or 'monthly'
+            interval: Repeat every ``interval`` days/weeks/months
+            by_weekday: Weekly only: weekdays (0 = Monday) to repeat on
+            until: Optional datetime after which no occurrence starts
+            count: Optional total number of occurrences
+            
+        Returns:
+            The created RecurrenceRule
+        """
+        rule = RecurrenceRule(name=name, activity_type=activity_type, start=start, end=end,
+                              freq=freq, interval=interval, by_weekday=by_weekday,
+                              until=until, count=count)
+        self._rules[rule.id] = rule
+        self._save_rules_and_notify(RecurrenceChanged(rule))
+        return rule
     
+    @timed("controller.update_recurrence")
+    def update_recurrence(self, rule_id, name, activity_type, start, end, freq, interval=1,
+                          by_weekday=None, until=None, count=None):
+        """Change a whole series; skipped and overridden occurrences are kept.
+        
+        Takes the same arguments as add_recurrence.
+        
+        Returns:
+            True if the rule was found and updated, False otherwise
+        """
+        old = self._rules.get(rule_id)
+        if old is None:
+            return False
+        rule = RecurrenceRule(name=name, activity_type=activity_type, start=start, end=end,
+                              freq=freq, interval=interval, by_weekday=by_weekday,
+                              until=until, count=count, exceptions=old.exceptions,
+                              overrides=old.overrides, rule_id=rule_id,
+                              category=old.category, subcategory=old.subcategory)
+        self._rules[rule_id] = rule
+        self._save_rules_and_notify(RecurrenceChanged(rule))
+        return True
+    
+    def delete_recurrence(self, rule_id):
+        """Delete a recurrence rule and all its occurrences.
+        
+        Returns:
+            True if the rule was found and deleted, False otherwise
+        """
+        return self.delete_recurrences([rule_id]) == 1
+    
+    @timed("controller.delete_recurrences")
+    def delete_recurrences(self, rule_ids):
+        """Delete several recurrence rules with one write and one notification.
+        
+        Returns:
+            Number of rules found and deleted
+        """
+        removed = [rule for rule in (self._rules.pop(rule_id, None) for rule_id in rule_ids)
+                   if rule is not None]
+        if removed:
+            self._save_rules_and_notify(RecurrencesRemoved(removed))
+        return len(removed)
+    
+    def skip_occurrence(self, activity_id):
+        """Remove a single occurrence from its series.
+        
+        Returns:
+            True if the occurrence was found and skipped, False otherwise
+        """
+        occurrence = self._find_occurrence(activity_id)
+        if occurrence is None:
+            return False
+        rule_id, day = split_occurrence_id(activity_id)
+        rule = self._rules[rule_id]
+        rule.exceptions.add(day)
+        rule.overrides.pop(day, None)
+        self._save_rules_and_notify(RecurrenceChanged(rule))
+        return True
+    
+    @timed("controller.override_occurrence")
+    def override_occurrence(self, activity_id, **fields):
+        """Change a single occurrence of a series, e.g. mark it executed.
+        
+        Args:
+            activity_id: Occurrence ID (``<rule id>@<date>``)
+            **fields: Any of name, start, end, executed
+            
+        Returns:
+            True if the occurrence was found and changed, False otherwise
+        """
+        unknown = set(fields) - set(OVERRIDE_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot override occurrence fields: {', '.join(sorted(unknown))}")
+        occurrence = self._find_occurrence(activity_id)
+        if occurrence is None:
+            return False
+        rule_id, day = split_occurrence_id(activity_id)
+        rule = self._rules[rule_id]
+        rule.overrides.setdefault(day, {}).update(fields)
+        self._save_rules_and_notify(RecurrenceChanged(rule))
+        return True
+    
+    @timed("controller.add_activity")
     def add_activity(self, name, activity_type, start, end, executed=False):
         """Add a new activity.
         
@@ -48,10 +439,11 @@ class ActivityController:
             end=end,
             executed=executed
         )
-        self.activities.append(activity)
-        self._save_and_notify()
+        self._register(activity)
+        self._save_and_notify(ActivityAdded(activity))
         return activity
     
+    @timed("controller.update_activity")
     def update_activity(self, activity_id, name, activity_type, start, end, executed):
         """Update an existing activity.
         
@@ -70,15 +462,23 @@ class ActivityController:
         if not activity:
             return False
         
+        old = activity.copy()
         activity.name = name
         activity.type = activity_type
         activity.start = start
         activity.end = end
         activity.executed = executed
+        self._index.update(activity)
+        if self._columns is not None:
+            self._columns.update(activity)
+        self.aggregates.remove(old)
+        self.aggregates.add(activity)
+        self.busy.update(activity)
         
-        self._save_and_notify()
+        self._save_and_notify(ActivityUpdated(old, activity))
         return True
     
+    @timed("controller.delete_activity")
     def delete_activity(self, activity_id):
         """Delete an activity.
         
@@ -88,36 +488,197 @@ class ActivityController:
         Returns:
             True if activity was found and deleted, False otherwise
         """
-        initial_count = len(self.activities)
-        self.activities = [a for a in self.activities if a.id != activity_id]
+        activity = self._activities.pop(activity_id, None)
+        if activity is None:
+            return False
         
-        if len(self.activities) < initial_count:
-            self._save_and_notify()
-            return True
-        return False
+        if self._loading:
+            self._removed_while_loading.add(activity_id)
+        self._index.remove(activity_id)
+        if self._columns is not None:
+            self._columns.remove(activity_id)
+        self.aggregates.remove(activity)
+        self.busy.remove(activity_id)
+        self._save_and_notify(ActivityRemoved(activity))
+        return True
     
+    @timed("controller.toggle_executed")
     def toggle_executed(self, activity_id):
         """Toggle the executed status of an activity.
         
         Args:
-            activity_id: ID of activity to toggle
+            activity_id: ID of activity to toggle; for an occurrence of a
+                recurrence rule only that occurrence is toggled
             
         Returns:
             True if activity was found and toggled, False otherwise
         """
         activity = self._find_activity(activity_id)
         if not activity:
-            return False
+            occurrence = self._find_occurrence(activity_id) if self._rules else None
+            if occurrence is None:
+                return False
+            return self.override_occurrence(activity_id, executed=not occurrence.executed)
         
+        old = activity.copy()
         activity.executed = not activity.executed
-        self._save_and_notify()
+        if self._columns is not None:
+            self._columns.update(activity)
+        self.aggregates.remove(old)
+        self.aggregates.add(activity)
+        self._save_and_notify(ActivityUpdated(old, activity))
         return True
     
+    @contextmanager
+    def batch(self):
+        """Group mutations into one storage write and one notification.
+        
+        Inside the block every mutation updates the in-memory state
+        immediately, but writes and observer notifications are held back.
+        On exit the changes are queued as one batch for the writer and
+        observers receive a single ActivitiesChanged event. Batches nest;
+        only the outermost one flushes.
+        
+        Example:
+            with controller.batch():
+                for activity_id in ids:
+                    controller.toggle_executed(activity_id)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._end_batch()
+    
+    def _record_batch_change(self, event):
+        """Fold a change event into the open batch."""
+        activity = event.activity
+        activity_id = activity.id
+        if isinstance(event, ActivityAdded):
+            self._batch_added[activity_id] = activity
+            self._batch_writes[activity_id] = activity
+        elif isinstance(event, ActivityUpdated):
+            if activity_id not in self._batch_added:
+                self._batch_updated[activity_id] = activity
+            self._batch_writes[activity_id] = activity
+        elif isinstance(event, ActivityRemoved):
+            if self._batch_added.pop(activity_id, None) is None:
+                self._batch_updated.pop(activity_id, None)
+                self._batch_removed[activity_id] = activity
+            self._batch_writes[activity_id] = None
+    
+    def _end_batch(self):
+        """Write and announce everything recorded by the closing batch."""
+        writes, self._batch_writes = self._batch_writes, {}
+        added, self._batch_added = list(self._batch_added.values()), {}
+        updated, self._batch_updated = list(self._batch_updated.values()), {}
+        removed, self._batch_removed = list(self._batch_removed.values()), {}
+        self._writer.write_many([a for a in writes.values() if a is not None],
+                                [i for i, a in writes.items() if a is None])
+        if added or updated or removed:
+            self._notify_observers(ActivitiesChanged(added, updated, removed))
+    
+    @timed("controller.add_many")
+    def add_many(self, entries):
+        """Add several activities with one write and one notification.
+        
+        Args:
+            entries: Iterable of dicts with add_activity's keyword arguments
+                (name, activity_type, start, end and optionally executed)
+            
+        Returns:
+            List of the created Activity objects
+        """
+        with self.batch():
+            return [self.add_activity(**entry) for entry in entries]
+    
+    @timed("controller.update_many")
+    def update_many(self, changes):
+        """Update several activities with one write and one notification.
+        
+        Args:
+            changes: Dict mapping activity ID -> dict of the fields to change
+                (any of name, activity_type, start, end, executed)
+            
+        Returns:
+            Number of activities found and updated
+        """
+        updated = 0
+        with self.batch():
+            for activity_id, fields in changes.items():
+                activity = self._find_activity(activity_id)
+                if not activity:
+                    continue
+                self.update_activity(
+                    activity_id,
+                    fields.get("name", activity.name),
+                    fields.get("activity_type", activity.type),
+                    fields.get("start", activity.start),
+                    fields.get("end", activity.end),
+                    fields.get("executed", activity.executed),
+                )
+                updated += 1
+        return updated
+    
+    @timed("controller.delete_many")
+    def delete_many(self, activity_ids):
+        """Delete several activities with one write and one notification.
+        
+        Returns:
+            Number of activities found and deleted
+        """
+        with self.batch():
+            return sum(1 for activity_id in activity_ids if self.delete_activity(activity_id))
+    
+    @timed("controller.set_executed_many")
+    def set_executed_many(self, activity_ids, executed=True):
+        """Set the executed status of several activities at once.
+        
+        Activities already in the requested state are left untouched.
+        
+        Returns:
+            Number of activities whose status changed
+        """
+        changed = 0
+        with self.batch():
+            for activity_id in activity_ids:
+                activity = self._find_activity(activity_id)
+                if activity and bool(activity.executed) != bool(executed):
+                    self.toggle_executed(activity_id)
+                    changed += 1
+        return changed
+    
     def _find_activity(self, activity_id):
         """Find activity by ID."""
-        return next((a for a in self.activities if a.id == activity_id), None)
+        return self._activities.get(activity_id)
+    
+    def _save_rules_and_notify(self, event):
+        """Drop expanded windows, queue the rules for writing and notify observers.
+        
+        Rules are not part of batch(); their changes are written and
+        announced right away.
+        """
+        self._expanded.clear()
+        self._writer.save_rules(self._rules.values())
+        self._notify_observers(event)
     
-    def _save_and_notify(self):
-        """Save activities to storage and notify observers."""
-        save_activities(self.activities)
-        self._notify_observers()
+    def _save_and_notify(self, event):
+        """Queue a mutation for the background writer and notify observers.
+        
+        Single-activity changes are written as one record by the storage
+        backend. Inside batch() the change is only recorded, and written
+        and announced when the batch closes.
+        
+        Args:
+            event: ChangeEvent describing the mutation
+        """
+        if self._batch_depth:
+            self._record_batch_change(event)
+            return
+        if isinstance(event, ActivityRemoved):
+            self._writer.delete(event.activity.id)
+        else:
+            self._writer.put(event.activity)
+        self._notify_observers(event)
@@ -0,0 +1,87 @@
+"""Change events delivered to ActivityController observers."""
+
+
+class ChangeEvent:
+    """Base class for activity change notifications."""
+
+
+class ActivityAdded(ChangeEvent):
+    """A new activity was added."""
+    
+    def __init__(self, activity):
+        self.activity = activity
+
+
+class ActivitiesAdded(ChangeEvent):
+    """Several activities were added at once (e.g. a batch from the background loader)."""
+    
+    def __init__(self, activities):
+        self.activities = activities
+
+
+class ActivityUpdated(ChangeEvent):
+    """An activity changed.
+    
+    Attributes:
+        old: Copy of the activity before the change
+        activity: The (live) activity after the change
+    """
+    
+    def __init__(self, old, activity):
+        self.old = old
+        self.activity = activity
+
+
+class ActivityRemoved(ChangeEvent):
+    """An activity was deleted."""
+    
+    def __init__(self, activity):
+        self.activity = activity
+
+
+class ActivitiesChanged(ChangeEvent):
+    """Several activities changed in one ActivityController.batch().
+    
+    Attributes:
+        added: Activities added (and still present) during the batch
+        updated: Pre-existing activities changed during the batch
+        removed: Pre-existing activities deleted during the batch
+    """
+    
+    def __init__(self, added, updated, removed):
+        self.added = added
+        self.updated = updated
+        self.removed = removed
+
+
+class ActivitiesReset(ChangeEvent):
+    """The whole dataset was replaced; observers should rebuild from ``source``.
+    
+    Attributes:
+        source: The ActivityController (or other source) to rebuild from
+    """
+    
+    def __init__(self, source):
+        self.source = source
+
+
+class RecurrenceChanged(ChangeEvent):
+    """A recurrence rule was added or edited, or one of its occurrences changed.
+    
+    Attributes:
+        rule: The (live) RecurrenceRule
+    """
+    
+    def __init__(self, rule):
+        self.rule = rule
+
+
+class RecurrencesRemoved(ChangeEvent):
+    """One or more recurrence rules and all their occurrences were deleted.
+    
+    Attributes:
+        rules: The deleted RecurrenceRule objects
+    """
+    
+    def __init__(self, rules):
+        self.rules = rules
@@ -0,0 +1,39 @@
+"""Background loading of stored activities."""
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class ActivityLoader(QThread):
+    """Reads activities on a worker thread and emits them in batches.
+
+    The first batch holds the activities ending at or after ``since`` (the
+    current week) so it can be shown right away; older history follows in
+    ``batch_size`` chunks. Batches arrive through queued signals, so slots
+    run on the GUI thread and may hand them straight to
+    ``ActivityController.load_batch``.
+    """
+
+    batch_loaded = pyqtSignal(list)
+    load_failed = pyqtSignal(str)
+
+    def __init__(self, controller, since, batch_size=5000, parent=None):
+        """Create the loader; call start() to begin reading.
+
+        Args:
+            controller: ActivityController whose storage is read
+            since: datetime separating the first batch from older history
+            batch_size: Number of activities per later batch
+            parent: Optional QObject parent
+        """
+        super().__init__(parent)
+        self.controller = controller
+        self.since = since
+        self.batch_size = batch_size
+
+    def run(self):
+        try:
+            for batch in self.controller.read_batches(self.since, self.batch_size):
+                if self.isInterruptionRequested():
+                    return
+                self.batch_loaded.emit(batch)
+        except Exception as e:
+            self.load_failed.emit(f"Error loading activities: {e}")
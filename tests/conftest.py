@@ -0,0 +1,71 @@
+"""Shared fixtures; the app imports its packages from the repository root."""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.storage as storage  # noqa: E402
+from utils.storage import StorageBackend  # noqa: E402
+
+
+class MemoryStorage(StorageBackend):
+    """StorageBackend keeping copies of everything in memory and logging writes."""
+
+    def __init__(self, activities=()):
+        self.activities = {a.id: a.copy() for a in activities}
+        self.rules = []
+        self.batches = []   # (put IDs, deleted IDs) per write_batch call
+
+    def load(self):
+        return [a.copy() for a in self.activities.values()]
+
+    def put(self, activity):
+        self.write_batch([activity], [])
+
+    def delete(self, activity_id):
+        self.write_batch([], [activity_id])
+
+    def save_all(self, activities):
+        self.activities = {a.id: a.copy() for a in activities}
+
+    def write_batch(self, puts, deletes):
+        self.batches.append(([a.id for a in puts], list(deletes)))
+        for activity in puts:
+            self.activities[activity.id] = activity.copy()
+        for activity_id in deletes:
+            self.activities.pop(activity_id, None)
+
+    def load_rules(self):
+        return [rule.copy() for rule in self.rules]
+
+    def save_rules(self, rules):
+        self.rules = [rule.copy() for rule in rules]
+
+
+@pytest.fixture
+def storage_dir(tmp_path, monkeypatch):
+    """Point the JSON storage module at a temporary directory."""
+    monkeypatch.setattr(storage, "STORAGE_DIR", tmp_path)
+    monkeypatch.setattr(storage, "SNAPSHOT_FILE", tmp_path / "activities.jsonl")
+    monkeypatch.setattr(storage, "BINARY_SNAPSHOT_FILE", tmp_path / "activities.bin")
+    monkeypatch.setattr(storage, "ACTIVITIES_FILE", tmp_path / "activities.json")
+    monkeypatch.setattr(storage, "JOURNAL_FILE", tmp_path / "activities.journal")
+    monkeypatch.setattr(storage, "COMPACTING_FILE", tmp_path / "activities.journal.compacting")
+    monkeypatch.setattr(storage, "RECURRENCES_FILE", tmp_path / "recurrences.json")
+    yield tmp_path
+    storage.set_error_handler(None)
+
+
+@pytest.fixture
+def storage_errors(storage_dir):
+    """Collect the messages the storage module reports instead of printing them."""
+    errors = []
+    storage.set_error_handler(errors.append)
+    return errors
+
+
+@pytest.fixture
+def memory_storage():
+    return MemoryStorage()
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.binary_snapshot import (HEADER, BinarySnapshot, BinarySnapshotWriter,
+                                   SnapshotFormatError)
+from utils.models import Activity
+
+
+def sample_activities():
+    base = datetime(2026, 3, 1, 8, 30, 15, 250)
+    return [Activity(f"Task {i} é", ["work", "school", "hobbies"][i % 3],
+                     start=base + timedelta(days=i), end=base + timedelta(days=i, hours=2),
+                     executed=i % 2 == 0, activity_id=f"id-{i}", category="general",
+                     subcategory="sub" if i % 4 else "")
+            for i in range(10)]
+
+
+@pytest.fixture
+def snapshot_files(tmp_path):
+    """Write a JSON stand-in and a binary snapshot of sample_activities()."""
+    source = tmp_path / "activities.jsonl"
+    source.write_text("placeholder\n")
+    path = tmp_path / "activities.bin"
+    writer = BinarySnapshotWriter()
+    for activity in sample_activities():
+        writer.add(activity.to_dict())
+    writer.write(path, source.stat())
+    return path, source
+
+
+def test_round_trip(snapshot_files):
+    path, source = snapshot_files
+    snapshot = BinarySnapshot(path, source.stat())
+    try:
+        expected = [a.to_dict() for a in sample_activities()]
+        assert len(snapshot) == len(expected)
+        assert [a.to_dict() for a in snapshot] == expected
+        assert snapshot.activity(3).to_dict() == expected[3]
+    finally:
+        snapshot.close()
+
+
+def test_split_by_end(snapshot_files):
+    path, source = snapshot_files
+    snapshot = BinarySnapshot(path, source.stat())
+    try:
+        since = sample_activities()[6].end
+        recent, older = snapshot.split_by_end(since)
+        assert list(recent) == [6, 7, 8, 9]
+        assert list(older) == [0, 1, 2, 3, 4, 5]
+    finally:
+        snapshot.close()
+
+
+def test_corrupted_body_fails_checksum(snapshot_files):
+    path, source = snapshot_files
+    data = bytearray(path.read_bytes())
+    data[HEADER.size + 20] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotFormatError, match="checksum"):
+        BinarySnapshot(path, source.stat())
+
+
+def test_changed_source_makes_snapshot_stale(snapshot_files):
+    path, source = snapshot_files
+    source.write_text("placeholder, edited\n")
+    with pytest.raises(SnapshotFormatError, match="out of date"):
+        BinarySnapshot(path, source.stat())
+
+
+@pytest.mark.parametrize("data, message", [
+    (b"", None),
+    (b"CRMB", "truncated header"),
+    (b"XXXX" + bytes(HEADER.size), "not a binary snapshot"),
+])
+def test_unusable_files_are_rejected(tmp_path, data, message):
+    path = tmp_path / "activities.bin"
+    path.write_bytes(data)
+    with pytest.raises(SnapshotFormatError, match=message):
+        BinarySnapshot(path, path.stat())
+
+
+def test_truncated_records_are_rejected(snapshot_files):
+    path, source = snapshot_files
+    stat = source.stat()
+    path.write_bytes(path.read_bytes()[:HEADER.size + 10])
+    with pytest.raises(SnapshotFormatError, match="truncated"):
+        BinarySnapshot(path, stat)
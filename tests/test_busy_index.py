@@ -0,0 +1,73 @@
+import random
+from datetime import datetime, timedelta
+from itertools import combinations
+
+from utils.busy_index import BusyIndex
+from utils.models import Activity
+
+DAY = datetime(2026, 5, 4)
+
+
+def act(activity_id, start, end):
+    return Activity(activity_id, start=start, end=end, activity_id=activity_id)
+
+
+def test_activity_crossing_midnight_marks_both_days():
+    index = BusyIndex([act("night", DAY.replace(hour=23), DAY + timedelta(days=1, hours=1))])
+    assert index.conflicts(DAY.replace(hour=23, minute=30), DAY.replace(hour=23, minute=45)) == ["night"]
+    assert index.conflicts(DAY + timedelta(days=1, minutes=30), DAY + timedelta(days=1, hours=2)) == ["night"]
+    assert index.conflicts(DAY + timedelta(days=1, hours=1), DAY + timedelta(days=1, hours=2)) == []
+
+
+def test_activity_ending_at_midnight_leaves_next_day_free():
+    index = BusyIndex([act("late", DAY.replace(hour=22), DAY + timedelta(days=1))])
+    assert not index.is_busy(DAY + timedelta(days=1), DAY + timedelta(days=1, minutes=5))
+    assert index.conflicts(DAY.replace(hour=23, minute=55), DAY + timedelta(days=1)) == ["late"]
+    assert DAY.date() + timedelta(days=1) not in index._bits
+
+
+def test_shared_slot_is_confirmed_against_exact_times():
+    # Both touch the 10:00-10:05 slot but do not overlap
+    index = BusyIndex([act("a", DAY.replace(hour=9), DAY.replace(hour=10, minute=2))])
+    assert index.is_busy(DAY.replace(hour=10, minute=3), DAY.replace(hour=11))
+    assert index.conflicts(DAY.replace(hour=10, minute=3), DAY.replace(hour=11)) == []
+    assert index.conflicts(DAY.replace(hour=10, minute=1), DAY.replace(hour=11)) == ["a"]
+
+
+def test_remove_rebuilds_the_day_bitmap():
+    index = BusyIndex([act("a", DAY.replace(hour=9), DAY.replace(hour=10)),
+                       act("b", DAY.replace(hour=9, minute=30), DAY.replace(hour=12))])
+    index.remove("b")
+    assert not index.is_busy(DAY.replace(hour=10), DAY.replace(hour=12))
+    assert index.is_busy(DAY.replace(hour=9), DAY.replace(hour=10))
+    index.remove("a")
+    assert len(index) == 0 and index._bits == {}
+    index.remove("missing")
+
+
+def test_update_moves_the_activity():
+    activity = act("a", DAY.replace(hour=9), DAY.replace(hour=10))
+    index = BusyIndex([activity])
+    activity.start, activity.end = DAY.replace(hour=14), DAY.replace(hour=15)
+    index.update(activity)
+    assert index.conflicts(DAY.replace(hour=9), DAY.replace(hour=10)) == []
+    assert index.conflicts(DAY.replace(hour=14), DAY.replace(hour=15)) == ["a"]
+
+
+def test_exclude_id():
+    index = BusyIndex([act("a", DAY.replace(hour=9), DAY.replace(hour=10)),
+                       act("b", DAY.replace(hour=9), DAY.replace(hour=11))])
+    assert index.conflicts(DAY.replace(hour=9), DAY.replace(hour=10), exclude_id="a") == ["b"]
+
+
+def test_overlapping_pairs_matches_brute_force():
+    rng = random.Random(7)
+    activities = []
+    for i in range(200):
+        start = DAY + timedelta(minutes=rng.randrange(0, 7 * 24 * 60))
+        activities.append(act(str(i), start, start + timedelta(minutes=rng.randrange(1, 600))))
+    expected = {frozenset((a.id, b.id)) for a, b in combinations(activities, 2)
+                if a.start < b.end and b.start < a.end}
+    pairs = BusyIndex(activities).overlapping_pairs()
+    assert len(pairs) == len(expected)
+    assert {frozenset(p) for p in pairs} == expected
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from controllers.activity_controller import ActivityController
+from controllers.events import ActivitiesChanged, ActivityAdded
+from utils.models import Activity
+
+START = datetime(2026, 5, 4, 9)
+
+
+@pytest.fixture
+def existing():
+    return [Activity(f"Old {i}", start=START + timedelta(days=i),
+                     end=START + timedelta(days=i, hours=1), activity_id=f"old{i}")
+            for i in range(3)]
+
+
+@pytest.fixture
+def controller(memory_storage, existing):
+    memory_storage.save_all(existing)
+    controller = ActivityController(storage=memory_storage)
+    events = []
+    controller.add_observer(events.append)
+    controller.events = events
+    yield controller
+    controller.close()
+
+
+def test_single_change_outside_a_batch(controller, memory_storage):
+    activity = controller.add_activity("New", "work", START, START + timedelta(hours=1))
+    assert [type(e) for e in controller.events] == [ActivityAdded]
+    controller.flush()
+    assert activity.id in memory_storage.activities
+
+
+def test_batch_sends_one_event_and_one_write(controller, memory_storage):
+    with controller.batch():
+        added = controller.add_activity("New", "work", START, START + timedelta(hours=1))
+        controller.toggle_executed("old0")
+        controller.delete_activity("old1")
+        assert controller.events == []
+    assert len(controller.events) == 1
+    event = controller.events[0]
+    assert isinstance(event, ActivitiesChanged)
+    assert [a.id for a in event.added] == [added.id]
+    assert [a.id for a in event.updated] == ["old0"]
+    assert [a.id for a in event.removed] == ["old1"]
+    controller.flush()
+    assert len(memory_storage.batches) == 1
+    puts, deletes = memory_storage.batches[0]
+    assert sorted(puts) == sorted([added.id, "old0"])
+    assert deletes == ["old1"]
+    assert memory_storage.activities["old0"].executed
+
+
+def test_activity_added_and_deleted_in_one_batch_is_not_announced(controller, memory_storage):
+    with controller.batch():
+        added = controller.add_activity("Temp", "work", START, START + timedelta(hours=1))
+        controller.update_activity(added.id, "Temp 2", "work", START, START + timedelta(hours=2), False)
+        controller.delete_activity(added.id)
+    assert controller.events == []
+    controller.flush()
+    assert added.id not in memory_storage.activities
+    assert sorted(memory_storage.activities) == ["old0", "old1", "old2"]
+
+
+def test_update_of_an_added_activity_stays_an_add(controller):
+    with controller.batch():
+        added = controller.add_activity("New", "work", START, START + timedelta(hours=1))
+        controller.toggle_executed(added.id)
+    event, = controller.events
+    assert [a.id for a in event.added] == [added.id] and event.updated == []
+    assert event.added[0].executed
+
+
+def test_updated_then_removed_is_only_removed(controller):
+    with controller.batch():
+        controller.toggle_executed("old2")
+        controller.delete_activity("old2")
+    event, = controller.events
+    assert event.updated == [] and [a.id for a in event.removed] == ["old2"]
+
+
+def test_nested_batches_flush_once(controller, memory_storage):
+    with controller.batch():
+        controller.toggle_executed("old0")
+        with controller.batch():
+            controller.toggle_executed("old1")
+        assert controller.events == []
+        controller.set_executed_many(["old2"])
+    event, = controller.events
+    assert sorted(a.id for a in event.updated) == ["old0", "old1", "old2"]
+    controller.flush()
+    assert len(memory_storage.batches) == 1
+
+
+def test_empty_batch_is_silent(controller, memory_storage):
+    with controller.batch():
+        pass
+    controller.flush()
+    assert controller.events == [] and memory_storage.batches == []
+
+
+def test_batch_is_flushed_when_the_block_raises(controller):
+    with pytest.raises(RuntimeError):
+        with controller.batch():
+            controller.toggle_executed("old0")
+            raise RuntimeError("boom")
+    event, = controller.events
+    assert [a.id for a in event.updated] == ["old0"]
+    # The store was updated in place, so indexes stay in step with it
+    assert controller.get_activity("old0").executed
@@ -0,0 +1,65 @@
+import random
+from datetime import datetime, timedelta
+
+from utils.interval_index import IntervalIndex
+from utils.models import Activity
+
+BASE = datetime(2026, 1, 1)
+
+
+def random_activities(rng, count, prefix=""):
+    activities = []
+    for i in range(count):
+        start = BASE + timedelta(minutes=rng.randrange(0, 60 * 24 * 90))
+        # Mostly short, a few longer than LONG_SPAN
+        length = timedelta(days=rng.randrange(8, 40)) if i % 25 == 0 else \
+            timedelta(minutes=rng.randrange(15, 60 * 30))
+        activities.append(Activity(f"{prefix}{i}", start=start, end=start + length,
+                                   activity_id=f"{prefix}{i}"))
+    return activities
+
+
+def check_queries(index, activities, rng):
+    for _ in range(100):
+        start = BASE + timedelta(hours=rng.randrange(0, 24 * 95))
+        end = start + timedelta(hours=rng.randrange(1, 24 * 10))
+        found = index.overlapping(start, end)
+        assert sorted(a.id for a in found) == \
+            sorted(a.id for a in activities if a.start < end and a.end > start)
+        assert [a.start for a in found] == sorted(a.start for a in found)
+        assert sorted(a.id for a in index.starting_in(start, end)) == \
+            sorted(a.id for a in activities if start <= a.start < end)
+
+
+def test_queries_match_brute_force():
+    rng = random.Random(1)
+    activities = random_activities(rng, 500)
+    check_queries(IntervalIndex(activities), activities, rng)
+
+
+def test_add_many_matches_single_adds():
+    rng = random.Random(2)
+    first = random_activities(rng, 300)
+    second = random_activities(rng, 300, prefix="b")
+    index = IntervalIndex(first)
+    index.add_many(second)
+    assert len(index) == 600
+    assert index._keys == sorted(index._keys)
+    check_queries(index, first + second, rng)
+
+
+def test_update_and_remove():
+    rng = random.Random(3)
+    activities = random_activities(rng, 200)
+    index = IntervalIndex(activities)
+    for activity in activities[:50]:
+        # Long activities become short and the other way round
+        was_long = activity.end - activity.start > IntervalIndex.LONG_SPAN
+        activity.start += timedelta(days=3)
+        activity.end = activity.start + (timedelta(hours=2) if was_long else timedelta(days=9))
+        index.update(activity)
+    for activity in activities[150:]:
+        index.remove(activity.id)
+    index.remove("unknown")
+    assert len(index) == 150
+    check_queries(index, activities[:150], rng)
@@ -0,0 +1,114 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from utils.recurrence import (ExpansionCache, RecurrenceRule, occurrence_id,
+                              split_occurrence_id)
+
+
+def weekly(**kwargs):
+    # Monday 2026-05-04, 09:00-10:00
+    return RecurrenceRule(name="Class", start=datetime(2026, 5, 4, 9), end=datetime(2026, 5, 4, 10),
+                          freq="weekly", rule_id="r", **kwargs)
+
+
+def test_occurrence_ids_round_trip():
+    assert occurrence_id("r", date(2026, 5, 4)) == "r@2026-05-04"
+    assert split_occurrence_id("r@2026-05-04") == ("r", date(2026, 5, 4))
+    assert split_occurrence_id("plain-id") is None
+    assert split_occurrence_id("r@not-a-date") is None
+
+
+def test_unknown_frequency_is_rejected():
+    with pytest.raises(ValueError):
+        RecurrenceRule(freq="hourly")
+
+
+def test_daily_expansion_only_covers_the_window():
+    rule = RecurrenceRule(start=datetime(2026, 1, 1, 8), end=datetime(2026, 1, 1, 9),
+                          freq="daily", interval=2, rule_id="d")
+    found = rule.occurrences(datetime(2026, 3, 1), datetime(2026, 3, 8))
+    # Every second day from Jan 1: Mar 2, 4, 6
+    assert [a.start.date() for a in found] == [date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 6)]
+    assert all(a.end - a.start == timedelta(hours=1) for a in found)
+    assert found[0].id == "d@2026-03-02"
+
+
+def test_weekly_by_weekday_skips_days_before_the_start():
+    # Starts on a Monday; Sunday of the first week is after it, Monday of week two repeats
+    rule = weekly(by_weekday=[0, 2])
+    found = rule.occurrences(datetime(2026, 5, 1), datetime(2026, 5, 12))
+    assert [a.start.date() for a in found] == [date(2026, 5, 4), date(2026, 5, 6), date(2026, 5, 11)]
+
+
+def test_count_includes_skipped_dates():
+    rule = weekly(count=3, exceptions=[date(2026, 5, 11)])
+    found = rule.occurrences(datetime(2026, 5, 1), datetime(2026, 7, 1))
+    assert [a.start.date() for a in found] == [date(2026, 5, 4), date(2026, 5, 18)]
+
+
+def test_until_is_inclusive():
+    rule = weekly(until=datetime(2026, 5, 18, 9))
+    found = rule.occurrences(datetime(2026, 5, 1), datetime(2026, 7, 1))
+    assert [a.start.date() for a in found][-1] == date(2026, 5, 18)
+    assert len(found) == 3
+
+
+def test_monthly_leaves_out_missing_days():
+    rule = RecurrenceRule(start=datetime(2026, 1, 31, 12), end=datetime(2026, 1, 31, 13),
+                          freq="monthly")
+    found = rule.occurrences(datetime(2026, 1, 1), datetime(2026, 6, 1))
+    assert [a.start.date() for a in found] == [date(2026, 1, 31), date(2026, 3, 31), date(2026, 5, 31)]
+
+
+def test_override_changes_fields_of_one_occurrence():
+    rule = weekly(overrides={date(2026, 5, 11): {"executed": True, "name": "Exam"}})
+    first, second = rule.occurrences(datetime(2026, 5, 4), datetime(2026, 5, 12))
+    assert not first.executed and first.name == "Class"
+    assert second.executed and second.name == "Exam"
+
+
+def test_occurrence_moved_into_the_window_is_found():
+    moved_start = datetime(2026, 6, 3, 15)
+    rule = weekly(overrides={date(2026, 5, 11): {"start": moved_start,
+                                                 "end": moved_start + timedelta(hours=1)}})
+    window = rule.occurrences(datetime(2026, 6, 3), datetime(2026, 6, 4))
+    assert [a.id for a in window] == ["r@2026-05-11"]
+    # ...and is gone from its original slot
+    assert rule.occurrences(datetime(2026, 5, 11), datetime(2026, 5, 12)) == []
+
+
+def test_occurrence_on():
+    rule = weekly(exceptions=[date(2026, 5, 11)])
+    assert rule.occurrence_on(date(2026, 5, 18)).start == datetime(2026, 5, 18, 9)
+    assert rule.occurrence_on(date(2026, 5, 11)) is None
+    assert rule.occurrence_on(date(2026, 5, 12)) is None
+
+
+def test_dict_round_trip_keeps_exceptions_and_overrides():
+    rule = weekly(by_weekday=[0, 3], count=10, exceptions=[date(2026, 5, 7)],
+                  overrides={date(2026, 5, 11): {"start": datetime(2026, 5, 11, 14), "executed": True}})
+    copy = RecurrenceRule.from_dict(rule.to_dict())
+    assert copy.to_dict() == rule.to_dict()
+    window = (datetime(2026, 5, 1), datetime(2026, 6, 1))
+    assert [a.to_dict() for a in copy.occurrences(*window)] == \
+        [a.to_dict() for a in rule.occurrences(*window)]
+
+
+def test_expansion_cache_is_lru():
+    cache = ExpansionCache(maxsize=2)
+    calls = []
+
+    def expand(start, end):
+        calls.append((start, end))
+        return [start]
+
+    cache.get(1, 2, expand)
+    cache.get(3, 4, expand)
+    cache.get(1, 2, expand)        # hit, becomes most recent
+    cache.get(5, 6, expand)        # evicts (3, 4)
+    cache.get(1, 2, expand)
+    cache.get(3, 4, expand)
+    assert calls == [(1, 2), (3, 4), (5, 6), (3, 4)]
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils.models import Activity
+from utils.scheduler import Task, free_intervals, schedule
+
+START = datetime(2026, 5, 4, 8)   # a Monday
+HOUR = timedelta(hours=1)
+
+
+def busy(start, end):
+    return Activity("Busy", start=start, end=end)
+
+
+def spans(result):
+    return [(a.name, a.start, a.end) for a in result.placements]
+
+
+def test_free_intervals_merges_overlapping_and_touching_spans():
+    day = datetime(2026, 5, 4)
+    taken = [(day.replace(hour=10), day.replace(hour=12)),
+             (day.replace(hour=9), day.replace(hour=11)),
+             (day.replace(hour=12), day.replace(hour=13)),   # touches the previous one
+             (day.replace(hour=15), day.replace(hour=16)),
+             (day.replace(hour=20), day.replace(hour=23))]   # runs past the window
+    assert free_intervals(taken, day.replace(hour=8), day.replace(hour=21)) == [
+        (day.replace(hour=8), day.replace(hour=9)),
+        (day.replace(hour=13), day.replace(hour=15)),
+        (day.replace(hour=16), day.replace(hour=20)),
+    ]
+    assert free_intervals([], day, day + HOUR) == [(day, day + HOUR)]
+
+
+def test_earliest_deadline_is_placed_first():
+    tasks = [Task("Late", HOUR, deadline=START + timedelta(days=3)),
+             Task("Soon", HOUR, deadline=START + timedelta(hours=2))]
+    result = schedule(tasks, [], start=START)
+    assert spans(result) == [("Soon", START, START + HOUR),
+                             ("Late", START + HOUR, START + 2 * HOUR)]
+    assert result.unplaced == []
+
+
+def test_placements_avoid_activities_and_keep_padding():
+    activities = [busy(START, START + HOUR)]
+    result = schedule([Task("Essay", HOUR)], activities, start=START,
+                      padding=timedelta(minutes=10))
+    # 09:00 + 10 min padding, rounded up to the 15-minute grid
+    assert spans(result) == [("Essay", START + timedelta(minutes=75), START + timedelta(minutes=135))]
+
+
+def test_granularity_rounds_start_up():
+    result = schedule([Task("Read", HOUR)], [], start=START + timedelta(minutes=7),
+                      granularity=timedelta(minutes=30))
+    assert result.placements[0].start == START + timedelta(minutes=30)
+
+
+def test_allowed_hours_and_weekdays():
+    task = Task("Gym", HOUR, allowed_hours=(18, 20), allowed_weekdays=[2])
+    result = schedule([task], [busy(datetime(2026, 5, 6, 18), datetime(2026, 5, 6, 19))], start=START)
+    assert spans(result) == [("Gym", datetime(2026, 5, 6, 19), datetime(2026, 5, 6, 20))]
+
+
+def test_task_that_cannot_meet_its_deadline_is_unplaced():
+    activities = [busy(START, START + 4 * HOUR)]
+    tight = Task("Tight", 2 * HOUR, deadline=START + 5 * HOUR)
+    result = schedule([tight, Task("Loose", HOUR)], activities, start=START)
+    assert result.unplaced == [tight]
+    assert spans(result) == [("Loose", START + 4 * HOUR, START + 5 * HOUR)]
+
+
+def test_placed_tasks_do_not_overlap_each_other():
+    tasks = [Task(f"T{i}", timedelta(minutes=45), allowed_hours=(9, 12)) for i in range(6)]
+    result = schedule(tasks, [], start=START)
+    placed = sorted((a.start, a.end) for a in result.placements)
+    assert len(placed) + len(result.unplaced) == 6
+    assert all(prev_end <= next_start for (_, prev_end), (next_start, _) in zip(placed, placed[1:]))
+    assert all(9 <= s.hour and (e.hour, e.minute) <= (12, 0) for s, e in placed)
+
+
+def test_priority_strategy_ignores_deadline_order():
+    tasks = [Task("Urgent", HOUR, deadline=START + timedelta(days=1), priority=0),
+             Task("Important", HOUR, deadline=START + timedelta(days=5), priority=5)]
+    by_priority = schedule(tasks, [], start=START, strategy="priority")
+    assert [a.name for a in by_priority.placements] == ["Important", "Urgent"]
+    by_deadline = schedule(tasks, [], start=START)
+    assert [a.name for a in by_deadline.placements] == ["Urgent", "Important"]
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        schedule([], [], start=START, strategy="random")
+    with pytest.raises(ValueError):
+        Task("Nothing", timedelta(0))
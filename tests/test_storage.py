@@ -0,0 +1,85 @@
+import json
+from datetime import datetime, timedelta
+
+import utils.storage as storage
+from utils.models import Activity
+from utils.storage import JsonStorage, _merge_journal, _replay_journal
+
+BASE = datetime(2026, 4, 1, 9)
+
+
+def make(i, days=0):
+    start = BASE + timedelta(days=days)
+    return Activity(f"A{i}", start=start, end=start + timedelta(hours=1), activity_id=f"a{i}")
+
+
+def test_replay_skips_torn_trailing_line(tmp_path):
+    journal = tmp_path / "activities.journal"
+    complete = [{"op": "put", "activity": make(1).to_dict()},
+                {"op": "put", "activity": make(2).to_dict()},
+                {"op": "delete", "id": "a1"}]
+    torn = json.dumps({"op": "put", "activity": make(3).to_dict()})[:25]
+    journal.write_text("".join(json.dumps(e) + "\n" for e in complete) + "\n" + torn)
+    overrides = {}
+    _replay_journal(journal, overrides)
+    assert overrides == {"a1": None, "a2": make(2).to_dict()}
+
+
+def test_replay_of_missing_journal_is_a_no_op(tmp_path):
+    overrides = {"x": None}
+    _replay_journal(tmp_path / "missing", overrides)
+    assert overrides == {"x": None}
+
+
+def test_merge_keeps_snapshot_order_and_appends_new_records():
+    records = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+    overrides = {"b": None, "c": {"id": "c", "name": "edited"}, "d": {"id": "d"}}
+    assert list(_merge_journal(records, overrides)) == \
+        [{"id": "a"}, {"id": "c", "name": "edited"}, {"id": "d"}]
+
+
+def test_journal_is_applied_on_load(storage_dir):
+    backend = JsonStorage()
+    backend.save_all([make(1), make(2), make(3)])
+    edited = make(2)
+    edited.name = "Edited"
+    backend.write_batch([edited, make(4)], ["a1"])
+    loaded = backend.load()
+    assert [(a.id, a.name) for a in loaded] == [("a2", "Edited"), ("a3", "A3"), ("a4", "A4")]
+
+
+def test_compaction_folds_the_journal_into_the_snapshot(storage_dir):
+    backend = JsonStorage()
+    backend.save_all([make(1), make(2)])
+    backend.delete("a1")
+    backend.put(make(5))
+    storage.compact_journal()
+    assert not storage.JOURNAL_FILE.exists()
+    assert [a.id for a in backend.load()] == ["a2", "a5"]
+
+
+def test_load_split_routes_journal_edits_by_their_new_end(storage_dir, storage_errors):
+    backend = JsonStorage()
+    backend.save_all([make(1, days=0), make(2, days=1), make(3, days=30)])
+    assert storage.BINARY_SNAPSHOT_FILE.exists()
+    # a1 moves into the recent part, a3 is moved back into the deferred part
+    moved_forward = make(1, days=40)
+    moved_back = make(3, days=2)
+    backend.write_batch([moved_forward, moved_back], [])
+    since = BASE + timedelta(days=20)
+    recent, deferred = backend.load_split(since)
+    assert [a.id for a in recent] == ["a1"]
+    assert recent[0].start == moved_forward.start
+    older = list(deferred)
+    assert sorted(a.id for a in older) == ["a2", "a3"]
+    assert next(a for a in older if a.id == "a3").start == moved_back.start
+    assert storage_errors == []
+
+
+def test_stale_binary_snapshot_falls_back_to_json(storage_dir, storage_errors):
+    backend = JsonStorage()
+    backend.save_all([make(1), make(2)])
+    # Rewrite the JSON snapshot behind the binary copy's back
+    storage.SNAPSHOT_FILE.write_text(json.dumps(make(7).to_dict()) + "\n")
+    assert [a.id for a in backend.load()] == ["a7"]
+    assert len(storage_errors) == 1 and "Ignoring binary snapshot" in storage_errors[0]
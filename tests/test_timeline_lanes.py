@@ -0,0 +1,45 @@
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+from widgets.timeline_widget import pack_lanes  # noqa: E402
+
+
+def lanes(spans):
+    return {key: (lane, count) for key, lane, count in pack_lanes(spans)}
+
+
+def test_empty():
+    assert pack_lanes([]) == []
+
+
+def test_disjoint_and_touching_spans_share_lane_zero():
+    assert lanes([(0, 10, "a"), (10, 20, "b"), (30, 40, "c")]) == \
+        {"a": (0, 1), "b": (0, 1), "c": (0, 1)}
+
+
+def test_overlapping_spans_get_separate_lanes():
+    assert lanes([(0, 10, "a"), (5, 15, "b"), (6, 8, "c")]) == \
+        {"a": (0, 3), "b": (1, 3), "c": (2, 3)}
+
+
+def test_freed_lane_is_reused_within_a_cluster():
+    # b and c overlap a but not each other; c takes b's lane after b ends
+    result = lanes([(0, 100, "a"), (10, 20, "b"), (30, 40, "c"), (200, 210, "d")])
+    assert result == {"a": (0, 2), "b": (1, 2), "c": (1, 2), "d": (0, 1)}
+
+
+def test_lowest_free_lane_is_taken():
+    result = lanes([(0, 50, "a"), (0, 10, "b"), (0, 40, "c"), (15, 45, "d")])
+    # Equal starts are packed shortest first; b frees lane 0 before d starts
+    assert result == {"b": (0, 3), "c": (1, 3), "a": (2, 3), "d": (0, 3)}
+
+
+def test_lanes_never_overlap():
+    spans = [(i * 7 % 50, i * 7 % 50 + 5 + i % 13, i) for i in range(60)]
+    placed = lanes(spans)
+    for s1, e1, k1 in spans:
+        for s2, e2, k2 in spans:
+            if k1 < k2 and s1 < e2 and s2 < e1:
+                assert placed[k1][0] != placed[k2][0]
+                assert placed[k1][1] == placed[k2][1]
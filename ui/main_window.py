@@ -1,11 +1,23 @@
 """Main window for CramIt application."""
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QSplitter, QHBoxLayout, QMessageBox)
-from PyQt6.QtCore import Qt
+from datetime import datetime, timedelta
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QKeySequence, QShortcut
 from widgets.list_panel import ListPanel
 from widgets.calendar_panel import CalendarPanel
 from widgets.analytics_panel import AnalyticsPanel
 from controllers.activity_controller import ActivityController
+from controllers.events import ActivitiesReset
+from controllers.loader import ActivityLoader
+from utils.config import load_config
+from utils.date_helpers import get_current_week_range
 from utils.dialogs import TaskDialog
+from utils import instrumentation
+from utils.instrumentation import timed
+
+
+# Older activities delivered per batch once the current week is shown
+LOAD_BATCH_SIZE = 5000
 
 
 class MainWindow(QMainWindow):
@@ -17,6 +29,9 @@ class MainWindow(QMainWindow):
     - Model: Activity class and storage
     """
     
+    # Emitted from the storage writer thread; delivered on the GUI thread
+    storage_error = pyqtSignal(str)
+    
     def __init__(self):
         """Initialize the main window and its components."""
         super().__init__()
@@ -24,15 +39,21 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("CramIt - Planner")
         self.resize(1400, 900)
         
-        # Initialize controller
-        self.controller = ActivityController()
-        self.controller.add_observer(self.refresh_ui)
+        # Initialize controller; activities are loaded in the background
+        self.controller = ActivityController(load=False)
+        self.controller.add_observer(self.on_activities_changed)
+        self.controller.add_error_observer(self.storage_error.emit)
+        self.storage_error.connect(self.on_storage_error)
         
         # Setup UI
         self._setup_ui()
         
-        # Initial refresh
-        self.refresh_ui()
+        if instrumentation.ENABLED:
+            self._setup_debug_overlay()
+        
+        # begin_loading announces the (empty) store with ActivitiesReset,
+        # which binds every panel to the controller before the first batch
+        self._start_loading()
     
     def _setup_ui(self):
         """Set up the user interface layout and components."""
@@ -61,18 +82,49 @@ class MainWindow(QMainWindow):
         # Connect signals to slots
         self._connect_signals()
     
+    def _setup_debug_overlay(self):
+        """Show instrumentation timings; F12 toggles, Ctrl+Shift+J dumps JSON."""
+        from widgets.debug_overlay import DebugOverlay
+        self.debug_overlay = DebugOverlay(self)
+        QShortcut(QKeySequence("F12"), self).activated.connect(self.debug_overlay.toggle)
+        QShortcut(QKeySequence("Ctrl+Shift+J"), self).activated.connect(self.on_dump_instrumentation)
+    
+    def on_dump_instrumentation(self):
+        """Write instrumentation timings to disk and report where."""
+        try:
+            path = instrumentation.dump()
+        except Exception as e:
+            self.statusBar().showMessage(f"Error writing instrumentation: {e}", 10000)
+            return
+        self.statusBar().showMessage(f"Instrumentation written to {path}", 5000)
+    
     def _connect_signals(self):
         """Connect widget signals to handler methods."""
         self.list_panel.btn_add.clicked.connect(self.on_add_activity)
         self.list_panel.btn_edit.clicked.connect(self.on_edit_activity)
         self.list_panel.btn_delete.clicked.connect(self.on_delete_activity)
-        self.list_panel.list.itemDoubleClicked.connect(self.on_toggle_executed)
+        self.list_panel.btn_toggle.clicked.connect(self.on_toggle_selected)
+        self.list_panel.list.doubleClicked.connect(self.on_toggle_executed)
+        timeline = self.calendar_panel.hub_widget.timeline_widget
+        timeline.activity_double_clicked.connect(self.controller.toggle_executed)
     
     def on_add_activity(self):
         """Handle add activity button click."""
-        dialog = TaskDialog(parent=self)
+        dialog = TaskDialog(parent=self, conflict_source=self.controller)
         if dialog.exec():
-            data = dialog.get_data()
+            self._add_from_dialog(dialog.get_data())
+    
+    def _add_from_dialog(self, data):
+        """Add a one-off activity or, if it repeats, a recurrence rule."""
+        if data["repeat"]:
+            self.controller.add_recurrence(
+                name=data["name"],
+                activity_type=data["type"],
+                start=data["start"],
+                end=data["end"],
+                **data["repeat"]
+            )
+        else:
             self.controller.add_activity(
                 name=data["name"],
                 activity_type=data["type"],
@@ -82,20 +134,34 @@ class MainWindow(QMainWindow):
             )
     
     def on_edit_activity(self):
-        """Handle edit activity button click."""
+        """Handle edit activity button click.
+        
+        Switching Repeat on or off turns a one-off activity into a series
+        or the other way round.
+        """
         selected_id = self.list_panel.get_selected_id()
         if not selected_id:
             return
         
-        # Find activity
-        activity = next((a for a in self.controller.get_activities() 
-                        if a.id == selected_id), None)
+        rule = self.controller.get_recurrence(selected_id)
+        activity = rule or self.controller.get_activity(selected_id)
         if not activity:
             return
         
-        dialog = TaskDialog(activity=activity, parent=self)
-        if dialog.exec():
-            data = dialog.get_data()
+        dialog = TaskDialog(activity=activity, parent=self, conflict_source=self.controller)
+        if not dialog.exec():
+            return
+        data = dialog.get_data()
+        if rule is not None and data["repeat"]:
+            self.controller.update_recurrence(
+                selected_id,
+                name=data["name"],
+                activity_type=data["type"],
+                start=data["start"],
+                end=data["end"],
+                **data["repeat"]
+            )
+        elif rule is None and not data["repeat"]:
             self.controller.update_activity(
                 activity_id=selected_id,
                 name=data["name"],
@@ -104,22 +170,48 @@ class MainWindow(QMainWindow):
                 end=data["end"],
                 executed=data["executed"]
             )
+        else:
+            if rule is not None:
+                self.controller.delete_recurrence(selected_id)
+            else:
+                self.controller.delete_activity(selected_id)
+            self._add_from_dialog(data)
     
     def on_delete_activity(self):
-        """Handle delete activity button click."""
-        selected_id = self.list_panel.get_selected_id()
-        if not selected_id:
+        """Handle delete activity button click (one or many selected)."""
+        selected_ids = self.list_panel.get_selected_ids()
+        if not selected_ids:
             return
         
+        question = ('Delete this activity?' if len(selected_ids) == 1
+                    else f'Delete {len(selected_ids)} activities?')
         reply = QMessageBox.question(
             self, 
             'Confirm Delete', 
-            'Delete this activity?',
+            question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.controller.delete_activity(selected_id)
+            rule_ids = {i for i in selected_ids if self.controller.get_recurrence(i)}
+            if rule_ids:
+                self.controller.delete_recurrences(rule_ids)
+            if len(rule_ids) < len(selected_ids):
+                self.controller.delete_many(i for i in selected_ids if i not in rule_ids)
+    
+    def on_toggle_selected(self):
+        """Mark the selected activities done, or not done if all already are.
+        
+        Recurrence rules are skipped; their occurrences are toggled one at a
+        time by double-clicking them in the week timeline.
+        """
+        selected_ids = [i for i in self.list_panel.get_selected_ids()
+                        if self.controller.get_activity(i)]
+        if not selected_ids:
+            return
+        
+        all_done = all(self.controller.get_activity(i).executed for i in selected_ids)
+        self.controller.set_executed_many(selected_ids, not all_done)
     
     def on_toggle_executed(self):
         """Handle double-click on activity to toggle executed status."""
@@ -129,22 +221,70 @@ class MainWindow(QMainWindow):
         
         self.controller.toggle_executed(selected_id)
     
-    def refresh_ui(self):
-        """Refresh all UI panels with current data from controller."""
-        activities = self.controller.get_activities()
-        
-        # Update list panel - show calculated hours and executed status
-        items = []
-        for a in activities:
-            status = "✓" if a.executed else "○"
-            items.append(f"{status} {a.name} ({a.planned_hours:.1f}h, {a.type})")
+    def on_storage_error(self, message):
+        """Show a storage write error in the status bar."""
+        self.statusBar().showMessage(message, 10000)
+    
+    @timed("main_window.on_activities_changed")
+    def on_activities_changed(self, event):
+        """Apply a controller change event to each panel as a delta."""
+        self.list_panel.apply_change(event)
+        self.calendar_panel.apply_change(event)
+        self.analytics_panel.apply_change(event)
+    
+    def _start_loading(self):
+        """Start reading activities on a worker thread.
         
-        ids = [a.id for a in activities]
-        self.list_panel.set_items(items, ids)
+        The first batch covers the current week (or the configured
+        ``eager_window_days``, if longer); older history follows.
+        """
+        since = get_current_week_range()[0]
+        eager_window_days = load_config().get("eager_window_days")
+        if eager_window_days:
+            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            since = min(since, today - timedelta(days=eager_window_days))
         
-        # Update calendar panel with activities
-        self.calendar_panel.update_activities(activities)
+        self._load_failed = False
+        self.controller.begin_loading()
+        self.statusBar().showMessage("Loading activities...")
+        self.loader = ActivityLoader(self.controller, since, LOAD_BATCH_SIZE, parent=self)
+        self.loader.batch_loaded.connect(self.on_batch_loaded)
+        self.loader.load_failed.connect(self.on_load_failed)
+        self.loader.finished.connect(self.on_loading_finished)
+        self.loader.start()
+    
+    def on_batch_loaded(self, activities):
+        """Hand a loaded batch to the controller; panels update through events."""
+        self.controller.load_batch(activities)
+        count = len(self.controller)
+        self.statusBar().showMessage(f"Loading activities... {count} loaded")
+    
+    def on_load_failed(self, message):
+        """Report a failed background load."""
+        self._load_failed = True
+        self.statusBar().showMessage(message, 10000)
+    
+    def on_loading_finished(self):
+        """Release edits queued during loading once the worker is done."""
+        if self.loader.isInterruptionRequested():
+            return
+        self.controller.finish_loading()
+        if not self._load_failed:
+            count = len(self.controller)
+            self.statusBar().showMessage(f"Loaded {count} activities", 3000)
+    
+    def closeEvent(self, event):
+        """Stop a background load before the window goes away."""
+        if self.loader.isRunning():
+            self.loader.requestInterruption()
+            self.loader.wait()
+        super().closeEvent(event)
+    
+    @timed("main_window.refresh_ui")
+    def refresh_ui(self):
+        """Rebuild every panel from the controller through an ActivitiesReset event.
         
-        # Update analytics
-        self.analytics_panel.update_from(activities)
-        self.analytics_panel.update_from(activities)
+        The list model formats rows lazily from the controller, and the
+        calendar and hub query date ranges through its index.
+        """
+        self.on_activities_changed(ActivitiesReset(self.controller))
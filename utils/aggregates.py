@@ -0,0 +1,97 @@
+"""Incrementally maintained hour totals per period bucket."""
+from datetime import date, timedelta
+
+
+PERIODS = ("day", "week", "month", "year")
+
+
+def bucket_start(period, day):
+    """Return the first date of the period bucket containing ``day``.
+
+    Args:
+        period: 'day', 'week' (ISO, Monday-based), 'month' or 'year'
+        day: date or datetime
+    """
+    if hasattr(day, "date"):
+        day = day.date()
+    if period == "day":
+        return day
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return date(day.year, day.month, 1)
+    if period == "year":
+        return date(day.year, 1, 1)
+    raise ValueError(f"Unknown period: {period}")
+
+
+class AggregateCache:
+    """Running hour totals and counts per (period bucket, type, executed).
+
+    Activities are bucketed by their start, matching
+    ``filter_activities_by_week``. Every mutation is applied as a delta:
+    ``remove`` the old version of an activity and ``add`` the new one,
+    so reads are constant time regardless of history size.
+    """
+
+    def __init__(self, activities=()):
+        # (period, bucket date) -> {(type, executed): [hours, count]}
+        self._buckets = {}
+        for activity in activities:
+            self.add(activity)
+
+    def _apply(self, activity, sign):
+        hours = activity.planned_hours * sign
+        cell_key = (activity.type, bool(activity.executed))
+        for period in PERIODS:
+            key = (period, bucket_start(period, activity.start))
+            cells = self._buckets.setdefault(key, {})
+            cell = cells.get(cell_key)
+            if cell is None:
+                cell = cells[cell_key] = [0.0, 0]
+            cell[0] += hours
+            cell[1] += sign
+            if cell[1] == 0:
+                # Drop empty cells so float residue never accumulates
+                del cells[cell_key]
+                if not cells:
+                    del self._buckets[key]
+
+    def add(self, activity):
+        """Add an activity's hours to its buckets."""
+        self._apply(activity, 1)
+
+    def remove(self, activity):
+        """Subtract an activity's hours from its buckets.
+
+        Must be given the activity as it was when added (use a copy taken
+        before mutating it).
+        """
+        self._apply(activity, -1)
+
+    def stats(self, period, day):
+        """Totals for the bucket containing ``day``.
+
+        Returns:
+            tuple: (total_hours, completed_hours, pending_hours, count)
+        """
+        cells = self._buckets.get((period, bucket_start(period, day)), {})
+        total = completed = 0.0
+        count = 0
+        for (_, executed), (hours, n) in cells.items():
+            total += hours
+            count += n
+            if executed:
+                completed += hours
+        return total, completed, total - completed, count
+
+    def stats_by_type(self, period, day, activity_type):
+        """Completed and total hours of one type in the bucket containing ``day``.
+
+        Returns:
+            tuple: (completed_hours, total_hours)
+        """
+        cells = self._buckets.get((period, bucket_start(period, day)), {})
+        completed = cells.get((activity_type, True), (0.0, 0))[0]
+        total = completed + cells.get((activity_type, False), (0.0, 0))[0]
+        return completed, total
@@ -0,0 +1,211 @@
+"""Binary, memory-mapped copy of the activity snapshot.
+
+The file is written next to the JSON snapshot and lets startup skip JSON
+parsing. Layout (little-endian):
+
+* header: magic, format version, record and string counts, the size and
+  mtime of the JSON snapshot it was built from, and a CRC32 of the rest
+* records: one fixed-width ``RECORD`` per activity holding start/end as
+  wall-clock microseconds since ``EPOCH``, a flags byte and string-table
+  indexes for id, name, type, category and subcategory
+* string table: ``string_count + 1`` offsets followed by the UTF-8 blob
+
+Readers open the file with ``mmap`` and decode records on demand, so the
+recent part of the history can be materialized before the rest. Any
+mismatch (magic, version, checksum, stale source) raises
+``SnapshotFormatError`` and the caller falls back to the JSON snapshot.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import timedelta
+from utils.columnar import EPOCH
+from utils.models import Activity
+
+
+MAGIC = b"CRMB"
+VERSION = 1
+
+# magic, version, reserved, record count, string count,
+# source size, source mtime (ns), checksum of everything after the header
+HEADER = struct.Struct("<4sHHIIQqI")
+# start (us), end (us), id, name, type, category, subcategory, flags
+RECORD = struct.Struct("<qqIIIIIB3x")
+OFFSET = struct.Struct("<I")
+_OFFSET_PAIR = struct.Struct("<II")  # a string's start and end in the blob
+
+FLAG_EXECUTED = 1
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class SnapshotFormatError(ValueError):
+    """The binary snapshot is missing, corrupt, stale or of another version."""
+
+
+def _to_micros(dt):
+    return (dt - EPOCH) // _MICROSECOND
+
+
+class BinarySnapshotWriter:
+    """Collects activity dicts and writes them as a binary snapshot."""
+
+    def __init__(self):
+        self._records = bytearray()
+        self._count = 0
+        self._strings = {}          # str -> index in the string table
+        self._blob = bytearray()
+        self._offsets = array("I", [0])
+
+    def _string(self, value):
+        index = self._strings.get(value)
+        if index is None:
+            index = self._strings[value] = len(self._offsets) - 1
+            self._blob += value.encode("utf-8")
+            self._offsets.append(len(self._blob))
+        return index
+
+    def add(self, record):
+        """Append one activity dict (as produced by ``Activity.to_dict``)."""
+        # Parse through from_dict so the binary form matches what JSON loading yields
+        activity = Activity.from_dict(record)
+        self._records += RECORD.pack(
+            _to_micros(activity.start),
+            _to_micros(activity.end),
+            self._string(activity.id),
+            self._string(activity.name),
+            self._string(activity.type),
+            self._string(activity.category),
+            self._string(activity.subcategory),
+            FLAG_EXECUTED if activity.executed else 0,
+        )
+        self._count += 1
+
+    def write(self, path, source_stat):
+        """Write the snapshot atomically to ``path``.
+
+        Args:
+            path: Destination Path
+            source_stat: os.stat_result of the JSON snapshot this mirrors
+        """
+        if sys.byteorder != "little":
+            self._offsets.byteswap()
+        body = bytes(self._records) + self._offsets.tobytes() + bytes(self._blob)
+        header = HEADER.pack(MAGIC, VERSION, 0, self._count, len(self._offsets) - 1,
+                             source_stat.st_size, source_stat.st_mtime_ns,
+                             zlib.crc32(body))
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class BinarySnapshot:
+    """Read-only, memory-mapped view of a binary snapshot.
+
+    Records are decoded into Activity objects only when asked for.
+    Repeated type/category/subcategory strings are decoded once.
+    """
+
+    def __init__(self, path, source_stat):
+        """Open and validate the snapshot.
+
+        Args:
+            path: Path of the binary snapshot
+            source_stat: os.stat_result of the JSON snapshot it must match
+
+        Raises:
+            SnapshotFormatError: If the file is unusable
+        """
+        with open(path, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise SnapshotFormatError(str(e))
+        try:
+            self._validate(source_stat)
+        except Exception:
+            self._map.close()
+            raise
+        self._labels = {}  # string index -> interned label
+
+    def _validate(self, source_stat):
+        if len(self._map) < HEADER.size:
+            raise SnapshotFormatError("truncated header")
+        (magic, version, _, count, string_count,
+         source_size, source_mtime, checksum) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise SnapshotFormatError("not a binary snapshot")
+        if version != VERSION:
+            raise SnapshotFormatError(f"unsupported version {version}")
+        if (source_size, source_mtime) != (source_stat.st_size, source_stat.st_mtime_ns):
+            raise SnapshotFormatError("out of date with the JSON snapshot")
+        self._count = count
+        self._offsets_at = HEADER.size + count * RECORD.size
+        self._blob_at = self._offsets_at + (string_count + 1) * OFFSET.size
+        if len(self._map) < self._blob_at:
+            raise SnapshotFormatError("truncated")
+        if zlib.crc32(memoryview(self._map)[HEADER.size:]) != checksum:
+            raise SnapshotFormatError("checksum mismatch")
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        """Unmap the file."""
+        self._map.close()
+
+    def _string(self, index):
+        start, end = _OFFSET_PAIR.unpack_from(self._map, self._offsets_at + index * OFFSET.size)
+        return self._map[self._blob_at + start:self._blob_at + end].decode("utf-8")
+
+    def _label(self, index):
+        label = self._labels.get(index)
+        if label is None:
+            label = self._labels[index] = sys.intern(self._string(index))
+        return label
+
+    def activity(self, i):
+        """Decode record ``i`` into an Activity."""
+        return self._decode(RECORD.unpack_from(self._map, HEADER.size + i * RECORD.size))
+
+    def _decode(self, fields):
+        (start, end, id_index, name_index, type_index, category_index,
+         subcategory_index, flags) = fields
+        act = Activity.__new__(Activity)
+        act.id = self._string(id_index)
+        act.name = self._string(name_index)
+        act.type = self._label(type_index)
+        act.start = EPOCH + timedelta(microseconds=start)
+        act.end = EPOCH + timedelta(microseconds=end)
+        act.executed = bool(flags & FLAG_EXECUTED)
+        act.category = self._label(category_index)
+        act.subcategory = self._label(subcategory_index)
+        return act
+
+    def __iter__(self):
+        records = self._map[HEADER.size:self._offsets_at]
+        for fields in RECORD.iter_unpack(records):
+            yield self._decode(fields)
+
+    def split_by_end(self, since):
+        """Partition record indexes by end time without decoding strings.
+
+        Returns:
+            tuple: (array of indexes ending at or after ``since``,
+                    array of the other indexes), both in file order
+        """
+        since_us = _to_micros(since)
+        recent = array("I")
+        older = array("I")
+        records = memoryview(self._map)[HEADER.size:self._offsets_at]
+        for i, fields in enumerate(RECORD.iter_unpack(records)):
+            (recent if fields[1] >= since_us else older).append(i)
+        records.release()
+        return recent, older
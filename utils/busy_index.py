@@ -0,0 +1,141 @@
+"""Per-day busy-time bitmaps for fast conflict detection."""
+from datetime import timedelta
+
+
+# Width of one bitmap slot
+SLOT_MINUTES = 5
+ONE_DAY = timedelta(days=1)
+
+
+def _seconds_into_day(moment):
+    return moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+class BusyIndex:
+    """Free/busy bitmap per day, with the activities behind each bit.
+
+    Every day holds an int whose bit ``i`` is set when some activity covers
+    part of slot ``i`` (``SLOT_MINUTES`` wide, counted from midnight), so
+    asking whether a range is free is a couple of AND operations per day
+    touched. Slots are coarse, so a hit is confirmed against the exact
+    times of that day's activities before it is reported as a conflict.
+
+    Adding an activity ORs its slots in; removing one rebuilds only the
+    bitmaps of the days it covered from the activities left on them.
+    """
+
+    def __init__(self, activities=(), slot_minutes=SLOT_MINUTES):
+        self._slot_seconds = slot_minutes * 60
+        self._full_day = (1 << (86400 // self._slot_seconds)) - 1
+        self._bits = {}      # date -> bitmap int
+        self._members = {}   # date -> set of activity IDs touching that day
+        self._spans = {}     # activity ID -> (start, end) as indexed
+        for activity in activities:
+            self.add(activity)
+
+    def __len__(self):
+        return len(self._spans)
+
+    def _day_masks(self, start, end):
+        """Yield (date, slot mask) for every day the range [start, end) covers."""
+        if end <= start:
+            return
+        day = start.date()
+        last_day = end.date()
+        first = _seconds_into_day(start) // self._slot_seconds
+        while day < last_day:
+            # From the first slot to midnight
+            yield day, self._full_day ^ ((1 << first) - 1)
+            day += ONE_DAY
+            first = 0
+        end_seconds = _seconds_into_day(end) + (1 if end.microsecond else 0)
+        last = -(-end_seconds // self._slot_seconds)  # round up
+        if last > first:
+            yield day, ((1 << (last - first)) - 1) << first
+
+    def add(self, activity):
+        """Mark the slots covered by ``activity`` busy."""
+        start, end = activity.start, activity.end
+        self._spans[activity.id] = (start, end)
+        for day, mask in self._day_masks(start, end):
+            self._bits[day] = self._bits.get(day, 0) | mask
+            members = self._members.get(day)
+            if members is None:
+                members = self._members[day] = set()
+            members.add(activity.id)
+
+    def remove(self, activity_id):
+        """Forget an activity and rebuild the bitmaps of its days."""
+        span = self._spans.pop(activity_id, None)
+        if span is None:
+            return
+        for day, _ in self._day_masks(*span):
+            members = self._members[day]
+            members.discard(activity_id)
+            if not members:
+                del self._members[day]
+                del self._bits[day]
+                continue
+            bits = 0
+            for member_id in members:
+                bits |= self._mask_on(day, *self._spans[member_id])
+            self._bits[day] = bits
+
+    def update(self, activity):
+        """Re-index an activity whose times changed."""
+        self.remove(activity.id)
+        self.add(activity)
+
+    def _mask_on(self, day, start, end):
+        """Slot mask of [start, end) on ``day`` alone."""
+        for mask_day, mask in self._day_masks(start, end):
+            if mask_day == day:
+                return mask
+        return 0
+
+    def is_busy(self, start, end):
+        """Return True if any slot of [start, end) is taken (slot precision)."""
+        return any(self._bits.get(day, 0) & mask for day, mask in self._day_masks(start, end))
+
+    def conflicts(self, start, end, exclude_id=None):
+        """Return the IDs of activities overlapping [start, end), in no particular order.
+
+        Args:
+            start: Start of the range
+            end: End of the range
+            exclude_id: Activity to ignore (e.g. the one being edited)
+        """
+        found = set()
+        for day, mask in self._day_masks(start, end):
+            if not self._bits.get(day, 0) & mask:
+                continue
+            for activity_id in self._members[day]:
+                s, e = self._spans[activity_id]
+                if s < end and e > start and activity_id != exclude_id:
+                    found.add(activity_id)
+        return list(found)
+
+    def overlapping_pairs(self):
+        """Find every pair of overlapping activities in one pass.
+
+        Activities are visited once each; their slots are checked against
+        the bits of the activities visited before them on the same days,
+        and only on a hit are exact times compared.
+
+        Returns:
+            list: (activity_id, activity_id) pairs, each pair once
+        """
+        pairs = set()
+        seen_bits = {}
+        seen = {}
+        for activity_id, (start, end) in self._spans.items():
+            for day, mask in self._day_masks(start, end):
+                bits = seen_bits.get(day, 0)
+                if bits & mask:
+                    for other_id in seen[day]:
+                        s, e = self._spans[other_id]
+                        if s < end and e > start:
+                            pairs.add((other_id, activity_id))
+                seen.setdefault(day, []).append(activity_id)
+                seen_bits[day] = bits | mask
+        return list(pairs)
@@ -36,3 +36,7 @@ def get_activity_color(activity):
     if activity.executed:
         return EXECUTED_COLORS.get(activity.type, EXECUTED_COLORS["work"])
     return ACTIVITY_COLORS.get(activity.type, ACTIVITY_COLORS["work"])
+
+# Hub heatmap colors
+HEATMAP_COLOR = QColor("#5b8def")     # Planned load tint
+COMPLETED_COLOR = QColor("#4caf50")   # Executed share strip
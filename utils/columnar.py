@@ -0,0 +1,182 @@
+"""Columnar NumPy view of activities for vectorized statistics.
+
+NumPy is optional: when it is not installed ``HAS_NUMPY`` is False and
+callers fall back to the plain Python path in ``utils.date_helpers``.
+"""
+from datetime import datetime, timedelta
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Timestamps are stored as wall-clock seconds since this naive epoch, so
+# integer division by 86400 gives the local calendar day directly.
+EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600.0
+
+
+def to_epoch(dt):
+    """Convert a naive datetime to wall-clock epoch seconds."""
+    return (dt - EPOCH) // timedelta(seconds=1)
+
+
+def from_epoch(seconds):
+    """Convert wall-clock epoch seconds back to a naive datetime."""
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+class ColumnarStore:
+    """Activities held as parallel column arrays.
+
+    Columns: ``start``/``end`` (int64 epoch seconds), ``type_code`` (int32
+    index into ``type_names``) and ``executed`` (bool). Rows are kept dense:
+    removing an activity moves the last row into its slot.
+    """
+
+    def __init__(self, activities=()):
+        if not HAS_NUMPY:
+            raise RuntimeError("ColumnarStore requires numpy")
+        activities = list(activities)
+        capacity = max(16, len(activities))
+        self.start = np.zeros(capacity, dtype=np.int64)
+        self.end = np.zeros(capacity, dtype=np.int64)
+        self.type_code = np.zeros(capacity, dtype=np.int32)
+        self.executed = np.zeros(capacity, dtype=bool)
+        self.type_names = []
+        self._type_codes = {}
+        self._ids = []
+        self._rows = {}
+        for activity in activities:
+            self.add(activity)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _code_for(self, activity_type):
+        code = self._type_codes.get(activity_type)
+        if code is None:
+            code = len(self.type_names)
+            self._type_codes[activity_type] = code
+            self.type_names.append(activity_type)
+        return code
+
+    def _grow(self):
+        capacity = len(self.start) * 2
+        for name in ("start", "end", "type_code", "executed"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def _write_row(self, row, activity):
+        self.start[row] = to_epoch(activity.start)
+        self.end[row] = to_epoch(activity.end)
+        self.type_code[row] = self._code_for(activity.type)
+        self.executed[row] = bool(activity.executed)
+
+    def add(self, activity):
+        """Append an activity as a new row."""
+        row = len(self._ids)
+        if row == len(self.start):
+            self._grow()
+        self._ids.append(activity.id)
+        self._rows[activity.id] = row
+        self._write_row(row, activity)
+
+    def update(self, activity):
+        """Rewrite the row of an existing activity."""
+        row = self._rows.get(activity.id)
+        if row is None:
+            self.add(activity)
+        else:
+            self._write_row(row, activity)
+
+    def remove(self, activity_id):
+        """Remove an activity's row; unknown IDs are ignored."""
+        row = self._rows.pop(activity_id, None)
+        if row is None:
+            return
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            for column in (self.start, self.end, self.type_code, self.executed):
+                column[row] = column[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._ids.pop()
+
+    def _select(self, start=None, end=None):
+        """Return hours, executed, type_code and start for rows starting in [start, end)."""
+        n = len(self._ids)
+        starts = self.start[:n]
+        mask = np.ones(n, dtype=bool)
+        if start is not None:
+            mask &= starts >= to_epoch(start)
+        if end is not None:
+            mask &= starts < to_epoch(end)
+        hours = (self.end[:n][mask] - starts[mask]) / SECONDS_PER_HOUR
+        return hours, self.executed[:n][mask], self.type_code[:n][mask], starts[mask]
+
+    def stats(self, start=None, end=None):
+        """Total, completed and pending hours of activities starting in range.
+
+        Returns:
+            tuple: (total_hours, completed_hours, pending_hours)
+        """
+        hours, executed, _, _ = self._select(start, end)
+        total = float(hours.sum())
+        completed = float(hours[executed].sum())
+        return total, completed, total - completed
+
+    def stats_by_type(self, start=None, end=None):
+        """Completed and total hours per type for activities starting in range.
+
+        Returns:
+            dict: type -> (completed_hours, total_hours)
+        """
+        hours, executed, codes, _ = self._select(start, end)
+        count = len(self.type_names)
+        totals = np.bincount(codes, weights=hours, minlength=count)
+        completed = np.bincount(codes[executed], weights=hours[executed], minlength=count)
+        return {name: (float(completed[i]), float(totals[i]))
+                for i, name in enumerate(self.type_names) if totals[i] or completed[i]}
+
+    def bucket_sums(self, period, start=None, end=None):
+        """Sum hours per day/week/month bucket of the activity start.
+
+        Args:
+            period: 'day', 'week' (ISO, Monday-based) or 'month'
+            start: Optional lower bound on activity start
+            end: Optional upper bound on activity start
+
+        Returns:
+            dict: bucket start date -> (completed_hours, total_hours)
+        """
+        hours, executed, _, starts = self._select(start, end)
+        days = starts // SECONDS_PER_DAY
+        if period == "day":
+            buckets = days
+        elif period == "week":
+            # 1970-01-01 was a Thursday; shift so buckets begin on Monday
+            buckets = (days + 3) // 7 * 7 - 3
+        elif period == "month":
+            buckets = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        else:
+            raise ValueError(f"Unknown period: {period}")
+        if len(buckets) == 0:
+            return {}
+        keys, inverse = np.unique(buckets, return_inverse=True)
+        totals = np.bincount(inverse, weights=hours)
+        completed = np.bincount(inverse, weights=np.where(executed, hours, 0.0))
+        result = {}
+        for i, key in enumerate(keys):
+            if period == "month":
+                bucket = datetime(1970 + int(key) // 12, int(key) % 12 + 1, 1).date()
+            else:
+                bucket = (EPOCH + timedelta(days=int(key))).date()
+            result[bucket] = (float(completed[i]), float(totals[i]))
+        return result
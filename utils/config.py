@@ -0,0 +1,37 @@
+"""Application configuration.
+
+Settings are read from ``~/.cramit/config.json`` and can be overridden with
+environment variables (``CRAMIT_BACKEND``).
+"""
+import json
+import os
+from utils.storage import STORAGE_DIR
+
+
+CONFIG_FILE = STORAGE_DIR / "config.json"
+
+DEFAULT_CONFIG = {
+    "backend": "json",  # json or sqlite
+    # Days of recent activities loaded in the first batch (the current week
+    # is always included); older ones are filled in afterwards
+    "eager_window_days": None,
+}
+
+ENV_OVERRIDES = {
+    "backend": "CRAMIT_BACKEND",
+}
+
+
+def load_config():
+    """Load configuration, falling back to defaults for missing keys."""
+    config = dict(DEFAULT_CONFIG)
+    if CONFIG_FILE.exists():
+        try:
+            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+                config.update(json.load(f))
+        except Exception as e:
+            print(f"Error loading config: {e}")
+    for key, env_var in ENV_OVERRIDES.items():
+        if os.environ.get(env_var):
+            config[key] = os.environ[env_var]
+    return config
@@ -1,55 +1,246 @@
 """Date and time utility functions."""
+from collections import defaultdict, namedtuple
 from datetime import datetime, timedelta
+from utils.aggregates import bucket_start
 
 
 def get_current_week_range():
     """Get the start and end datetime of the current week (Monday to Sunday)."""
-    today = datetime.now()
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today - timedelta(days=today.weekday())
     week_end = week_start + timedelta(days=7)
     return week_start, week_end
 
 
+def activities_in_range(activities, start, end):
+    """Get activities overlapping the half-open range [start, end).
+    
+    Args:
+        activities: List of Activity objects, or an indexed source exposing
+            activities_in_range (e.g. ActivityController)
+    """
+    if hasattr(activities, "activities_in_range"):
+        return activities.activities_in_range(start, end)
+    return [a for a in activities if a.start < end and a.end > start]
+
+
 def filter_activities_by_week(activities, week_start=None, week_end=None):
-    """Filter activities that fall within the given week range."""
+    """Filter activities that start within the given week range.
+    
+    Args:
+        activities: List of Activity objects, or an indexed source exposing
+            activities_starting_in (e.g. ActivityController)
+    """
     if week_start is None or week_end is None:
         week_start, week_end = get_current_week_range()
     
+    if hasattr(activities, "activities_starting_in"):
+        return activities.activities_starting_in(week_start, week_end)
     return [a for a in activities if week_start <= a.start < week_end]
 
 
-def calculate_activity_stats(activities):
+def _columns_of(activities):
+    """Return the columnar store of an indexed source, if it has one."""
+    return getattr(activities, "columns", None)
+
+
+def _occurrences_of(activities, start, end):
+    """Occurrences of recurrence rules starting in [start, end).
+    
+    The ``columns``/``aggregates`` fast paths only cover stored activities,
+    so occurrences expanded by the source (e.g. ActivityController) are
+    added on top. A series without an end has no finite total, so they are
+    only counted for bounded ranges.
+    """
+    if start is None or end is None or not hasattr(activities, "occurrences_starting_in"):
+        return ()
+    return activities.occurrences_starting_in(start, end)
+
+
+def _occurrence_totals(activities, start, end, activity_type=None):
+    """Sum occurrences starting in [start, end), optionally of one type.
+    
+    Returns:
+        tuple: (total_hours, completed_hours, count)
+    """
+    total = completed = 0.0
+    count = 0
+    for occurrence in _occurrences_of(activities, start, end):
+        if activity_type is not None and occurrence.type != activity_type:
+            continue
+        hours = occurrence.planned_hours
+        total += hours
+        count += 1
+        if occurrence.executed:
+            completed += hours
+    return total, completed, count
+
+
+def calculate_activity_stats(activities, start=None, end=None):
     """Calculate total, completed, and pending hours from activities.
     
+    Args:
+        activities: List of Activity objects, or a source exposing a
+            columnar store as ``columns`` (e.g. ActivityController with NumPy)
+        start: Optional lower bound on activity start
+        end: Optional upper bound on activity start
+    
     Returns:
         tuple: (total_hours, completed_hours, pending_hours)
     """
+    columns = _columns_of(activities)
+    if columns is not None:
+        total, completed, pending = columns.stats(start, end)
+        extra_total, extra_completed, _ = _occurrence_totals(activities, start, end)
+        return (total + extra_total, completed + extra_completed,
+                pending + extra_total - extra_completed)
+    if start is not None or end is not None:
+        activities = _filter_by_start(activities, start, end)
     total_hours = sum(a.planned_hours for a in activities)
     completed_hours = sum(a.planned_hours for a in activities if a.executed)
     pending_hours = total_hours - completed_hours
     return total_hours, completed_hours, pending_hours
 
 
-def calculate_stats_by_type(activities, activity_type):
+def calculate_stats_by_type(activities, activity_type, start=None, end=None):
     """Calculate total and completed hours for a specific activity type.
     
     Args:
-        activities: List of Activity objects
+        activities: List of Activity objects, or a source exposing ``columns``
         activity_type: Type string ('work', 'school', 'hobbies')
+        start: Optional lower bound on activity start
+        end: Optional upper bound on activity start
     
     Returns:
         tuple: (completed_hours, total_hours)
     """
+    columns = _columns_of(activities)
+    if columns is not None:
+        completed, total = columns.stats_by_type(start, end).get(activity_type, (0.0, 0.0))
+        extra_total, extra_completed, _ = _occurrence_totals(activities, start, end, activity_type)
+        return completed + extra_completed, total + extra_total
+    if start is not None or end is not None:
+        activities = _filter_by_start(activities, start, end)
     type_activities = [a for a in activities if a.type == activity_type]
     total = sum(a.planned_hours for a in type_activities)
     completed = sum(a.planned_hours for a in type_activities if a.executed)
     return completed, total
 
-    # fast filter: keep only activities that overlap [start, end)
 
+def calculate_bucket_sums(activities, period, start=None, end=None):
+    """Sum completed and total hours per day, ISO week or month.
+    
+    Activities are bucketed by their start.
+    
+    Args:
+        activities: List of Activity objects, or a source exposing ``columns``
+        period: 'day', 'week' or 'month'
+        start: Optional lower bound on activity start
+        end: Optional upper bound on activity start
+    
+    Returns:
+        dict: bucket start date -> (completed_hours, total_hours)
+    """
+    columns = _columns_of(activities)
+    if columns is not None:
+        result = columns.bucket_sums(period, start, end)
+        _add_to_buckets(result, _occurrences_of(activities, start, end), period)
+        return result
+    if start is not None or end is not None:
+        activities = _filter_by_start(activities, start, end)
+    result = {}
+    _add_to_buckets(result, activities, period)
+    return result
+
+
+def _add_to_buckets(result, activities, period):
+    """Add the hours of ``activities`` to ``result`` by start day/week/month."""
+    for a in activities:
+        day = a.start.date()
+        if period == "day":
+            bucket = day
+        elif period == "week":
+            bucket = day - timedelta(days=day.weekday())
+        elif period == "month":
+            bucket = day.replace(day=1)
+        else:
+            raise ValueError(f"Unknown period: {period}")
+        completed, total = result.get(bucket, (0.0, 0.0))
+        hours = a.planned_hours
+        result[bucket] = (completed + hours if a.executed else completed, total + hours)
 
-def map_act_to_dates(activities, start=None, end=None):
-    # normalize defaults: require datetimes
+
+def get_period_range(period, day):
+    """Get the start and end datetime of the day/week/month/year containing ``day``."""
+    first = bucket_start(period, day)
+    start = datetime.combine(first, datetime.min.time())
+    if period == "day":
+        end = start + timedelta(days=1)
+    elif period == "week":
+        end = start + timedelta(days=7)
+    elif period == "month":
+        end = datetime(first.year + first.month // 12, first.month % 12 + 1, 1)
+    else:
+        end = datetime(first.year + 1, 1, 1)
+    return start, end
+
+
+def calculate_period_stats(activities, period, day=None):
+    """Calculate hours and count for the period bucket containing ``day``.
+    
+    Args:
+        activities: List of Activity objects, or a source exposing an
+            AggregateCache as ``aggregates`` (read in constant time)
+        period: 'day', 'week', 'month' or 'year'
+        day: Date inside the bucket; defaults to today
+    
+    Returns:
+        tuple: (total_hours, completed_hours, pending_hours, count)
+    """
+    day = day or datetime.now()
+    start, end = get_period_range(period, day)
+    aggregates = getattr(activities, "aggregates", None)
+    if aggregates is not None:
+        total, completed, pending, count = aggregates.stats(period, day)
+        extra_total, extra_completed, extra_count = _occurrence_totals(activities, start, end)
+        return (total + extra_total, completed + extra_completed,
+                pending + extra_total - extra_completed, count + extra_count)
+    total, completed, pending = calculate_activity_stats(activities, start, end)
+    return total, completed, pending, len(_filter_by_start(activities, start, end))
+
+
+def calculate_period_stats_by_type(activities, period, activity_type, day=None):
+    """Calculate completed and total hours of one type for a period bucket.
+    
+    Args:
+        activities: List of Activity objects, or a source exposing ``aggregates``
+        period: 'day', 'week', 'month' or 'year'
+        activity_type: Type string ('work', 'school', 'hobbies')
+        day: Date inside the bucket; defaults to today
+    
+    Returns:
+        tuple: (completed_hours, total_hours)
+    """
+    day = day or datetime.now()
+    start, end = get_period_range(period, day)
+    aggregates = getattr(activities, "aggregates", None)
+    if aggregates is not None:
+        completed, total = aggregates.stats_by_type(period, day, activity_type)
+        extra_total, extra_completed, _ = _occurrence_totals(activities, start, end, activity_type)
+        return completed + extra_completed, total + extra_total
+    return calculate_stats_by_type(activities, activity_type, start, end)
+
+
+def _filter_by_start(activities, start, end):
+    """Keep activities whose start lies in [start, end); None bounds are open."""
+    if hasattr(activities, "activities_starting_in") and start is not None and end is not None:
+        return activities.activities_starting_in(start, end)
+    return [a for a in activities
+            if (start is None or a.start >= start) and (end is None or a.start < end)]
+
+
+def _normalize_window(start, end):
+    """Fill in a missing bound of a [start, end) window (one day wide by default)."""
     if start is None and end is None:
         start = datetime.now()
         end = start + timedelta(days=1)
@@ -61,34 +252,107 @@ def map_act_to_dates(activities, start=None, end=None):
     # optional safety: ensure start <= end
     if start > end:
         start, end = end, start
-    def overlaps(a):
-        return (a.end > start) and (a.start < end)
-    candidates = [a for a in activities if overlaps(a)]
-    result = defaultdict(list)
-    for activity in candidates:
+    return start, end
+
+
+class DaySlice(namedtuple("DaySlice", "day activity start end hours all_day")):
+    """One day's share of an activity: the activity clipped to [day 00:00, next day 00:00).
+    
+    ``activity`` is a reference to the Activity, not a copy, so a slice
+    stays a small fixed-size tuple.
+    """
+    __slots__ = ()
+    
+    @property
+    def activity_id(self):
+        return self.activity.id
+
+
+def iter_day_slices(activities, start=None, end=None):
+    """Split activities overlapping a window into per-day slices, lazily.
+    
+    Args:
+        activities: List of Activity objects, or an indexed source such as
+            ActivityController
+        start: Window start (defaults to now, or one day before ``end``)
+        end: Window end (defaults to one day after ``start``)
+    
+    Yields:
+        DaySlice(day, activity, start, end, hours, all_day), grouped by
+        activity and in day order within each activity
+    """
+    start, end = _normalize_window(start, end)
+    one_day = timedelta(days=1)
+    for activity in activities_in_range(activities, start, end):
         act_start = max(activity.start, start)
         act_end = min(activity.end, end)
         if act_end <= act_start:
             continue  # no overlap
-    current_date = act_start.date()
-    last_date = (act_end - timedelta(microseconds=1)).date()
-    while current_date <= last_date:
-        day_start = datetime.combine(current_date, datetime.min.time())
-        day_end = day_start + timedelta(days=1)
-        clip_start = max(act_start, day_start)
-        clip_end = min(act_end, day_end)
-        if clip_end > clip_start:
-            duration = (clip_end - clip_start).total_seconds() / 3600.0
-            record = {
-                "activity_id":activity.id,
-                "name":activity.name,
-                "type":activity.type,
-                "executed":activity.executed,
-                "clipped_start":clip_start,
-                "clipped_end":clip_end,
-                "duration_hours":duration,
-                "all_day": clip_start.time() == datetime.min.time() and clip_end == day_end,
-            }
-            result[current_date].append(record)
-        current_date += timedelta(days=1)
-    return dict(result)
\ No newline at end of file
+        day_start = datetime.combine(act_start.date(), datetime.min.time())
+        while day_start < act_end:
+            day_end = day_start + one_day
+            clip_start = max(act_start, day_start)
+            clip_end = min(act_end, day_end)
+            if clip_end > clip_start:
+                yield DaySlice(
+                    day_start.date(),
+                    activity,
+                    clip_start,
+                    clip_end,
+                    (clip_end - clip_start).total_seconds() / 3600.0,
+                    clip_start == day_start and clip_end == day_end,
+                )
+            day_start = day_end
+
+
+def sum_day_slices(activities, start=None, end=None, period="day"):
+    """Reduce day slices straight into per-period hour totals.
+    
+    Unlike calculate_bucket_sums (which buckets whole activities by start),
+    hours are split across the days an activity actually covers. Slices
+    are consumed as they are generated, so a multi-year window takes one
+    streaming pass without holding them.
+    
+    Args:
+        activities: List of Activity objects, or an indexed source
+        start: Window start
+        end: Window end
+        period: Bucket for the totals: 'day', 'week', 'month' or 'year'
+    
+    Returns:
+        dict: bucket start date -> (completed_hours, total_hours)
+    """
+    totals = {}
+    for piece in iter_day_slices(activities, start, end):
+        bucket = bucket_start(period, piece.day)
+        completed, total = totals.get(bucket, (0.0, 0.0))
+        if piece.activity.executed:
+            completed += piece.hours
+        totals[bucket] = (completed, total + piece.hours)
+    return totals
+
+
+def map_act_to_dates(activities, start=None, end=None):
+    """Map each day of a window to the activity pieces falling on it.
+    
+    Kept for callers wanting plain dicts; iter_day_slices yields the same
+    pieces lazily without building a record per slice.
+    
+    Returns:
+        dict: date -> list of record dicts (activity_id, name, type, executed,
+        clipped_start, clipped_end, duration_hours, all_day)
+    """
+    result = defaultdict(list)
+    for piece in iter_day_slices(activities, start, end):
+        activity = piece.activity
+        result[piece.day].append({
+            "activity_id": activity.id,
+            "name": activity.name,
+            "type": activity.type,
+            "executed": activity.executed,
+            "clipped_start": piece.start,
+            "clipped_end": piece.end,
+            "duration_hours": piece.hours,
+            "all_day": piece.all_day,
+        })
+    return dict(result)
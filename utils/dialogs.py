@@ -1,9 +1,16 @@
 """Add/Edit activity dialog."""
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QLineEdit, 
-                             QDoubleSpinBox, QComboBox, QDateTimeEdit, 
-                             QPushButton, QHBoxLayout, QCheckBox)
-from PyQt6.QtCore import QDateTime
+                             QDoubleSpinBox, QComboBox, QDateTimeEdit, QDateEdit,
+                             QPushButton, QHBoxLayout, QCheckBox, QSpinBox, QLabel)
+from PyQt6.QtCore import QDate, QDateTime
 from datetime import datetime
+from utils.recurrence import RecurrenceRule, WEEKDAY_NAMES
+
+
+# Repeat choices: label -> RecurrenceRule frequency (None = one-off activity)
+REPEAT_CHOICES = (("Never", None), ("Daily", "daily"), ("Weekly", "weekly"), ("Monthly", "monthly"))
+# Conflicting activities named in the warning before it says "and N more"
+MAX_LISTED_CONFLICTS = 3
 
 
 class TaskDialog(QDialog):
@@ -15,12 +22,20 @@ class TaskDialog(QDialog):
     - Start datetime
     - End datetime
     - Executed checkbox (mark if completed)
+    - Repeat: frequency, interval, weekdays, end date and occurrence count
+    
+    ``activity`` may also be a RecurrenceRule; the repeat fields then show
+    its schedule and Executed is disabled (it applies per occurrence).
+    
+    With a ``conflict_source`` (e.g. ActivityController), activities
+    overlapping the chosen start/end are listed live below the form.
     """
     
-    def __init__(self, activity=None, parent=None):
+    def __init__(self, activity=None, parent=None, conflict_source=None):
         super().__init__(parent)
         self.setWindowTitle("Add Activity" if activity is None else "Edit Activity")
         self.activity = activity
+        self.conflict_source = conflict_source
         
         layout = QVBoxLayout(self)
         form = QFormLayout()
@@ -51,8 +66,48 @@ class TaskDialog(QDialog):
         self.executed_input = QCheckBox()
         form.addRow("Executed:", self.executed_input)
         
+        # Repeat
+        self.repeat_input = QComboBox()
+        for label, freq in REPEAT_CHOICES:
+            self.repeat_input.addItem(label, freq)
+        form.addRow("Repeat:", self.repeat_input)
+        
+        self.interval_input = QSpinBox()
+        self.interval_input.setRange(1, 99)
+        form.addRow("Every:", self.interval_input)
+        
+        weekday_row = QHBoxLayout()
+        self.weekday_inputs = []
+        for name in WEEKDAY_NAMES:
+            checkbox = QCheckBox(name)
+            weekday_row.addWidget(checkbox)
+            self.weekday_inputs.append(checkbox)
+        form.addRow("On:", weekday_row)
+        
+        # The minimum date stands for "no end date"
+        self.until_input = QDateEdit()
+        self.until_input.setCalendarPopup(True)
+        self.until_input.setMinimumDate(QDate(2000, 1, 1))
+        self.until_input.setSpecialValueText("never")
+        self.until_input.setDate(self.until_input.minimumDate())
+        form.addRow("Until:", self.until_input)
+        
+        self.count_input = QSpinBox()
+        self.count_input.setRange(0, 9999)
+        self.count_input.setSpecialValueText("no limit")
+        form.addRow("Occurrences:", self.count_input)
+        
+        self.repeat_input.currentIndexChanged.connect(self._update_repeat_fields)
+        
         layout.addLayout(form)
         
+        # Live overlap warning
+        self.conflict_label = QLabel()
+        self.conflict_label.setWordWrap(True)
+        self.conflict_label.setStyleSheet("color: #e57373;")
+        self.conflict_label.setVisible(False)
+        layout.addWidget(self.conflict_label)
+        
         # Buttons
         btn_layout = QHBoxLayout()
         self.btn_save = QPushButton("Save")
@@ -68,24 +123,88 @@ class TaskDialog(QDialog):
         # Populate if editing
         if activity:
             self._populate_fields(activity)
+        self._update_repeat_fields()
+        
+        if conflict_source is not None:
+            self.start_input.dateTimeChanged.connect(self._update_conflicts)
+            self.end_input.dateTimeChanged.connect(self._update_conflicts)
+            self._update_conflicts()
     
     def _populate_fields(self, activity):
-        """Fill form with existing activity data."""
+        """Fill form with existing activity (or recurrence rule) data."""
         self.name_input.setText(activity.name)
         self.type_input.setCurrentText(activity.type)
-        self.executed_input.setChecked(activity.executed)
         
         if isinstance(activity.start, datetime):
             self.start_input.setDateTime(QDateTime(activity.start))
         if isinstance(activity.end, datetime):
             self.end_input.setDateTime(QDateTime(activity.end))
+        
+        if isinstance(activity, RecurrenceRule):
+            self.repeat_input.setCurrentIndex(self.repeat_input.findData(activity.freq))
+            self.interval_input.setValue(activity.interval)
+            for day in activity.by_weekday or ():
+                self.weekday_inputs[day].setChecked(True)
+            if activity.until:
+                self.until_input.setDate(QDate(activity.until.date()))
+            self.count_input.setValue(activity.count or 0)
+        else:
+            self.executed_input.setChecked(activity.executed)
+    
+    def _update_repeat_fields(self):
+        """Enable the repeat options that apply to the chosen frequency."""
+        freq = self.repeat_input.currentData()
+        for widget in (self.interval_input, self.until_input, self.count_input):
+            widget.setEnabled(freq is not None)
+        for checkbox in self.weekday_inputs:
+            checkbox.setEnabled(freq == "weekly")
+        self.executed_input.setEnabled(freq is None)
+    
+    def _update_conflicts(self):
+        """Show the activities overlapping the current start/end, if any."""
+        start = self.start_input.dateTime().toPyDateTime()
+        end = self.end_input.dateTime().toPyDateTime()
+        exclude_id = self.activity.id if self.activity is not None else None
+        conflicts = self.conflict_source.conflicts(start, end, exclude_id) if end > start else []
+        if not conflicts:
+            self.conflict_label.setVisible(False)
+            return
+        names = [f"{a.name} ({a.start:%a %H:%M}-{a.end:%H:%M})"
+                 for a in conflicts[:MAX_LISTED_CONFLICTS]]
+        if len(conflicts) > MAX_LISTED_CONFLICTS:
+            names.append(f"and {len(conflicts) - MAX_LISTED_CONFLICTS} more")
+        self.conflict_label.setText("Overlaps: " + ", ".join(names))
+        self.conflict_label.setVisible(True)
+    
+    def _get_repeat(self):
+        """Return the RecurrenceRule options of the form, or None for a one-off activity."""
+        freq = self.repeat_input.currentData()
+        if freq is None:
+            return None
+        until = None
+        if self.until_input.date() != self.until_input.minimumDate():
+            until = datetime.combine(self.until_input.date().toPyDate(), datetime.max.time())
+        by_weekday = [day for day, checkbox in enumerate(self.weekday_inputs) if checkbox.isChecked()]
+        return {
+            "freq": freq,
+            "interval": self.interval_input.value(),
+            "by_weekday": by_weekday if freq == "weekly" and by_weekday else None,
+            "until": until,
+            "count": self.count_input.value() or None,
+        }
     
     def get_data(self):
-        """Return dict with form data."""
+        """Return dict with form data.
+        
+        ``repeat`` is None for a one-off activity, otherwise a dict of
+        RecurrenceRule options (freq, interval, by_weekday, until, count).
+        """
+        repeat = self._get_repeat()
         return {
             "name": self.name_input.text(),
             "type": self.type_input.currentText(),
             "start": self.start_input.dateTime().toPyDateTime(),
             "end": self.end_input.dateTime().toPyDateTime(),
-            "executed": self.executed_input.isChecked()
+            "executed": self.executed_input.isChecked() and repeat is None,
+            "repeat": repeat,
         }
@@ -0,0 +1,164 @@
+"""Opt-in timing of hot paths.
+
+Enabled by setting ``CRAMIT_INSTRUMENT=1`` (``CramITApp.py --instrument``
+does this) before the application modules are imported. When disabled,
+``timed`` returns the decorated function unchanged, so there is no
+overhead at all.
+
+When enabled, every call of a ``timed`` function is recorded in a rolling
+``Histogram`` (p50/p95/max over the last ``WINDOW`` calls). The numbers
+are shown by ``widgets.debug_overlay`` and written as JSON by ``dump``
+(also at exit). Setting ``CRAMIT_PROFILE_OP`` to an operation name (e.g.
+``controller.add_activity``) additionally runs that operation under
+cProfile; the stats are saved next to the JSON dump as a ``.prof`` file.
+"""
+import atexit
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+ENABLED = os.environ.get("CRAMIT_INSTRUMENT", "") not in ("", "0")
+PROFILE_OP = os.environ.get("CRAMIT_PROFILE_OP") or None
+# Output file for dump(); defaults to ~/.cramit/instrumentation.json
+DUMP_FILE = os.environ.get("CRAMIT_INSTRUMENT_DUMP") or None
+
+# Number of most recent calls the percentiles are computed over
+WINDOW = 1000
+
+_lock = threading.Lock()
+_histograms = {}
+_profiler = None
+_profile_depth = 0
+
+
+class Histogram:
+    """Durations of the most recent calls of one operation, plus totals."""
+
+    def __init__(self, window=WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, p):
+        """Return the ``p``-th percentile (0-100) of the recent samples."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self):
+        """Return count, mean, p50, p95 and max, in milliseconds."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p95_ms": self.percentile(95) * 1e3,
+            "max_ms": max(self.samples, default=0.0) * 1e3,
+        }
+
+
+def record(name, seconds):
+    """Add one duration to the histogram of ``name``."""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.add(seconds)
+
+
+def _profiled(fn, args, kwargs):
+    """Call ``fn`` with the shared profiler enabled (outermost call only)."""
+    global _profiler, _profile_depth
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+    _profile_depth += 1
+    if _profile_depth == 1:
+        _profiler.enable()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _profile_depth -= 1
+        if _profile_depth == 0:
+            _profiler.disable()
+
+
+def timed(name):
+    """Decorator recording the duration of every call under ``name``.
+
+    Returns the function itself when instrumentation is disabled.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        profile = name == PROFILE_OP
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                if profile:
+                    return _profiled(fn, args, kwargs)
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    """Return ``{name: summary}`` for every recorded operation, sorted by name."""
+    with _lock:
+        return {name: _histograms[name].summary() for name in sorted(_histograms)}
+
+
+def _dump_path():
+    if DUMP_FILE:
+        return DUMP_FILE
+    from utils.storage import STORAGE_DIR, ensure_storage
+    ensure_storage()
+    return str(STORAGE_DIR / "instrumentation.json")
+
+
+def dump(path=None):
+    """Write the current histograms (and cProfile stats, if any) to disk.
+
+    Args:
+        path: JSON output file; defaults to ``CRAMIT_INSTRUMENT_DUMP`` or
+            ``~/.cramit/instrumentation.json``
+
+    Returns:
+        The path written
+    """
+    path = path or _dump_path()
+    data = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "window": WINDOW,
+        "profile_op": PROFILE_OP,
+        "operations": snapshot(),
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    if _profiler is not None:
+        _profiler.dump_stats(os.path.splitext(path)[0] + ".prof")
+    return path
+
+
+def _dump_at_exit():
+    try:
+        dump()
+    except Exception as e:
+        print(f"Error writing instrumentation: {e}")
+
+
+if ENABLED:
+    atexit.register(_dump_at_exit)
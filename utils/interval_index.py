@@ -0,0 +1,100 @@
+"""Interval index for time-range queries over activities."""
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+
+class IntervalIndex:
+    """Activities sorted by start time for fast overlap queries.
+
+    Activities are kept in a list of ``(start, id)`` keys sorted with bisect.
+    A query for ``[start, end)`` only has to look at keys starting between
+    ``start - LONG_SPAN`` and ``end``, so its cost follows the size of the
+    result rather than the history. Activities longer than ``LONG_SPAN``
+    (rare) are kept aside and always checked.
+
+    The index remembers the start each activity was indexed with, so it must
+    be told about every change through ``add``/``update``/``remove``.
+    """
+
+    LONG_SPAN = timedelta(days=7)
+
+    def __init__(self, activities=()):
+        self._keys = []       # sorted (start, id)
+        self._by_key = {}     # (start, id) -> Activity
+        self._indexed = {}    # id -> indexed key, or None for long activities
+        self._long = {}       # id -> Activity spanning more than LONG_SPAN
+        for activity in activities:
+            self._place(activity, sort=False)
+        self._keys.sort()
+
+    def __len__(self):
+        return len(self._indexed)
+
+    def _place(self, activity, sort=True):
+        if activity.end - activity.start > self.LONG_SPAN:
+            self._long[activity.id] = activity
+            self._indexed[activity.id] = None
+            return
+        key = (activity.start, activity.id)
+        self._by_key[key] = activity
+        self._indexed[activity.id] = key
+        if sort:
+            insort(self._keys, key)
+        else:
+            self._keys.append(key)
+
+    def add(self, activity):
+        """Index a new activity."""
+        self._place(activity)
+
+    def add_many(self, activities):
+        """Index several new activities with a single sort.
+
+        Keys are appended and the list re-sorted once; the existing keys
+        form one sorted run, so the sort is close to a linear merge rather
+        than one O(n) ``insort`` per activity.
+        """
+        for activity in activities:
+            self._place(activity, sort=False)
+        self._keys.sort()
+
+    def update(self, activity):
+        """Re-index an activity after its start or end changed."""
+        self.remove(activity.id)
+        self._place(activity)
+
+    def remove(self, activity_id):
+        """Remove an activity from the index; unknown IDs are ignored."""
+        if activity_id not in self._indexed:
+            return
+        key = self._indexed.pop(activity_id)
+        if key is None:
+            del self._long[activity_id]
+            return
+        del self._by_key[key]
+        i = bisect_left(self._keys, key)
+        del self._keys[i]
+
+    def overlapping(self, start, end):
+        """Return activities overlapping [start, end), ordered by start."""
+        lo = bisect_left(self._keys, (start - self.LONG_SPAN,))
+        hi = bisect_left(self._keys, (end,))
+        by_key = self._by_key
+        result = [by_key[k] for k in self._keys[lo:hi] if by_key[k].end > start]
+        long_hits = [a for a in self._long.values() if a.start < end and a.end > start]
+        if long_hits:
+            result.extend(long_hits)
+            result.sort(key=lambda a: a.start)
+        return result
+
+    def starting_in(self, start, end):
+        """Return activities whose start lies in [start, end), ordered by start."""
+        lo = bisect_left(self._keys, (start,))
+        hi = bisect_left(self._keys, (end,))
+        by_key = self._by_key
+        result = [by_key[k] for k in self._keys[lo:hi]]
+        long_hits = [a for a in self._long.values() if start <= a.start < end]
+        if long_hits:
+            result.extend(long_hits)
+            result.sort(key=lambda a: a.start)
+        return result
@@ -1,22 +1,37 @@
 """Activity data model."""
+import copy
+import sys
 import uuid
 from datetime import datetime
 
 
+def _intern(value):
+    """Intern a string field; other values (e.g. None from old records) pass through."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
 class Activity:
-    """Represents a planned activity with time tracking."""
+    """Represents a planned activity with time tracking.
+    
+    Instances use ``__slots__`` instead of a per-instance ``__dict__``, and
+    the low-cardinality ``type``/``category``/``subcategory`` strings are
+    interned so a large history shares one object per distinct value.
+    """
+    
+    __slots__ = ("id", "name", "type", "start", "end", "executed",
+                 "category", "subcategory")
     
     def __init__(self, name="", activity_type="work", 
                  start=None, end=None, executed=False, activity_id=None,
                  category="general", subcategory=""):
         self.id = activity_id or str(uuid.uuid4())
         self.name = name
-        self.type = activity_type  # work, school, hobbies
+        self.type = _intern(activity_type)  # work, school, hobbies
         self.start = start or datetime.now()
         self.end = end or datetime.now()
         self.executed = executed  # Boolean: was this activity completed?
-        self.category = category
-        self.subcategory = subcategory
+        self.category = _intern(category)
+        self.subcategory = _intern(subcategory)
 
     @property
     def planned_hours(self):
@@ -26,6 +41,10 @@ class Activity:
             return duration.total_seconds() / 3600.0
         return 0.0
     
+    def copy(self):
+        """Return an independent copy (all fields are immutable values)."""
+        return copy.copy(self)
+    
     def to_dict(self):
         """Convert to dict for JSON storage."""
         return {
@@ -41,20 +60,22 @@ class Activity:
     
     @classmethod
     def from_dict(cls, data):
-        """Create Activity from dict."""
-        act = cls(
-            name=data.get("name", ""),
-            activity_type=data.get("type", "work"),
-            executed=data.get("executed", False),
-            activity_id=data.get("id"),
-            category=data.get("category", "general"),
-            subcategory=data.get("subcategory", ""),
-        )
-        # Parse ISO datetime strings
+        """Create Activity from dict.
+        
+        Fields are assigned directly instead of going through ``__init__``,
+        so loading a record never generates a throwaway uuid or calls
+        ``datetime.now()`` for values that are overwritten anyway.
+        """
+        act = cls.__new__(cls)
+        act.id = data.get("id") or str(uuid.uuid4())
+        act.name = data.get("name", "")
+        act.type = _intern(data.get("type", "work"))
         start = data.get("start")
-        if isinstance(start, str):
-            act.start = datetime.fromisoformat(start)
         end = data.get("end")
-        if isinstance(end, str):
-            act.end = datetime.fromisoformat(end)
+        # Parse ISO datetime strings
+        act.start = datetime.fromisoformat(start) if isinstance(start, str) else (start or datetime.now())
+        act.end = datetime.fromisoformat(end) if isinstance(end, str) else (end or datetime.now())
+        act.executed = data.get("executed", False)
+        act.category = _intern(data.get("category", "general"))
+        act.subcategory = _intern(data.get("subcategory", ""))
         return act
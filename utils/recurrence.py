@@ -0,0 +1,328 @@
+"""Recurring activities.
+
+A ``RecurrenceRule`` describes a whole series (a daily standup, a weekly
+class) as one compact record instead of one stored Activity per
+occurrence. Occurrences are generated on demand, only for the window
+being queried, as ordinary Activity objects with IDs of the form
+``<rule id>@<YYYY-MM-DD>``. Expanded windows are kept in an
+``ExpansionCache`` so repainting the same week or month does not expand
+the rules again.
+
+Single occurrences can be skipped (``exceptions``) or changed, e.g. marked
+executed or moved, through per-date ``overrides``.
+"""
+import copy
+import sys
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from utils.models import Activity
+
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+# Fields an occurrence override may change
+OVERRIDE_FIELDS = ("name", "start", "end", "executed")
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def occurrence_id(rule_id, day):
+    """Return the activity ID of the occurrence of a rule on ``day``."""
+    return f"{rule_id}@{day.isoformat()}"
+
+
+def split_occurrence_id(activity_id):
+    """Split an occurrence ID into (rule ID, date).
+
+    Returns:
+        tuple, or None if ``activity_id`` is not an occurrence ID
+    """
+    rule_id, sep, day = activity_id.rpartition("@")
+    if not sep:
+        return None
+    try:
+        return rule_id, date.fromisoformat(day)
+    except ValueError:
+        return None
+
+
+def _to_json(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _from_json(field, value):
+    if field in ("start", "end") and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+class RecurrenceRule:
+    """A series of activities repeating daily, weekly or monthly.
+
+    ``start``/``end`` are the times of the first occurrence; every other
+    occurrence has the same time of day and duration. The series ends at
+    ``until`` (inclusive, compared with occurrence starts) or after
+    ``count`` occurrences, whichever comes first; with neither it repeats
+    forever. As in iCalendar, skipped dates still count towards ``count``,
+    and monthly dates missing from a month (the 31st in April) are left out.
+    """
+
+    def __init__(self, name="", activity_type="work", start=None, end=None,
+                 freq="weekly", interval=1, by_weekday=None, until=None, count=None,
+                 exceptions=None, overrides=None, rule_id=None,
+                 category="general", subcategory=""):
+        """Create a rule.
+
+        Args:
+            name: Name of every occurrence
+            activity_type: Type of every occurrence (work, school, hobbies)
+            start: Start datetime of the first occurrence
+            end: End datetime of the first occurrence
+            freq: 'daily', 'weekly' or 'monthly'
+            interval: Repeat every ``interval`` days/weeks/months
+            by_weekday: Weekly only: weekdays (0 = Monday) to repeat on;
+                defaults to the weekday of ``start``
+            until: Optional datetime after which no occurrence starts
+            count: Optional total number of occurrences
+            exceptions: Dates whose occurrence is skipped
+            overrides: Dict date -> {field: value} changing one occurrence
+                (fields from OVERRIDE_FIELDS)
+            rule_id: ID of the rule; generated if omitted
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Unknown recurrence frequency: {freq}")
+        self.id = rule_id or str(uuid.uuid4())
+        self.name = name
+        self.type = sys.intern(activity_type)
+        self.start = start or datetime.now()
+        self.end = end or self.start + timedelta(hours=1)
+        self.freq = freq
+        self.interval = max(1, int(interval))
+        self.by_weekday = sorted(set(by_weekday)) if by_weekday and freq == "weekly" else None
+        self.until = until
+        self.count = count or None
+        self.exceptions = set(exceptions or ())
+        self.overrides = {day: dict(fields) for day, fields in (overrides or {}).items()}
+        self.category = sys.intern(category)
+        self.subcategory = sys.intern(subcategory)
+
+    @property
+    def planned_hours(self):
+        """Hours of a single occurrence."""
+        return (self.end - self.start).total_seconds() / 3600.0
+
+    def describe(self):
+        """Return a short human-readable summary, e.g. 'every 2 weeks on Mon, Wed'."""
+        unit = {"daily": "day", "weekly": "week", "monthly": "month"}[self.freq]
+        text = self.freq if self.interval == 1 else f"every {self.interval} {unit}s"
+        if self.by_weekday:
+            text += " on " + ", ".join(WEEKDAY_NAMES[d] for d in self.by_weekday)
+        if self.count:
+            text += f", {self.count} times"
+        if self.until:
+            text += f", until {self.until:%Y-%m-%d}"
+        return text
+
+    def copy(self):
+        """Return an independent copy (exceptions and overrides included)."""
+        return copy.deepcopy(self)
+
+    def _iter_starts(self, after):
+        """Yield (index, start) of every occurrence, in order, from about ``after`` on.
+
+        ``index`` counts occurrences from the first one, so ``count`` can be
+        checked without walking the whole series. Daily and weekly rules
+        jump straight to ``after``; the first yielded start may lie before it.
+        Exceptions, ``until`` and ``count`` are left to the caller.
+        """
+        first = self.start
+        if self.freq == "daily":
+            step = timedelta(days=self.interval)
+            k = max(0, (after - first) // step)
+            while True:
+                yield k, first + k * step
+                k += 1
+        elif self.freq == "weekly":
+            weekdays = self.by_weekday or [first.weekday()]
+            # Weekdays before the start are not part of the first week
+            lead = [d for d in weekdays if d >= first.weekday()]
+            week0 = first - timedelta(days=first.weekday())
+            block = max(0, (after - week0).days // (7 * self.interval))
+            index = 0 if block == 0 else len(lead) + (block - 1) * len(weekdays)
+            while True:
+                monday = week0 + timedelta(weeks=block * self.interval)
+                for d in lead if block == 0 else weekdays:
+                    yield index, monday + timedelta(days=d)
+                    index += 1
+                block += 1
+        else:
+            index = 0
+            k = 0
+            while True:
+                month = first.month - 1 + k * self.interval
+                k += 1
+                try:
+                    start = first.replace(year=first.year + month // 12, month=month % 12 + 1)
+                except ValueError:
+                    continue  # the month has no such day
+                yield index, start
+                index += 1
+
+    def _in_series(self, index, start):
+        """Return False once ``start`` is past the end of the series."""
+        if self.count is not None and index >= self.count:
+            return False
+        return self.until is None or start <= self.until
+
+    def _occurrence(self, day, start):
+        """Build the Activity for the occurrence on ``day``, overrides applied."""
+        activity = Activity(
+            name=self.name,
+            activity_type=self.type,
+            start=start,
+            end=start + (self.end - self.start),
+            activity_id=occurrence_id(self.id, day),
+            category=self.category,
+            subcategory=self.subcategory,
+        )
+        for field, value in self.overrides.get(day, {}).items():
+            setattr(activity, field, value)
+        return activity
+
+    def occurrences(self, start, end):
+        """Expand the occurrences overlapping the half-open range [start, end).
+
+        Only the part of the series near the window is generated (monthly
+        rules walk from the first month, about a dozen steps per year).
+
+        Returns:
+            list: Activity objects in start order
+        """
+        result = []
+        if end <= self.start:
+            return result
+        seen = set()
+        duration = self.end - self.start
+        for index, occ_start in self._iter_starts(start - duration):
+            if occ_start >= end or not self._in_series(index, occ_start):
+                break
+            day = occ_start.date()
+            seen.add(day)
+            if day in self.exceptions:
+                continue
+            activity = self._occurrence(day, occ_start)
+            if _overlaps(activity, start, end):
+                result.append(activity)
+        # Occurrences moved into the window from a slot outside it
+        moved_in = False
+        for day, fields in self.overrides.items():
+            if day in seen or not ("start" in fields or "end" in fields):
+                continue
+            activity = self.occurrence_on(day)
+            if activity is not None and _overlaps(activity, start, end):
+                result.append(activity)
+                moved_in = True
+        if moved_in:
+            result.sort(key=lambda a: a.start)
+        return result
+
+    def occurrence_on(self, day):
+        """Return the occurrence scheduled on ``day``, or None if there is none."""
+        if day in self.exceptions:
+            return None
+        day_start = datetime.combine(day, datetime.min.time())
+        for index, occ_start in self._iter_starts(day_start):
+            if occ_start.date() > day or not self._in_series(index, occ_start):
+                return None
+            if occ_start.date() == day:
+                return self._occurrence(day, occ_start)
+        return None
+
+    def to_dict(self):
+        """Convert to a compact dict for JSON storage; unset options are left out."""
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "type": self.type,
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "freq": self.freq,
+            "interval": self.interval,
+            "category": self.category,
+            "subcategory": self.subcategory,
+        }
+        if self.by_weekday:
+            data["by_weekday"] = self.by_weekday
+        if self.until:
+            data["until"] = self.until.isoformat()
+        if self.count:
+            data["count"] = self.count
+        if self.exceptions:
+            data["exceptions"] = sorted(day.isoformat() for day in self.exceptions)
+        if self.overrides:
+            data["overrides"] = {
+                day.isoformat(): {field: _to_json(value) for field, value in fields.items()}
+                for day, fields in sorted(self.overrides.items())
+            }
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create a RecurrenceRule from a dict written by to_dict."""
+        until = data.get("until")
+        return cls(
+            name=data.get("name", ""),
+            activity_type=data.get("type", "work"),
+            start=datetime.fromisoformat(data["start"]),
+            end=datetime.fromisoformat(data["end"]),
+            freq=data.get("freq", "weekly"),
+            interval=data.get("interval", 1),
+            by_weekday=data.get("by_weekday"),
+            until=datetime.fromisoformat(until) if until else None,
+            count=data.get("count"),
+            exceptions=[date.fromisoformat(d) for d in data.get("exceptions", ())],
+            overrides={
+                date.fromisoformat(day): {field: _from_json(field, value)
+                                          for field, value in fields.items()}
+                for day, fields in data.get("overrides", {}).items()
+            },
+            rule_id=data.get("id"),
+            category=data.get("category", "general"),
+            subcategory=data.get("subcategory", ""),
+        )
+
+
+def _overlaps(activity, start, end):
+    """True if ``activity`` overlaps [start, end); zero-length ones count at their start."""
+    return activity.start < end and (activity.end > start or activity.start >= start)
+
+
+class ExpansionCache:
+    """LRU cache of expanded windows: (start, end) -> list of occurrences.
+
+    Views query the same windows over and over (the visible week, the
+    days of the visible month), so each is expanded once until the rules
+    change and the cache is cleared.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._windows = OrderedDict()
+
+    def get(self, start, end, expand):
+        """Return the cached expansion of [start, end), calling ``expand(start, end)`` on a miss."""
+        key = (start, end)
+        occurrences = self._windows.get(key)
+        if occurrences is not None:
+            self._windows.move_to_end(key)
+            return occurrences
+        occurrences = self._windows[key] = expand(start, end)
+        if len(self._windows) > self.maxsize:
+            self._windows.popitem(last=False)
+        return occurrences
+
+    def clear(self):
+        """Forget every expanded window."""
+        self._windows.clear()
+
+    def __len__(self):
+        return len(self._windows)
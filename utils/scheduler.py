@@ -0,0 +1,203 @@
+"""Scheduling optimizer: fit unscheduled tasks into free time.
+
+Free time is found with one sorted sweep over the busy intervals of the
+existing activities. Tasks are then taken from a priority queue (earliest
+deadline first by default) and each is placed greedily in the earliest
+free slot that fits its duration, allowed hours and deadline. The
+placements are returned as proposed Activity objects; nothing is saved,
+so a caller can review them and store the accepted ones (e.g. with
+``ActivityController.add_many``). No Qt is involved.
+
+Example:
+    tasks = [Task("Essay", timedelta(hours=2), "school",
+                  deadline=datetime(2026, 5, 8), allowed_hours=(9, 18))]
+    result = schedule(tasks, controller)
+    for activity in result.placements:
+        print(activity.name, activity.start, activity.end)
+"""
+import heapq
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta
+from utils.models import Activity
+
+
+# Result of schedule(): proposed Activity objects and the tasks that did not fit
+ScheduleResult = namedtuple("ScheduleResult", "placements unplaced")
+
+STRATEGIES = ("deadline", "priority")
+
+
+class Task:
+    """A task waiting to be scheduled.
+
+    Attributes:
+        name: Name of the activity to create
+        duration: timedelta the task needs, in one piece
+        type: Activity type (work, school, hobbies)
+        deadline: Optional datetime by which the task must end
+        earliest: Optional datetime before which the task must not start
+        allowed_hours: Optional (first_hour, last_hour) of the day the task
+            may occupy, e.g. (9, 17.5); None allows any time
+        allowed_weekdays: Optional weekdays (0 = Monday) the task may use
+        priority: Higher values are placed first among equal deadlines
+            (or first overall with the 'priority' strategy)
+    """
+
+    def __init__(self, name, duration, activity_type="work", deadline=None, earliest=None,
+                 allowed_hours=None, allowed_weekdays=None, priority=0):
+        if duration <= timedelta(0):
+            raise ValueError(f"Task duration must be positive: {name}")
+        self.name = name
+        self.duration = duration
+        self.type = activity_type
+        self.deadline = deadline
+        self.earliest = earliest
+        self.allowed_hours = allowed_hours
+        self.allowed_weekdays = set(allowed_weekdays) if allowed_weekdays is not None else None
+        self.priority = priority
+
+    def __repr__(self):
+        return f"Task({self.name!r}, {self.duration}, deadline={self.deadline})"
+
+
+def _busy_spans(activities, start, end, padding):
+    """Return (start, end) pairs of the activities overlapping [start, end)."""
+    if hasattr(activities, "activities_in_range"):
+        # Indexed source: only the horizon is looked at, not the whole history
+        found = activities.activities_in_range(start - padding, end + padding)
+    else:
+        found = [a for a in activities if a.start < end + padding and a.end > start - padding]
+    return [(a.start - padding, a.end + padding) for a in found]
+
+
+def free_intervals(busy, start, end):
+    """Return the gaps between busy intervals inside [start, end).
+
+    One sweep over the intervals sorted by start merges overlapping and
+    touching ones and emits the gaps between them.
+
+    Args:
+        busy: Iterable of (start, end) datetime pairs, in any order
+        start: Start of the window
+        end: End of the window
+
+    Returns:
+        list: Disjoint (start, end) pairs in chronological order
+    """
+    free = []
+    cursor = start
+    for busy_start, busy_end in sorted(busy):
+        if busy_end <= cursor:
+            continue
+        if busy_start >= end:
+            break
+        if busy_start > cursor:
+            free.append((cursor, busy_start))
+        cursor = busy_end
+    if cursor < end:
+        free.append((cursor, end))
+    return free
+
+
+def _ceil_to(moment, step):
+    """Round ``moment`` up to a multiple of ``step`` after midnight."""
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    remainder = (moment - midnight) % step
+    return moment if not remainder else moment + (step - remainder)
+
+
+def _windows(task, free_start, free_end):
+    """Yield the parts of [free_start, free_end) inside the task's allowed days/hours."""
+    if task.allowed_hours is None and task.allowed_weekdays is None:
+        yield free_start, free_end
+        return
+    first_hour, last_hour = task.allowed_hours or (0, 24)
+    day = free_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < free_end:
+        if task.allowed_weekdays is None or day.weekday() in task.allowed_weekdays:
+            window_start = max(free_start, day + timedelta(hours=first_hour))
+            window_end = min(free_end, day + timedelta(hours=last_hour))
+            if window_start < window_end:
+                yield window_start, window_end
+        day += timedelta(days=1)
+
+
+def _queue_key(task, strategy):
+    deadline = task.deadline or datetime.max
+    if strategy == "priority":
+        return (-task.priority, deadline, -task.duration)
+    return (deadline, -task.priority, -task.duration)
+
+
+def schedule(tasks, activities, start=None, horizon=timedelta(days=14),
+             granularity=timedelta(minutes=15), padding=timedelta(0), strategy="deadline"):
+    """Propose start times for ``tasks`` in the free time between ``activities``.
+
+    Args:
+        tasks: Iterable of Task objects
+        activities: List of Activity objects, or an indexed source such as
+            ActivityController (recurring occurrences included)
+        start: Earliest start of any placement; defaults to now
+        horizon: How far after ``start`` tasks may be placed; a task's
+            deadline cuts its own search short
+        granularity: Placements start on multiples of this after midnight
+        padding: Free time kept before and after every existing activity
+        strategy: 'deadline' places the earliest deadline first, ties broken
+            by priority; 'priority' places the highest priority first
+
+    Returns:
+        ScheduleResult(placements, unplaced): proposed Activity objects
+        (not saved anywhere) and the tasks that did not fit
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown scheduling strategy: {strategy}")
+    start = _ceil_to(start or datetime.now(), granularity)
+    end = start + horizon
+    free = free_intervals(_busy_spans(activities, start, end, padding), start, end)
+    # Parallel lists; intervals stay disjoint and sorted, so ends are sorted too
+    free_starts = [s for s, _ in free]
+    free_ends = [e for _, e in free]
+
+    queue = [(_queue_key(task, strategy), order, task) for order, task in enumerate(tasks)]
+    heapq.heapify(queue)
+    placements = []
+    unplaced = []
+    while queue:
+        _, _, task = heapq.heappop(queue)
+        slot = _find_slot(task, free_starts, free_ends, start, end, granularity)
+        if slot is None:
+            unplaced.append(task)
+            continue
+        slot_start, i = slot
+        slot_end = slot_start + task.duration
+        # Split the free interval around the placement
+        pieces = []
+        if free_starts[i] < slot_start:
+            pieces.append((free_starts[i], slot_start))
+        if slot_end < free_ends[i]:
+            pieces.append((slot_end, free_ends[i]))
+        free_starts[i:i + 1] = [s for s, _ in pieces]
+        free_ends[i:i + 1] = [e for _, e in pieces]
+        placements.append(Activity(name=task.name, activity_type=task.type,
+                                   start=slot_start, end=slot_end))
+    placements.sort(key=lambda a: a.start)
+    return ScheduleResult(placements, unplaced)
+
+
+def _find_slot(task, free_starts, free_ends, start, end, granularity):
+    """Return (slot_start, free interval index) of the earliest fit, or None."""
+    earliest = max(start, task.earliest) if task.earliest else start
+    latest = min(end, task.deadline) if task.deadline else end
+    if earliest + task.duration > latest:
+        return None
+    # First free interval ending after the earliest start
+    for i in range(bisect_right(free_ends, earliest), len(free_ends)):
+        if free_starts[i] + task.duration > latest:
+            return None
+        for window_start, window_end in _windows(task, max(free_starts[i], earliest),
+                                                 min(free_ends[i], latest)):
+            slot_start = _ceil_to(window_start, granularity)
+            if slot_start + task.duration <= window_end:
+                return slot_start, i
+    return None
@@ -0,0 +1,183 @@
+"""SQLite storage backend for activities.
+
+Each controller mutation becomes a single-row UPSERT or DELETE. The index
+on end_at serves the split into recent and older activities used by the
+background loader.
+On first use the existing JSON data (snapshot plus journal) is migrated in.
+Recurrence rules are kept as one JSON record per row in ``recurrences``.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from utils.models import Activity
+from utils.recurrence import RecurrenceRule
+from utils.storage import (StorageBackend, STORAGE_DIR, ensure_storage,
+                           has_stored_data, load_activities, load_recurrences)
+
+
+DATABASE_FILE = STORAGE_DIR / "activities.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    start_at TEXT NOT NULL,
+    end_at TEXT NOT NULL,
+    executed INTEGER NOT NULL DEFAULT 0,
+    category TEXT NOT NULL DEFAULT 'general',
+    subcategory TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_activities_end ON activities(end_at);
+-- Indexes of earlier versions that no query reads; they only slowed writes
+DROP INDEX IF EXISTS idx_activities_start;
+DROP INDEX IF EXISTS idx_activities_type;
+DROP INDEX IF EXISTS idx_activities_executed;
+CREATE TABLE IF NOT EXISTS recurrences (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+COLUMNS = "id, name, type, start_at, end_at, executed, category, subcategory"
+
+UPSERT_SQL = f"""
+INSERT INTO activities ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name,
+    type = excluded.type,
+    start_at = excluded.start_at,
+    end_at = excluded.end_at,
+    executed = excluded.executed,
+    category = excluded.category,
+    subcategory = excluded.subcategory
+"""
+
+
+def _to_row(activity):
+    """Convert an Activity to a parameter tuple for UPSERT_SQL."""
+    return (
+        activity.id,
+        activity.name,
+        activity.type,
+        activity.start.isoformat(),
+        activity.end.isoformat(),
+        int(bool(activity.executed)),
+        activity.category,
+        activity.subcategory,
+    )
+
+
+def _rule_row(rule):
+    """Convert a RecurrenceRule to an (id, data) row."""
+    return rule.id, json.dumps(rule.to_dict(), ensure_ascii=False)
+
+
+def _from_row(row):
+    """Convert a result row (in COLUMNS order) to an Activity."""
+    return Activity(
+        activity_id=row[0],
+        name=row[1],
+        activity_type=row[2],
+        start=datetime.fromisoformat(row[3]),
+        end=datetime.fromisoformat(row[4]),
+        executed=bool(row[5]),
+        category=row[6],
+        subcategory=row[7],
+    )
+
+
+class SqliteStorage(StorageBackend):
+    """Activity storage in a local SQLite database.
+
+    Timestamps are stored as ISO-8601 strings, which sort chronologically,
+    so the start/end indexes serve range queries directly.
+    """
+
+    def __init__(self, path=None):
+        ensure_storage()
+        self.path = path or DATABASE_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate_from_json()
+
+    def _migrate_from_json(self):
+        """Import the JSON data once, the first time the database is opened."""
+        with self._lock:
+            done = self._conn.execute(
+                "SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone()
+        if done:
+            return
+        activities = load_activities() if has_stored_data() else []
+        rules = load_recurrences()
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT_SQL, [_to_row(a) for a in activities])
+            self._conn.executemany("INSERT OR REPLACE INTO recurrences (id, data) VALUES (?, ?)",
+                                   [_rule_row(r) for r in rules])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (datetime.now().isoformat(),))
+
+    def load(self):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {COLUMNS} FROM activities ORDER BY rowid").fetchall()
+        return [_from_row(r) for r in rows]
+
+    def load_split(self, since):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {COLUMNS} FROM activities WHERE end_at >= ? ORDER BY rowid",
+                (since.isoformat(),)).fetchall()
+        return [_from_row(r) for r in rows], self._iter_ending_before(since)
+
+    def _iter_ending_before(self, since):
+        """Yield activities ending before ``since``; queried on first use."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {COLUMNS} FROM activities WHERE end_at < ? ORDER BY rowid",
+                (since.isoformat(),)).fetchall()
+        for row in rows:
+            yield _from_row(row)
+
+    def put(self, activity):
+        with self._lock, self._conn:
+            self._conn.execute(UPSERT_SQL, _to_row(activity))
+
+    def delete(self, activity_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM activities WHERE id = ?", (activity_id,))
+
+    def save_all(self, activities):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM activities")
+            self._conn.executemany(UPSERT_SQL, [_to_row(a) for a in activities])
+
+    def write_batch(self, puts, deletes):
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT_SQL, [_to_row(a) for a in puts])
+            self._conn.executemany("DELETE FROM activities WHERE id = ?",
+                                   [(i,) for i in deletes])
+
+    def load_rules(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT data FROM recurrences ORDER BY rowid").fetchall()
+        return [RecurrenceRule.from_dict(json.loads(data)) for (data,) in rows]
+
+    def save_rules(self, rules):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM recurrences")
+            self._conn.executemany("INSERT INTO recurrences (id, data) VALUES (?, ?)",
+                                   [_rule_row(r) for r in rules])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,11 +1,73 @@
-"""Storage functions for activities."""
+"""Storage functions for activities.
+
+Activities live in a line-delimited JSON snapshot (``activities.jsonl``, one
+activity per line) plus an append-only journal (``activities.journal``).
+Every mutation appends one small record to the journal instead of rewriting
+the snapshot. Loading streams the snapshot line by line and applies the
+journal on the fly, so only one activity dict is alive at a time. Once the
+journal grows past ``JOURNAL_COMPACT_BYTES`` it is folded back into a fresh
+snapshot on a background thread.
+
+Every snapshot write also produces a binary copy (``activities.bin``, see
+``utils.binary_snapshot``) that loads without JSON parsing; it is ignored
+whenever it does not match the JSON snapshot. A legacy ``activities.json``
+array is still read when no ``.jsonl`` snapshot exists yet; the next
+snapshot write replaces it.
+
+Recurrence rules (``utils.recurrence``) are few and small, so they are kept
+apart in ``recurrences.json`` and rewritten whole on every change.
+"""
 import json
+import os
+import threading
 from pathlib import Path
 from utils.models import Activity
+from utils.recurrence import RecurrenceRule
+from utils.binary_snapshot import BinarySnapshot, BinarySnapshotWriter, SnapshotFormatError
+from utils.instrumentation import timed
 
 
 STORAGE_DIR = Path.home() / ".cramit"
+SNAPSHOT_FILE = STORAGE_DIR / "activities.jsonl"
+# Memory-mapped binary copy of SNAPSHOT_FILE, used for fast loading when current
+BINARY_SNAPSHOT_FILE = STORAGE_DIR / "activities.bin"
+# Legacy single-array snapshot, read only when SNAPSHOT_FILE does not exist
 ACTIVITIES_FILE = STORAGE_DIR / "activities.json"
+JOURNAL_FILE = STORAGE_DIR / "activities.journal"
+# Journal being folded into the snapshot; new records go to a fresh journal meanwhile
+COMPACTING_FILE = STORAGE_DIR / "activities.journal.compacting"
+# Recurrence rules, one compact record each
+RECURRENCES_FILE = STORAGE_DIR / "recurrences.json"
+
+# Compact the journal into a fresh snapshot once it grows past this size
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+_journal_lock = threading.Lock()    # guards journal appends and rotation
+_snapshot_lock = threading.Lock()   # guards snapshot rewrites
+_compaction_thread = None
+_error_handler = None   # receives messages about failures handled in the background
+
+
+def set_error_handler(callback):
+    """Route storage errors that are handled here instead of raised to ``callback``.
+
+    Covers load failures, a rejected binary snapshot, background
+    compaction and snapshot writes.
+
+    Args:
+        callback: Callable receiving an error message string, or None to
+            print the messages instead
+    """
+    global _error_handler
+    _error_handler = callback
+
+
+def _report_error(message):
+    """Pass a message to the error handler, or print it if there is none."""
+    if _error_handler is not None:
+        _error_handler(message)
+    else:
+        print(message)
 
 
 def ensure_storage():
@@ -13,27 +75,513 @@ def ensure_storage():
     STORAGE_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def load_activities():
-    """Load activities from JSON file."""
+def has_stored_data():
+    """Return True if a snapshot (current or legacy) or journal exists."""
+    return any(path.exists() for path in
+               (SNAPSHOT_FILE, ACTIVITIES_FILE, JOURNAL_FILE, COMPACTING_FILE))
+
+
+def _open_snapshot():
+    """Open the snapshot for streaming.
+
+    Returns:
+        tuple: (file object or None, True if it is line-delimited)
+    """
+    if SNAPSHOT_FILE.exists():
+        return open(SNAPSHOT_FILE, 'r', encoding='utf-8'), True
+    if ACTIVITIES_FILE.exists():
+        return open(ACTIVITIES_FILE, 'r', encoding='utf-8'), False
+    return None, True
+
+
+def _iter_snapshot(f, line_delimited):
+    """Yield activity dicts from an open snapshot file, then close it."""
+    if f is None:
+        return
+    with f:
+        if not line_delimited:
+            # Legacy array snapshot: has to be parsed in one go
+            yield from json.load(f)
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _replay_journal(path, overrides):
+    """Collapse journal records from ``path`` into ``overrides`` in place.
+
+    ``overrides`` maps activity id -> latest activity dict, or None when the
+    activity was deleted. Records are idempotent (put/delete by id), so
+    replaying a journal that was already folded into the snapshot is
+    harmless. A torn last line from an interrupted write is skipped.
+    """
+    if not path.exists():
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("op") == "put":
+                item = entry["activity"]
+                overrides[item.get("id")] = item
+            elif entry.get("op") == "delete":
+                overrides[entry.get("id")] = None
+
+
+def _record_id(record):
+    return record.get("id")
+
+
+def _activity_id(activity):
+    return activity.id
+
+
+def _merge_journal(records, overrides, id_of=None):
+    """Yield snapshot records with journal overrides applied.
+
+    Updated activities keep their snapshot position; activities that only
+    exist in the journal follow at the end in journal order.
+
+    Args:
+        records: Snapshot records (dicts, or Activity objects with ``id_of``)
+        overrides: id -> replacement record, or None for a delete
+        id_of: Function returning a record's id; defaults to dict lookup
+    """
+    id_of = id_of or _record_id
+    pending = dict(overrides)
+    for record in records:
+        record_id = id_of(record)
+        if record_id in pending:
+            record = pending.pop(record_id)
+            if record is None:
+                continue
+        yield record
+    for record in pending.values():
+        if record is not None:
+            yield record
+
+
+def _open_binary_snapshot():
+    """Open the binary snapshot if it exists and mirrors the JSON snapshot.
+
+    Returns None (so the caller falls back to JSON) when it is missing,
+    stale or unreadable.
+    """
+    if not (BINARY_SNAPSHOT_FILE.exists() and SNAPSHOT_FILE.exists()):
+        return None
+    try:
+        return BinarySnapshot(BINARY_SNAPSHOT_FILE, SNAPSHOT_FILE.stat())
+    except (OSError, SnapshotFormatError) as e:
+        _report_error(f"Ignoring binary snapshot: {e}")
+        return None
+
+
+def _open_sources(use_binary=True):
+    """Read the journal and open the snapshot as one consistent view.
+
+    An open handle (or mapping) keeps reading the old file even if
+    compaction replaces the snapshot afterwards, and the journal has
+    been read already.
+
+    Returns:
+        tuple: (journal overrides, BinarySnapshot or None,
+                JSON snapshot file or None, True if it is line-delimited)
+    """
     ensure_storage()
-    if not ACTIVITIES_FILE.exists():
-        return []
+    overrides = {}
+    with _snapshot_lock:
+        _replay_journal(COMPACTING_FILE, overrides)
+        with _journal_lock:
+            _replay_journal(JOURNAL_FILE, overrides)
+        binary = _open_binary_snapshot() if use_binary else None
+        if binary is not None:
+            return overrides, binary, None, True
+        f, line_delimited = _open_snapshot()
+    return overrides, None, f, line_delimited
+
+
+def _activity_overrides(overrides):
+    """Turn journal overrides into Activity objects (None stays a delete)."""
+    return {activity_id: None if item is None else Activity.from_dict(item)
+            for activity_id, item in overrides.items()}
+
+
+def _iter_and_close(binary):
+    """Decode every record of a binary snapshot, then unmap it."""
+    try:
+        yield from binary
+    finally:
+        binary.close()
+
+
+def iter_activity_records():
+    """Stream the stored activity dicts (snapshot with the journal applied).
+
+    Only the journal is read up front; the snapshot is consumed lazily, so
+    memory stays bounded by the journal size rather than the history.
+    """
+    overrides, _, f, line_delimited = _open_sources(use_binary=False)
+    return _merge_journal(_iter_snapshot(f, line_delimited), overrides)
+
+
+def iter_activities():
+    """Stream the stored activities (snapshot with the journal applied).
+
+    Decodes the binary snapshot when it is current and falls back to
+    parsing the JSON snapshot otherwise.
+    """
+    overrides, binary, f, line_delimited = _open_sources()
+    if binary is None:
+        records = _merge_journal(_iter_snapshot(f, line_delimited), overrides)
+        return (Activity.from_dict(item) for item in records)
+    return _merge_journal(_iter_and_close(binary), _activity_overrides(overrides),
+                          _activity_id)
+
+
+def _write_snapshot(records):
+    """Write activity dicts to the snapshot file atomically, one per line.
     
+    The data goes to a temp file that is fsynced and then renamed over the
+    snapshot, so a crash mid-write never leaves a truncated file behind.
+    A binary copy is written alongside; if that fails, loading simply
+    falls back to the JSON snapshot.
+    """
+    binary = BinarySnapshotWriter()
+    tmp_path = SNAPSHOT_FILE.with_suffix(".jsonl.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            if binary is not None:
+                try:
+                    binary.add(record)
+                except Exception as e:
+                    _report_error(f"Skipping binary snapshot: {e}")
+                    binary = None
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, SNAPSHOT_FILE)
+    if binary is not None:
+        try:
+            binary.write(BINARY_SNAPSHOT_FILE, SNAPSHOT_FILE.stat())
+        except Exception as e:
+            _report_error(f"Error writing binary snapshot: {e}")
+
+
+@timed("storage.load_activities")
+def load_activities():
+    """Load activities from the snapshot and replay the journal."""
     try:
-        with open(ACTIVITIES_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return [Activity.from_dict(item) for item in data]
+        activities = list(iter_activities())
     except Exception as e:
-        print(f"Error loading activities: {e}")
+        _report_error(f"Error loading activities: {e}")
         return []
 
+    _maybe_compact()
+    return activities
+
+
+def _split_binary(binary, overrides, since):
+    """Split a binary snapshot by end time, decoding only the recent records.
+
+    Activities rewritten by the journal replace their snapshot records and
+    are split by the same ``end >= since`` rule as the others.
+    """
+    pending = _activity_overrides(overrides)
+    recent_rows, older_rows = binary.split_by_end(since)
+    journaled = [a for a in pending.values() if a is not None]
+
+    def decode(rows):
+        for i in rows:
+            activity = binary.activity(i)
+            if activity.id not in pending:
+                yield activity
+
+    def deferred():
+        try:
+            yield from (a for a in journaled if a.end < since)
+            yield from decode(older_rows)
+        finally:
+            binary.close()
+
+    recent = [a for a in journaled if a.end >= since]
+    recent.extend(decode(recent_rows))
+    return recent, deferred()
+
+
+@timed("storage.load_activities_split")
+def load_activities_split(since):
+    """Load activities ending at or after ``since``; defer the rest.
 
+    With a current binary snapshot the split reads only the fixed-width
+    start/end columns, and older records stay undecoded in the mapping.
+    Otherwise records are read in one streaming JSON pass, and only the
+    recent ones are turned into Activity objects; ISO timestamps sort
+    chronologically, so the split compares the raw strings.
+
+    Args:
+        since: datetime; activities ending before it are deferred
+
+    Returns:
+        tuple: (list of recent Activity objects,
+                iterator materializing the remaining activities on demand)
+    """
+    try:
+        overrides, binary, f, line_delimited = _open_sources()
+        if binary is not None:
+            recent, deferred = _split_binary(binary, overrides, since)
+        else:
+            since_text = since.isoformat()
+            recent = []
+            older = []
+            for item in _merge_journal(_iter_snapshot(f, line_delimited), overrides):
+                end = item.get("end")
+                if isinstance(end, str) and end < since_text:
+                    older.append(item)
+                else:
+                    recent.append(Activity.from_dict(item))
+            deferred = (Activity.from_dict(item) for item in older)
+    except Exception as e:
+        _report_error(f"Error loading activities: {e}")
+        return [], iter(())
+
+    _maybe_compact()
+    return recent, deferred
+
+
+def _save_snapshot(activities):
+    """Write a fresh snapshot and clear the journal; raises on failure."""
+    ensure_storage()
+    with _snapshot_lock:
+        _write_snapshot(act.to_dict() for act in activities)
+        with _journal_lock:
+            for path in (JOURNAL_FILE, COMPACTING_FILE):
+                if path.exists():
+                    path.unlink()
+
+
+@timed("storage.save_activities")
 def save_activities(activities):
-    """Save activities to JSON file."""
+    """Save all activities to a fresh JSON snapshot and clear the journal."""
+    try:
+        _save_snapshot(activities)
+    except Exception as e:
+        _report_error(f"Error saving activities: {e}")
+
+
+@timed("storage.write_journal")
+def _write_journal(entries):
+    """Append records to the journal in one write; raises on failure."""
     ensure_storage()
+    data = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+    with _journal_lock:
+        with open(JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write(data)
+    _maybe_compact()
+
+
+def _put_entry(activity):
+    return {"op": "put", "activity": activity.to_dict()}
+
+
+def _delete_entry(activity_id):
+    return {"op": "delete", "id": activity_id}
+
+
+@timed("storage.compact_journal")
+def compact_journal():
+    """Fold the journal into a fresh snapshot.
+
+    The live journal is first renamed aside so that appends can continue
+    into a new file while the snapshot is rewritten.
+    """
     try:
-        data = [act.to_dict() for act in activities]
-        with open(ACTIVITIES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with _snapshot_lock:
+            with _journal_lock:
+                if not COMPACTING_FILE.exists():
+                    if not JOURNAL_FILE.exists():
+                        return
+                    os.replace(JOURNAL_FILE, COMPACTING_FILE)
+            overrides = {}
+            _replay_journal(COMPACTING_FILE, overrides)
+            f, line_delimited = _open_snapshot()
+            _write_snapshot(_merge_journal(_iter_snapshot(f, line_delimited), overrides))
+            COMPACTING_FILE.unlink()
     except Exception as e:
-        print(f"Error saving activities: {e}")
+        _report_error(f"Error compacting journal: {e}")
+
+
+def _maybe_compact():
+    """Start background compaction once the journal passes the size threshold."""
+    global _compaction_thread
+    try:
+        size = JOURNAL_FILE.stat().st_size
+    except OSError:
+        return
+    if size < JOURNAL_COMPACT_BYTES:
+        return
+    if _compaction_thread is not None and _compaction_thread.is_alive():
+        return
+    _compaction_thread = threading.Thread(target=compact_journal, daemon=True)
+    _compaction_thread.start()
+
+
+def load_recurrences():
+    """Load the stored recurrence rules; returns [] if there are none."""
+    if not RECURRENCES_FILE.exists():
+        return []
+    try:
+        with open(RECURRENCES_FILE, 'r', encoding='utf-8') as f:
+            return [RecurrenceRule.from_dict(record) for record in json.load(f)]
+    except Exception as e:
+        _report_error(f"Error loading recurrences: {e}")
+        return []
+
+
+def _save_recurrences(rules):
+    """Rewrite the recurrence file atomically; raises on failure."""
+    ensure_storage()
+    tmp_path = RECURRENCES_FILE.with_suffix(".json.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump([rule.to_dict() for rule in rules], f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, RECURRENCES_FILE)
+
+
+class StorageBackend:
+    """Interface for activity persistence backends.
+    
+    The controller talks to storage only through these methods, so the
+    on-disk format can be switched with the ``backend`` config setting.
+    """
+    
+    def load(self):
+        """Return all stored activities in insertion order."""
+        raise NotImplementedError
+    
+    def load_split(self, since):
+        """Load recent activities now and defer the older ones.
+        
+        Args:
+            since: datetime; activities ending before it are deferred
+            
+        Returns:
+            tuple: (list of activities ending at or after ``since``,
+                    iterator yielding the remaining activities)
+        """
+        recent = []
+        older = []
+        for activity in self.load():
+            (recent if activity.end >= since else older).append(activity)
+        return recent, iter(older)
+    
+    def put(self, activity):
+        """Insert or update a single activity."""
+        raise NotImplementedError
+    
+    def delete(self, activity_id):
+        """Remove a single activity by ID."""
+        raise NotImplementedError
+    
+    def save_all(self, activities):
+        """Replace the stored data with ``activities``."""
+        raise NotImplementedError
+    
+    def write_batch(self, puts, deletes):
+        """Apply several puts and deletes as one write.
+        
+        Args:
+            puts: Activities to insert or update
+            deletes: IDs of activities to remove
+        """
+        for activity in puts:
+            self.put(activity)
+        for activity_id in deletes:
+            self.delete(activity_id)
+    
+    def load_rules(self):
+        """Return all stored RecurrenceRule objects."""
+        raise NotImplementedError
+    
+    def save_rules(self, rules):
+        """Replace the stored recurrence rules with ``rules``."""
+        raise NotImplementedError
+    
+    def set_error_handler(self, callback):
+        """Register a callback for errors the backend handles on its own.
+        
+        Failures of explicit calls are raised; this covers work such as
+        background maintenance, which has no caller to raise to.
+        
+        Args:
+            callback: Callable receiving an error message string
+        """
+    
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class JsonStorage(StorageBackend):
+    """Journaled JSON snapshot backend (the default).
+    
+    Unlike the module-level helpers, write methods raise on failure so the
+    caller can report the error.
+    """
+    
+    def load(self):
+        return load_activities()
+    
+    def load_split(self, since):
+        return load_activities_split(since)
+    
+    def put(self, activity):
+        _write_journal([_put_entry(activity)])
+    
+    def delete(self, activity_id):
+        _write_journal([_delete_entry(activity_id)])
+    
+    def save_all(self, activities):
+        _save_snapshot(activities)
+    
+    def write_batch(self, puts, deletes):
+        entries = [_put_entry(a) for a in puts]
+        entries.extend(_delete_entry(i) for i in deletes)
+        if entries:
+            _write_journal(entries)
+    
+    def load_rules(self):
+        return load_recurrences()
+    
+    def save_rules(self, rules):
+        _save_recurrences(rules)
+    
+    def set_error_handler(self, callback):
+        set_error_handler(callback)
+
+
+def get_backend(name=None):
+    """Create the storage backend selected by ``name`` or the app config.
+    
+    Args:
+        name: Backend name ('json' or 'sqlite'); defaults to the configured one
+        
+    Returns:
+        StorageBackend instance
+    """
+    if name is None:
+        from utils.config import load_config
+        name = load_config()["backend"]
+    if name == "sqlite":
+        from utils.sqlite_storage import SqliteStorage
+        return SqliteStorage()
+    if name != "json":
+        print(f"Unknown storage backend '{name}', using json")
+    return JsonStorage()
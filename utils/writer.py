@@ -0,0 +1,140 @@
+"""Background writer that moves storage writes off the GUI thread."""
+import threading
+
+
+class BackgroundWriter:
+    """Persists activity changes on a dedicated thread.
+
+    Mutations are queued per activity ID, so a burst of edits to the same
+    activity collapses into a single record, and everything queued during
+    ``coalesce_delay`` is handed to the backend as one batch. Write errors
+    are passed to ``on_error`` (called from the writer thread).
+    """
+
+    def __init__(self, storage, on_error=None, coalesce_delay=0.05):
+        """Start the writer thread.
+
+        Args:
+            storage: StorageBackend that performs the actual writes
+            on_error: Callback receiving an error message string
+            coalesce_delay: Seconds to wait for more changes before writing
+        """
+        self.storage = storage
+        self.on_error = on_error
+        self.coalesce_delay = coalesce_delay
+        self._cond = threading.Condition()
+        self._pending = {}        # activity id -> Activity copy, or None for delete
+        self._rules = None        # list of recurrence rules to save
+        self._busy = False
+        self._flushing = 0
+        self._held = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="cramit-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, activity):
+        """Queue an added or updated activity."""
+        self._enqueue(activity.id, activity.copy())
+
+    def delete(self, activity_id):
+        """Queue a deleted activity."""
+        self._enqueue(activity_id, None)
+
+    def write_many(self, puts, deletes):
+        """Queue several changes at once so they are written as one batch.
+
+        Args:
+            puts: Added or updated activities
+            deletes: IDs of deleted activities
+        """
+        changes = [(a.id, a.copy()) for a in puts]
+        changes.extend((activity_id, None) for activity_id in deletes)
+        if not changes:
+            return
+        with self._cond:
+            was_idle = not self._has_work()
+            self._pending.update(changes)
+            if was_idle:
+                self._cond.notify_all()
+
+    def save_rules(self, rules):
+        """Queue a rewrite of the recurrence rules (always all of them)."""
+        snapshot = [rule.copy() for rule in rules]
+        with self._cond:
+            was_idle = not self._has_work()
+            self._rules = snapshot
+            if was_idle:
+                self._cond.notify_all()
+
+    def hold(self):
+        """Keep queued changes in memory until ``resume`` is called.
+
+        Used while storage is still being read; ``flush`` and ``close``
+        write held changes regardless.
+        """
+        with self._cond:
+            self._held = True
+
+    def resume(self):
+        """Start writing queued changes again after ``hold``."""
+        with self._cond:
+            self._held = False
+            self._cond.notify_all()
+
+    def _enqueue(self, activity_id, value):
+        with self._cond:
+            was_idle = not self._has_work()
+            self._pending[activity_id] = value
+            if was_idle:
+                self._cond.notify_all()
+
+    def _has_work(self):
+        return bool(self._pending) or self._rules is not None
+
+    def flush(self):
+        """Block until every queued change has been written."""
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            while self._has_work() or self._busy:
+                self._cond.wait()
+            self._flushing -= 1
+
+    def close(self):
+        """Flush pending changes and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (not self._has_work()
+                                            or self._held and not self._flushing):
+                    self._cond.wait()
+                if not self._has_work():
+                    return
+                if not self._closed and not self._flushing:
+                    # Let the rest of a burst arrive before writing
+                    self._cond.wait(self.coalesce_delay)
+                pending, rules = self._pending, self._rules
+                self._pending, self._rules = {}, None
+                self._busy = True
+
+            try:
+                puts = [a for a in pending.values() if a is not None]
+                deletes = [i for i, a in pending.items() if a is None]
+                if puts or deletes:
+                    self.storage.write_batch(puts, deletes)
+                if rules is not None:
+                    self.storage.save_rules(rules)
+            except Exception as e:
+                if self.on_error:
+                    self.on_error(f"Error saving activities: {e}")
+                else:
+                    print(f"Error saving activities: {e}")
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
@@ -0,0 +1,126 @@
+"""Calendar widget with each date cell tinted by planned vs executed hours."""
+from datetime import date, datetime, timedelta
+from PyQt6.QtWidgets import QCalendarWidget
+from PyQt6.QtCore import Qt, QRectF, QDate
+from PyQt6.QtGui import QColor
+from utils.date_helpers import sum_day_slices
+from controllers.events import ActivitiesReset
+from utils.colors import HEATMAP_COLOR, COMPLETED_COLOR
+from utils.instrumentation import timed
+
+
+class ActivityCalendarWidget(QCalendarWidget):
+    """QCalendarWidget painting a per-day load heatmap.
+    
+    Hours for the 6x7 grid of the visible month are summed once per page
+    change (or data change) from a single range query over the grid, with
+    multi-day activities split across the days they cover.
+    Data changes while the calendar is hidden are applied when it is shown.
+    """
+    
+    FULL_DAY_HOURS = 8.0  # Load at which a cell reaches full tint
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source = []
+        self._day_hours = {}  # date -> (completed, total) for the visible grid
+        self._dirty = True
+        self.currentPageChanged.connect(self._on_page_changed)
+    
+    def set_source(self, source):
+        """Set the activity source (e.g. ActivityController) and refresh."""
+        self._source = source
+        self.invalidate()
+    
+    def invalidate(self):
+        """Mark the cached hours stale; reload now if the calendar is visible."""
+        self._dirty = True
+        if self.isVisible():
+            self._reload_visible_grid()
+    
+    @timed("calendar.apply_change")
+    def apply_change(self, event):
+        """Re-read and repaint only the visible cells touched by a single-activity change.
+        
+        Batches and recurrence changes can touch any day, so they reload
+        the whole grid like ``invalidate``.
+        
+        Args:
+            event: ChangeEvent; ``activity`` and, for updates, ``old`` give the spans
+        """
+        if isinstance(event, ActivitiesReset):
+            self.set_source(event.source)
+            return
+        activity = getattr(event, "activity", None)
+        if activity is None or self._dirty or not self.isVisible():
+            self.invalidate()
+            return
+        spans = [activity]
+        old = getattr(event, "old", None)
+        if old is not None:
+            spans.append(old)
+        grid_start = self._visible_grid_start()
+        grid_end = grid_start + timedelta(days=42)
+        days = set()
+        for span in spans:
+            day = max(span.start.date(), grid_start)
+            last = min(max(span.end, span.start).date(), grid_end - timedelta(days=1))
+            while day <= last:
+                days.add(day)
+                day += timedelta(days=1)
+        for day in days:
+            self._read_day(day)
+            self.updateCell(QDate(day.year, day.month, day.day))
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._dirty:
+            self._reload_visible_grid()
+    
+    def _on_page_changed(self, year, month):
+        self._reload_visible_grid()
+    
+    def _visible_grid_start(self):
+        """First date shown in the 6x7 grid of the current page."""
+        first = date(self.yearShown(), self.monthShown(), 1)
+        offset = (first.isoweekday() - self.firstDayOfWeek().value) % 7
+        # Qt shows a full leading week when the month starts on the first column
+        return first - timedelta(days=offset or 7)
+    
+    @timed("calendar.reload_visible_grid")
+    def _reload_visible_grid(self):
+        """Read per-day hours for the 42 visible dates."""
+        self._dirty = False
+        grid_start = datetime.combine(self._visible_grid_start(), datetime.min.time())
+        self._day_hours = sum_day_slices(self._source, grid_start, grid_start + timedelta(days=42))
+        self.updateCells()
+    
+    def _read_day(self, day):
+        """Refresh the cached (completed, total) hours of one date."""
+        day_start = datetime.combine(day, datetime.min.time())
+        hours = sum_day_slices(self._source, day_start, day_start + timedelta(days=1)).get(day)
+        if hours:
+            self._day_hours[day] = hours
+        else:
+            self._day_hours.pop(day, None)
+    
+    def paintCell(self, painter, rect, qdate):
+        """Paint the default cell, then overlay the day's load."""
+        super().paintCell(painter, rect, qdate)
+        hours = self._day_hours.get(qdate.toPyDate())
+        if not hours:
+            return
+        completed, total = hours
+        painter.save()
+        tint = QColor(HEATMAP_COLOR)
+        tint.setAlphaF(0.15 + 0.45 * min(total / self.FULL_DAY_HOURS, 1.0))
+        painter.fillRect(rect, tint)
+        strip = QRectF(rect.left(), rect.bottom() - 3, rect.width() * min(completed / total, 1.0), 3)
+        painter.fillRect(strip, COMPLETED_COLOR)
+        font = painter.font()
+        font.setPointSizeF(max(font.pointSizeF() * 0.7, 6))
+        painter.setFont(font)
+        painter.drawText(QRectF(rect).adjusted(2, 1, -2, -3),
+                         Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignBottom,
+                         f"{total:.1f}h")
+        painter.restore()
@@ -0,0 +1,158 @@
+"""List model exposing the controller's activities to a QListView."""
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+from controllers.events import (ActivityAdded, ActivitiesAdded, ActivityUpdated,
+                                ActivityRemoved, ActivitiesChanged, RecurrenceChanged,
+                                RecurrencesRemoved, ActivitiesReset)
+
+
+# Role returning the activity ID of a row
+ID_ROLE = Qt.ItemDataRole.UserRole
+
+
+def format_activity(activity):
+    """Format an activity as a list label with status, hours and type."""
+    status = "✓" if activity.executed else "○"
+    return f"{status} {activity.name} ({activity.planned_hours:.1f}h, {activity.type})"
+
+
+def format_recurrence(rule):
+    """Format a recurrence rule as a list label with hours, type and schedule."""
+    return f"↻ {rule.name} ({rule.planned_hours:.1f}h, {rule.type}, {rule.describe()})"
+
+
+class ActivityListModel(QAbstractListModel):
+    """Rows of activity IDs backed by a source such as ActivityController.
+
+    Only IDs are stored per row; labels are formatted lazily in ``data()``
+    for the rows the view actually paints. Change events are turned into
+    ``rowsInserted``/``dataChanged``/``rowsRemoved`` for a single row.
+    Recurrence rules of the source, if any, come first, one row per series.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source = None
+        self._ids = []
+        self._rows = {}
+        self._stale_from = None  # rows from here on have outdated entries in _rows
+
+    def set_source(self, source):
+        """Reset the model to all activities of ``source``.
+
+        Args:
+            source: Object exposing get_activities() and get_activity(id),
+                and optionally get_recurrences() and get_recurrence(id)
+        """
+        self.beginResetModel()
+        self._source = source
+        self._ids = [r.id for r in getattr(source, "get_recurrences", list)()]
+        self._ids.extend(a.id for a in source.get_activities())
+        self._rows = {activity_id: row for row, activity_id in enumerate(self._ids)}
+        self._stale_from = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._ids)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._ids):
+            return None
+        activity_id = self._ids[index.row()]
+        if role == ID_ROLE:
+            return activity_id
+        if role == Qt.ItemDataRole.DisplayRole:
+            activity = self._source.get_activity(activity_id)
+            if activity:
+                return format_activity(activity)
+            rule = self._get_recurrence(activity_id)
+            return format_recurrence(rule) if rule else None
+        return None
+
+    def _get_recurrence(self, rule_id):
+        get_recurrence = getattr(self._source, "get_recurrence", None)
+        return get_recurrence(rule_id) if get_recurrence else None
+
+    def row_of(self, activity_id):
+        """Return the row of an activity ID, or None."""
+        if self._stale_from is not None:
+            # Rows shifted by an earlier removal; reindex the tail once
+            for row in range(self._stale_from, len(self._ids)):
+                self._rows[self._ids[row]] = row
+            self._stale_from = None
+        return self._rows.get(activity_id)
+
+    def apply_change(self, event):
+        """Apply a change event as a one-row (or one-range) model update."""
+        if isinstance(event, ActivitiesReset):
+            self.set_source(event.source)
+            return
+        if isinstance(event, ActivitiesAdded):
+            self._append_rows(event.activities)
+            return
+        if isinstance(event, ActivitiesChanged):
+            self._apply_batch(event)
+            return
+        if isinstance(event, (RecurrenceChanged, RecurrencesRemoved)):
+            self._apply_recurrence(event)
+            return
+        activity_id = event.activity.id
+        if isinstance(event, ActivityAdded):
+            row = len(self._ids)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._ids.append(activity_id)
+            self._rows[activity_id] = row
+            self.endInsertRows()
+        elif isinstance(event, ActivityUpdated):
+            row = self.row_of(activity_id)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+        elif isinstance(event, ActivityRemoved):
+            row = self.row_of(activity_id)
+            if row is None:
+                return
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._ids[row]
+            del self._rows[activity_id]
+            if row < len(self._ids):
+                self._stale_from = row
+            self.endRemoveRows()
+
+    def _apply_recurrence(self, event):
+        """Repaint the row of an edited rule; added or removed rules reset the model."""
+        row = self.row_of(event.rule.id) if isinstance(event, RecurrenceChanged) else None
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+        else:
+            self.set_source(self._source)
+
+    def _append_rows(self, activities):
+        """Append rows for ``activities`` as one insertion."""
+        if not activities:
+            return
+        first = len(self._ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(activities) - 1)
+        for row, activity in enumerate(activities, first):
+            self._ids.append(activity.id)
+            self._rows[activity.id] = row
+        self.endInsertRows()
+
+    def _apply_batch(self, event):
+        """Apply an ActivitiesChanged batch with at most one signal per kind.
+
+        Removals shift many rows, so they reset the model; updates become a
+        single dataChanged over the span of affected rows, which keeps the
+        selection intact.
+        """
+        if event.removed:
+            self.set_source(self._source)
+            return
+        rows = [self.row_of(a.id) for a in event.updated]
+        rows = [row for row in rows if row is not None]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)),
+                                  [Qt.ItemDataRole.DisplayRole])
+        self._append_rows(event.added)
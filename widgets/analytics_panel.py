@@ -1,4 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from controllers.events import (ActivityAdded, ActivitiesAdded, ActivityRemoved, ActivitiesChanged,
+                                ActivitiesReset)
+from utils.instrumentation import timed
 
 
 class AnalyticsPanel(QWidget):
@@ -13,10 +16,34 @@ class AnalyticsPanel(QWidget):
         self.title = QLabel("Analytics")
         self.title.setStyleSheet("font-weight: bold; font-size: 14px;")
         self.summary = QLabel("No data")
+        self._count = 0
         
         layout.addWidget(self.title)
         layout.addWidget(self.summary)
         layout.addStretch()
 
+    @timed("analytics_panel.update_from")
     def update_from(self, activities):
-        self.summary.setText(f"Total activities: {len(activities)}")
+        self._count = len(activities)
+        self._show_summary()
+
+    @timed("analytics_panel.apply_change")
+    def apply_change(self, event):
+        """Adjust the summary for an add or remove event, or recount on a reset."""
+        if isinstance(event, ActivitiesReset):
+            self.update_from(event.source)
+            return
+        if isinstance(event, ActivityAdded):
+            self._count += 1
+        elif isinstance(event, ActivitiesAdded):
+            self._count += len(event.activities)
+        elif isinstance(event, ActivitiesChanged):
+            self._count += len(event.added) - len(event.removed)
+        elif isinstance(event, ActivityRemoved):
+            self._count -= 1
+        else:
+            return
+        self._show_summary()
+
+    def _show_summary(self):
+        self.summary.setText(f"Total activities: {self._count}")
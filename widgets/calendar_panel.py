@@ -1,6 +1,8 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QCalendarWidget, QTabWidget
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QTabWidget
 from PyQt6.QtCore import Qt
 from widgets.hub_view import HubWidget
+from widgets.activity_calendar import ActivityCalendarWidget
+from utils.instrumentation import timed
 
 
 class CalendarPanel(QWidget):
@@ -20,8 +22,8 @@ class CalendarPanel(QWidget):
         self.tabs = QTabWidget()
         self.tabs.setTabPosition(QTabWidget.TabPosition.North)
         
-        # Calendar tab (traditional calendar)
-        self.calendar_widget = QCalendarWidget()
+        # Calendar tab (traditional calendar with a per-day load heatmap)
+        self.calendar_widget = ActivityCalendarWidget()
         self.tabs.addTab(self.calendar_widget, "Calendar")
         
         # Hub tab (week/month/year with graphs)
@@ -30,6 +32,19 @@ class CalendarPanel(QWidget):
         
         layout.addWidget(self.tabs)
     
+    @timed("calendar_panel.update_activities")
     def update_activities(self, activities):
-        """Update the hub views with activity data."""
+        """Update the calendar and hub views with activity data.
+        
+        Args:
+            activities: List of Activity objects, or an indexed source such as
+                ActivityController for range queries
+        """
+        self.calendar_widget.set_source(activities)
         self.hub_widget.update_activities(activities)
+    
+    @timed("calendar_panel.apply_change")
+    def apply_change(self, event):
+        """Forward a change event to the calendar and hub."""
+        self.calendar_widget.apply_change(event)
+        self.hub_widget.apply_change(event)
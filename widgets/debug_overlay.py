@@ -0,0 +1,53 @@
+"""Debug overlay listing instrumentation timings."""
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import Qt, QTimer
+from utils import instrumentation
+
+
+class DebugOverlay(QLabel):
+    """Semi-transparent table of p50/p95/max per instrumented operation.
+
+    Floats over the top-right corner of its parent and refreshes once a
+    second while visible. Mouse events pass through to the widgets below.
+    """
+
+    REFRESH_MS = 1000
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        self.setStyleSheet(
+            "background-color: rgba(20, 20, 20, 200); color: #e0e0e0;"
+            "font-family: monospace; font-size: 11px; padding: 6px; border-radius: 4px;"
+        )
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start()
+        self.refresh()
+
+    def toggle(self):
+        """Show or hide the overlay."""
+        self.setVisible(not self.isVisible())
+        if self.isVisible():
+            self.refresh()
+
+    def refresh(self):
+        """Re-read the histograms and reposition in the parent's corner."""
+        if not self.isVisible():
+            return
+        stats = instrumentation.snapshot()
+        width = max((len(name) for name in stats), default=10)
+        lines = [f"{'operation':<{width}}  {'n':>6} {'p50':>8} {'p95':>8} {'max':>8}"]
+        for name, s in stats.items():
+            lines.append(f"{name:<{width}}  {s['count']:>6} {s['p50_ms']:>8.2f} "
+                         f"{s['p95_ms']:>8.2f} {s['max_ms']:>8.2f}")
+        if not stats:
+            lines.append("(no samples yet)")
+        lines.append("ms; F12 hides, Ctrl+Shift+J writes JSON")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - 12, 40)
+        self.raise_()
@@ -2,6 +2,7 @@
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPainter, QColor, QPen, QBrush
+from utils.instrumentation import timed
 
 
 class DonutWidget(QWidget):
@@ -22,6 +23,7 @@ class DonutWidget(QWidget):
         self.total = total
         self.update()
     
+    @timed("donut.paintEvent")
     def paintEvent(self, event):
         """Paint the donut graph."""
         painter = QPainter(self)
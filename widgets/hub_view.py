@@ -1,18 +1,27 @@
 """Hub view for displaying week/month/year activity timelines and statistics."""
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QStackedWidget, QLabel, QPushButton, QHBoxLayout, QFrame, QGridLayout
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from widgets.donut_widget import DonutWidget
 from widgets.timeline_widget import WeekTimelineWidget
+from widgets.month_view import MonthHubView
+from widgets.year_view import YearHubView
 from utils.date_helpers import (
-    filter_activities_by_week,
-    calculate_activity_stats,
-    calculate_stats_by_type
+    calculate_period_stats,
+    calculate_period_stats_by_type
 )
 from utils.colors import ACTIVITY_COLORS
+from controllers.events import (ActivitiesAdded, ActivitiesChanged, RecurrenceChanged,
+                                RecurrencesRemoved, ActivitiesReset)
+from utils.instrumentation import timed
 
 
 class HubWidget(QWidget):
-    """Hub widget with week/month/year views and timeline visualization."""
+    """Hub widget with week/month/year views and timeline visualization.
+    
+    Pages are recomputed lazily: updates only mark pages dirty, and a page
+    is recomputed when it is (or becomes) visible. Updates arriving in a
+    burst collapse into one recompute on the next event-loop turn.
+    """
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -34,15 +43,24 @@ class HubWidget(QWidget):
         
         layout.addLayout(btn_layout)
         
+        self._source = []
+        self._dirty = {"week": True, "month": True, "year": True}
+        self._week_numbers_dirty = False  # dashboard/donuts only; timeline is up to date
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._refresh_visible)
+        
         # Stacked widget for different time period views
         self.hub_stack = QStackedWidget()
         self.week_view = self._create_week_view()
-        self.month_view = QLabel("Month Hub:\nMonthly circular graph\n(planned vs executed for the month)")
-        self.year_view = QLabel("Year Hub:\n12 circular graphs (one per month)\n+ yearly total")
+        self.month_view = MonthHubView()
+        self.year_view = YearHubView()
         
         self.hub_stack.addWidget(self.week_view)
         self.hub_stack.addWidget(self.month_view)
         self.hub_stack.addWidget(self.year_view)
+        self._pages = {"week": self.week_view, "month": self.month_view, "year": self.year_view}
         
         layout.addWidget(self.hub_stack)
         
@@ -139,29 +157,96 @@ class HubWidget(QWidget):
     def show_week(self):
         """Switch to week view."""
         self.hub_stack.setCurrentWidget(self.week_view)
+        self._refresh_visible()
     
     def show_month(self):
         """Switch to month view."""
         self.hub_stack.setCurrentWidget(self.month_view)
+        self._refresh_visible()
     
     def show_year(self):
         """Switch to year view."""
         self.hub_stack.setCurrentWidget(self.year_view)
+        self._refresh_visible()
+    
+    def showEvent(self, event):
+        """Catch up on updates that arrived while the hub was hidden."""
+        super().showEvent(event)
+        self._refresh_visible()
+    
+    def _current_page(self):
+        current = self.hub_stack.currentWidget()
+        return next(name for name, page in self._pages.items() if page is current)
+    
+    def _schedule_refresh(self):
+        """Coalesce pending updates into one recompute on the next loop turn."""
+        if self.isVisible() and not self._refresh_timer.isActive():
+            self._refresh_timer.start()
     
+    @timed("hub.refresh_visible")
+    def _refresh_visible(self):
+        """Recompute the current page if it is visible and out of date."""
+        if not self.isVisible():
+            return
+        page = self._current_page()
+        if self._dirty[page]:
+            self._dirty[page] = False
+            if page == "week":
+                self._week_numbers_dirty = False
+                self.timeline_widget.set_activities(self._source)
+                self._update_dashboard(self._source)
+                self._update_donuts(self._source)
+            else:
+                self._pages[page].update_activities(self._source)
+        elif page == "week" and self._week_numbers_dirty:
+            self._week_numbers_dirty = False
+            self._update_dashboard(self._source)
+            self._update_donuts(self._source)
+    
+    @timed("hub.update_activities")
     def update_activities(self, activities):
-        """Update the hub views with activity data."""
-        self.timeline_widget.set_activities(activities)
-        self._update_dashboard(activities)
-        self._update_donuts(activities)
+        """Update the hub views with activity data.
+        
+        Args:
+            activities: List of Activity objects, or an indexed source such as
+                ActivityController for range queries
+        """
+        self._source = activities
+        for page in self._dirty:
+            self._dirty[page] = True
+        self._schedule_refresh()
+    
+    @timed("hub.apply_change")
+    def apply_change(self, event):
+        """Apply a change event.
+        
+        If the week page is up to date and visible, the timeline repaints
+        only the affected days and the dashboard numbers are re-read on the
+        next refresh; everything else is just marked dirty. A reset
+        switches every page to the event's source.
+        """
+        if isinstance(event, ActivitiesReset):
+            self.update_activities(event.source)
+            return
+        self._dirty["month"] = self._dirty["year"] = True
+        if isinstance(event, (ActivitiesAdded, ActivitiesChanged,
+                              RecurrenceChanged, RecurrencesRemoved)):
+            self._dirty["week"] = True  # batches and series are rare; relayout the whole week
+        elif self._dirty["week"]:
+            pass  # a full recompute is already pending
+        elif self.isVisible() and self._current_page() == "week":
+            self.timeline_widget.apply_change(event)
+            self._week_numbers_dirty = True
+        else:
+            self._dirty["week"] = True
+        self._schedule_refresh()
     
     def _update_donuts(self, activities):
         """Update donut graphs with activity data."""
-        week_activities = filter_activities_by_week(activities)
-        
-        # Calculate totals by type using helper function
-        work_completed, work_total = calculate_stats_by_type(week_activities, "work")
-        school_completed, school_total = calculate_stats_by_type(week_activities, "school")
-        hobbies_completed, hobbies_total = calculate_stats_by_type(week_activities, "hobbies")
+        # Current-week totals by type (constant-time reads from the controller's aggregates)
+        work_completed, work_total = calculate_period_stats_by_type(activities, "week", "work")
+        school_completed, school_total = calculate_period_stats_by_type(activities, "week", "school")
+        hobbies_completed, hobbies_total = calculate_period_stats_by_type(activities, "week", "hobbies")
         
         # Update donut colors based on completion
         from utils.colors import EXECUTED_COLORS
@@ -175,10 +260,9 @@ class HubWidget(QWidget):
     
     def _update_dashboard(self, activities):
         """Update dashboard statistics for current week."""
-        week_activities = filter_activities_by_week(activities)
-        total_hours, completed_hours, pending_hours = calculate_activity_stats(week_activities)
+        total_hours, completed_hours, pending_hours, count = calculate_period_stats(activities, "week")
         
         self.week_total_label.setText(f"Total: {total_hours:.1f}h")
         self.week_completed_label.setText(f"Completed: {completed_hours:.1f}h")
         self.week_pending_label.setText(f"Pending: {pending_hours:.1f}h")
-        self.week_activities_label.setText(f"Activities: {len(week_activities)}")
+        self.week_activities_label.setText(f"Activities: {count}")
@@ -1,12 +1,23 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QListWidget, QHBoxLayout, QPushButton
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QListView, QHBoxLayout, QPushButton,
+                             QAbstractItemView)
+from widgets.activity_list_model import ActivityListModel, ID_ROLE
+from utils.instrumentation import timed
 
 
 class ListPanel(QWidget):
-    """Left-side panel: shows a list and Add/Edit/Delete buttons.
+    """Left-side panel: shows a list and Add/Edit/Delete/Done buttons.
+
+    The list is a QListView over an ActivityListModel, so only visible
+    rows are formatted and edits touch a single row. Several rows can be
+    selected (Shift/Ctrl-click) for bulk delete and done toggling; Edit
+    needs exactly one.
 
     Methods:
-    - set_items(list_of_strings)
+    - set_source(controller)
+    - apply_change(event)
     - get_selected_text()
+    - get_selected_id()
+    - get_selected_ids()
     """
 
     def __init__(self, parent=None):
@@ -15,7 +26,11 @@ class ListPanel(QWidget):
         layout.setContentsMargins(10, 10, 10, 10)
         layout.setSpacing(8)
 
-        self.list = QListWidget()
+        self.model = ActivityListModel(self)
+        self.list = QListView()
+        self.list.setModel(self.model)
+        self.list.setUniformItemSizes(True)
+        self.list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         layout.addWidget(self.list)
 
         btn_row = QHBoxLayout()
@@ -23,41 +38,58 @@ class ListPanel(QWidget):
         self.btn_add = QPushButton("Add")
         self.btn_edit = QPushButton("Edit")
         self.btn_delete = QPushButton("Delete")
+        self.btn_toggle = QPushButton("Done")
+        self.btn_toggle.setToolTip("Mark the selected activities as done (or not done)")
         btn_row.addWidget(self.btn_add)
         btn_row.addWidget(self.btn_edit)
         btn_row.addWidget(self.btn_delete)
+        btn_row.addWidget(self.btn_toggle)
 
         layout.addLayout(btn_row)
 
         self.btn_edit.setEnabled(False)
         self.btn_delete.setEnabled(False)
+        self.btn_toggle.setEnabled(False)
+
+        self.list.selectionModel().selectionChanged.connect(self._on_selection_changed)
+        # Removing the selected row clears the selection without selectionChanged
+        self.model.rowsRemoved.connect(self._on_selection_changed)
+        self.model.modelReset.connect(self._on_selection_changed)
 
-        self.list.itemSelectionChanged.connect(self._on_selection_changed)
+    def _on_selection_changed(self, *args):
+        count = len(self.list.selectionModel().selectedIndexes())
+        self.btn_edit.setEnabled(count == 1)
+        self.btn_delete.setEnabled(count > 0)
+        self.btn_toggle.setEnabled(count > 0)
 
-    def _on_selection_changed(self):
-        has = bool(self.list.selectedItems())
-        self.btn_edit.setEnabled(has)
-        self.btn_delete.setEnabled(has)
+    @timed("list_panel.set_source")
+    def set_source(self, source):
+        """Show all activities of ``source`` (e.g. ActivityController)."""
+        self.model.set_source(source)
 
-    def set_items(self, items, ids=None):
-        """Set list items and attach activity IDs as user data."""
-        self.list.clear()
-        for i, it in enumerate(items):
-            from PyQt6.QtWidgets import QListWidgetItem
-            item = QListWidgetItem(it)
-            if ids and i < len(ids):
-                item.setData(1, ids[i])  # Store activity ID
-            self.list.addItem(item)
+    @timed("list_panel.apply_change")
+    def apply_change(self, event):
+        """Apply a change event to the affected rows only."""
+        self.model.apply_change(event)
+
+    def _selected_index(self):
+        indexes = self.list.selectionModel().selectedIndexes()
+        return indexes[0] if indexes else None
 
     def get_selected_text(self):
-        items = self.list.selectedItems()
-        if not items:
+        index = self._selected_index()
+        if index is None:
             return None
-        return items[0].text()
+        return index.data()
     
     def get_selected_id(self):
         """Get the activity ID of the selected item."""
-        items = self.list.selectedItems()
-        if not items:
+        index = self._selected_index()
+        if index is None:
             return None
-        return items[0].data(1)
+        return index.data(ID_ROLE)
+
+    def get_selected_ids(self):
+        """Get the activity IDs of all selected items, in row order."""
+        indexes = sorted(self.list.selectionModel().selectedIndexes(), key=lambda i: i.row())
+        return [index.data(ID_ROLE) for index in indexes]
@@ -0,0 +1,147 @@
+"""Month hub view: per-day load heatmap plus type donuts."""
+import calendar
+from datetime import date, datetime, timedelta
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame
+from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtGui import QPainter, QPen, QBrush, QColor
+from widgets.donut_widget import DonutWidget
+from utils.date_helpers import (calculate_period_stats, calculate_period_stats_by_type,
+                                sum_day_slices)
+from utils.colors import (ACTIVITY_COLORS, HEATMAP_COLOR, COMPLETED_COLOR,
+                          BACKGROUND_DARK, BORDER_COLOR, TEXT_COLOR, TEXT_SECONDARY)
+
+
+class MonthHeatmap(QWidget):
+    """Calendar grid of the month with each day tinted by planned hours.
+    
+    A strip along the bottom of each cell shows the executed share.
+    Call set_days(first_day, day_totals) with (completed, total) per day.
+    """
+    
+    FULL_DAY_HOURS = 8.0  # Load at which a cell reaches full tint
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.first_day = date.today().replace(day=1)
+        self.day_totals = {}
+        self.setMinimumHeight(260)
+    
+    def set_days(self, first_day, day_totals):
+        """Set the month to show and its per-day (completed, total) hours."""
+        self.first_day = first_day
+        self.day_totals = day_totals
+        self.update()
+    
+    def paintEvent(self, event):
+        """Paint weekday headers and one cell per day."""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        header_height = 20
+        cell_width = self.width() / 7
+        cell_height = (self.height() - header_height) / 6
+        
+        painter.setPen(QPen(TEXT_SECONDARY))
+        for col, name in enumerate(calendar.day_abbr):
+            painter.drawText(QRectF(col * cell_width, 0, cell_width, header_height),
+                             Qt.AlignmentFlag.AlignCenter, name)
+        
+        days_in_month = calendar.monthrange(self.first_day.year, self.first_day.month)[1]
+        offset = self.first_day.weekday()
+        border_pen = QPen(BORDER_COLOR, 1)
+        for day_num in range(days_in_month):
+            day = self.first_day + timedelta(days=day_num)
+            row, col = divmod(offset + day_num, 7)
+            rect = QRectF(col * cell_width + 2, header_height + row * cell_height + 2,
+                          cell_width - 4, cell_height - 4)
+            completed, total = self.day_totals.get(day, (0.0, 0.0))
+            
+            painter.setPen(border_pen)
+            painter.setBrush(QBrush(BACKGROUND_DARK))
+            painter.drawRoundedRect(rect, 4, 4)
+            if total > 0:
+                tint = QColor(HEATMAP_COLOR)
+                tint.setAlphaF(0.25 + 0.75 * min(total / self.FULL_DAY_HOURS, 1.0))
+                painter.setBrush(QBrush(tint))
+                painter.drawRoundedRect(rect, 4, 4)
+                strip = QRectF(rect.left(), rect.bottom() - 4,
+                               rect.width() * min(completed / total, 1.0), 4)
+                painter.fillRect(strip, COMPLETED_COLOR)
+            
+            painter.setPen(QPen(TEXT_COLOR))
+            painter.drawText(rect.adjusted(4, 2, -4, -2),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, str(day.day))
+            if total > 0:
+                painter.drawText(rect.adjusted(4, 2, -4, -6),
+                                 Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignBottom,
+                                 f"{total:.1f}h")
+
+
+class MonthHubView(QWidget):
+    """Month view: heatmap of daily load and completion donuts per type.
+    
+    The summary and donuts read the per-month bucket totals (the
+    controller's aggregates). Day cells are summed on each refresh from one
+    range query over the month, with multi-day activities split across the
+    days they cover.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(15)
+        
+        self.title_label = QLabel()
+        self.title_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        self.summary_label = QLabel()
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.summary_label)
+        
+        donut_frame = QFrame()
+        donut_frame.setFrameShape(QFrame.Shape.StyledPanel)
+        donut_frame.setStyleSheet("""
+            QFrame {
+                background-color: #2d2d2d;
+                border-radius: 8px;
+                padding: 15px;
+            }
+        """)
+        donut_layout = QHBoxLayout(donut_frame)
+        donut_layout.setSpacing(20)
+        donut_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.type_donuts = {}
+        for activity_type, color in ACTIVITY_COLORS.items():
+            donut = DonutWidget(activity_type.capitalize(), color)
+            self.type_donuts[activity_type] = donut
+            donut_layout.addWidget(donut)
+        layout.addWidget(donut_frame)
+        
+        self.heatmap = MonthHeatmap()
+        layout.addWidget(self.heatmap, 1)
+    
+    def update_activities(self, activities, day=None):
+        """Refresh the view for the month containing ``day`` (default today).
+        
+        Args:
+            activities: List of Activity objects, or an indexed source such as
+                ActivityController (range queries and ``aggregates``)
+            day: Any date inside the month to show
+        """
+        first_day = (day or date.today()).replace(day=1)
+        days_in_month = calendar.monthrange(first_day.year, first_day.month)[1]
+        
+        # Multi-day activities count on every day they cover
+        month_start = datetime.combine(first_day, datetime.min.time())
+        day_totals = sum_day_slices(activities, month_start,
+                                    month_start + timedelta(days=days_in_month))
+        self.heatmap.set_days(first_day, day_totals)
+        
+        total, completed, pending, count = calculate_period_stats(activities, "month", first_day)
+        self.title_label.setText(first_day.strftime("%B %Y"))
+        self.summary_label.setText(f"Total: {total:.1f}h   Completed: {completed:.1f}h   "
+                                   f"Pending: {pending:.1f}h   Activities: {count}")
+        
+        for activity_type, donut in self.type_donuts.items():
+            done, planned = calculate_period_stats_by_type(activities, "month", activity_type, first_day)
+            donut.set_values(done, planned)
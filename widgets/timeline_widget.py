@@ -1,13 +1,77 @@
 """Week timeline widget for displaying activities in a timeline view."""
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import Qt, QRectF
-from PyQt6.QtGui import QPainter, QPen, QBrush
+from PyQt6.QtWidgets import QToolTip
+from PyQt6.QtCore import Qt, QEvent, QRect, QRectF, QSize, QTimer, pyqtSignal
+from PyQt6.QtGui import QPainter, QPen, QBrush, QPixmap
 from datetime import datetime, timedelta
+import heapq
+from utils.date_helpers import activities_in_range
+from controllers.events import ActivitiesReset
 from utils.colors import get_activity_color, BACKGROUND_DARKER, BORDER_COLOR, TEXT_COLOR, TEXT_SECONDARY
+from utils.instrumentation import timed
+
+
+def pack_lanes(spans):
+    """Assign overlapping spans to lanes with a sweep line.
+    
+    Spans that transitively overlap form a cluster; within a cluster each
+    span takes the lowest lane that is free at its start, and every span
+    of the cluster shares the cluster's lane count so blocks line up.
+    
+    Args:
+        spans: Iterable of (start, end, key) tuples
+    
+    Returns:
+        list: (key, lane, lane_count) tuples in start order
+    """
+    result = []
+    cluster = []
+    cluster_end = None
+    active = []     # heap of (end, lane) for spans still running
+    free = []       # heap of released lanes
+    lane_count = 0
+    
+    def close_cluster():
+        result.extend((key, lane, lane_count) for key, lane in cluster)
+    
+    for start, end, key in sorted(spans, key=lambda s: (s[0], s[1])):
+        if cluster and start >= cluster_end:
+            close_cluster()
+            cluster, active, free, lane_count = [], [], [], 0
+            cluster_end = None
+        while active and active[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(active)[1])
+        if free:
+            lane = heapq.heappop(free)
+        else:
+            lane = lane_count
+            lane_count += 1
+        heapq.heappush(active, (end, lane))
+        cluster.append((key, lane))
+        cluster_end = end if cluster_end is None else max(cluster_end, end)
+    if cluster:
+        close_cluster()
+    return result
 
 
 class WeekTimelineWidget(QWidget):
-    """Custom widget for displaying week timeline with activities."""
+    """Custom widget for displaying week timeline with activities.
+    
+    The static grid (day labels, row backgrounds, hour ticks) is rendered
+    once into a cached pixmap that is rebuilt only on resize, DPI change
+    or week rollover; each paint blits it and draws the activity blocks.
+    
+    Block geometry is computed by a layout pass (on set_activities, resize
+    or a change to a day) that clips activities to each day and packs
+    overlapping ones into lanes; painting and hit-testing reuse it.
+    """
+    
+    # Emitted with the ID of a double-clicked activity block
+    activity_double_clicked = pyqtSignal(str)
+    
+    HEADER_HEIGHT = 50
+    DAY_HEIGHT = 65  # More spaced
+    DAY_LABEL_WIDTH = 150
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -15,42 +79,127 @@ class WeekTimelineWidget(QWidget):
         self.setMinimumHeight(500)
         self.setMaximumHeight(500)
         
+        self._static_layer = None
+        self._static_key = None
+        self._text_pen = QPen(TEXT_COLOR)
+        self._block_styles = {}  # color rgba -> (brush, border pen)
+        self._layout = [[] for _ in range(7)]  # per day: [(activity, rect, text, brush, pen)]
+        
+        # Roll the week over at Monday midnight instead of asking the clock every paint
+        self._week_timer = QTimer(self)
+        self._week_timer.setSingleShot(True)
+        self._week_timer.timeout.connect(self._on_week_rollover)
+        self._current_week_start = None
+        self._on_week_rollover()
+        
+    @timed("timeline.set_activities")
     def set_activities(self, activities):
-        """Set activities to display on timeline."""
+        """Set activities to display on timeline.
+        
+        Args:
+            activities: List of Activity objects, or an indexed source such as
+                ActivityController (queried per day instead of scanned)
+        """
         self.activities = activities
+        self._layout_days(range(7))
         self.update()
     
-    def paintEvent(self, event):
-        """Paint the timeline and activities."""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Get current week starting at midnight
-        today = datetime.now()
-        week_start = today.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=today.weekday())
+    @timed("timeline.apply_change")
+    def apply_change(self, event):
+        """Re-layout and repaint only the day rows touched by a single-activity change.
         
-        # Dimensions - calculate based on available width
-        width = self.width()
-        day_height = 65  # More spaced
-        header_height = 50
-        day_label_width = 150
-        timeline_x = day_label_width
-        timeline_width = width - day_label_width - 20
-        hour_width = timeline_width / 24
+        A reset lays out the whole week again from the event's source.
         
-        # Draw day rows
+        Args:
+            event: ChangeEvent with ``activity`` and, for updates, ``old``
+        """
+        if isinstance(event, ActivitiesReset):
+            self.set_activities(event.source)
+            return
+        spans = [event.activity]
+        old = getattr(event, "old", None)
+        if old is not None:
+            spans.append(old)
+        week_start = self._week_start()
         for day_idx in range(7):
             day_date = week_start + timedelta(days=day_idx)
             day_end = day_date + timedelta(days=1)
-            y_pos = header_height + day_idx * day_height
-            
-            # DEBUG: Uncomment to see day boundaries
-            # print(f"\n=== Day {day_idx}: {day_date.date()} ===")
-            # print(f"Day range: {day_date} to {day_end}")
+            if any(a.start < day_end and a.end > day_date for a in spans):
+                self._layout_days([day_idx])
+                self.update(self._day_rect(day_idx))
+    
+    def _on_week_rollover(self):
+        """Recompute the current week and schedule the next rollover."""
+        today = datetime.now()
+        self._current_week_start = (today.replace(hour=0, minute=0, second=0, microsecond=0)
+                                    - timedelta(days=today.weekday()))
+        next_week = self._current_week_start + timedelta(days=7)
+        msecs = int((next_week - today).total_seconds() * 1000) + 1000
+        self._week_timer.start(msecs)
+        self._static_key = None
+        self._layout_days(range(7))
+        self.update()
+    
+    def _week_start(self):
+        """Monday 00:00 of the current week."""
+        return self._current_week_start
+    
+    def _day_rect(self, day_idx):
+        """Widget area covered by one day row."""
+        return QRect(0, self.HEADER_HEIGHT + day_idx * self.DAY_HEIGHT, self.width(), self.DAY_HEIGHT)
+    
+    def resizeEvent(self, event):
+        """Drop the cached grid and lay the blocks out for the new width."""
+        self._static_key = None
+        self._layout_days(range(7))
+        super().resizeEvent(event)
+    
+    def _block_style(self, color):
+        """Brush and border pen for an activity color, created once per color."""
+        style = self._block_styles.get(color.rgba())
+        if style is None:
+            style = (QBrush(color), QPen(color.lighter(120), 2))
+            self._block_styles[color.rgba()] = style
+        return style
+    
+    def _timeline_geometry(self):
+        """Return (timeline_x, timeline_width, hour_width) for the current width."""
+        timeline_x = self.DAY_LABEL_WIDTH
+        timeline_width = self.width() - self.DAY_LABEL_WIDTH - 20
+        return timeline_x, timeline_width, timeline_width / 24
+    
+    def _ensure_static_layer(self):
+        """Render the static grid into the cached pixmap if it is out of date."""
+        dpr = self.devicePixelRatioF()
+        key = (self.width(), self.height(), dpr, self._week_start())
+        if key == self._static_key:
+            return
+        pixmap = QPixmap(QSize(int(self.width() * dpr), int(self.height() * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._paint_static_layer(painter)
+        painter.end()
+        self._static_layer = pixmap
+        self._static_key = key
+    
+    def _paint_static_layer(self, painter):
+        """Draw day labels, row backgrounds and hour ticks for the week."""
+        week_start = self._week_start()
+        timeline_x, timeline_width, hour_width = self._timeline_geometry()
+        day_height = self.DAY_HEIGHT
+        border_pen = QPen(BORDER_COLOR, 1)
+        label_pen = QPen(TEXT_SECONDARY)
+        background = QBrush(BACKGROUND_DARKER)
+        
+        for day_idx in range(7):
+            day_date = week_start + timedelta(days=day_idx)
+            y_pos = self.HEADER_HEIGHT + day_idx * day_height
             
             # Draw day label
             day_name = day_date.strftime("%A, %b %d")
-            painter.setPen(QPen(TEXT_COLOR))
+            painter.setPen(self._text_pen)
             painter.drawText(10, y_pos + 25, day_name)
             
             # Draw timeline bar
@@ -58,87 +207,107 @@ class WeekTimelineWidget(QWidget):
             timeline_height = day_height - 20
             
             # Background timeline
-            painter.setBrush(QBrush(BACKGROUND_DARKER))
-            painter.setPen(QPen(BORDER_COLOR, 1))
+            painter.setBrush(background)
+            painter.setPen(border_pen)
             painter.drawRoundedRect(int(timeline_x), int(timeline_y), 
                                    int(timeline_width), int(timeline_height), 8, 8)
             
             # Draw hour markers (every hour)
-            painter.setPen(QPen(BORDER_COLOR, 1))
-            for hour in range(0, 25):
+            for hour in range(0, 24):
                 x = int(timeline_x + hour * hour_width)
                 # Draw small tick marks
-                if hour < 24:
-                    painter.drawLine(x, int(timeline_y), x, int(timeline_y + 5))
-                    # Draw hour labels every 3 hours
-                    if hour % 3 == 0:
-                        painter.setPen(QPen(TEXT_SECONDARY))
-                        painter.drawText(x + 2, int(timeline_y - 8), f"{hour:02d}")
-                        painter.setPen(QPen(BORDER_COLOR, 1))
-            
-            # Draw activities for this day
-            # DEBUG: Uncomment to see activity matching
-            # print(f"\nChecking activities for day range: {day_date} to {day_end}")
-            # for a in self.activities:
-            #     matches = a.start < day_end and a.end > day_date
-            #     print(f"  {a.name}: start={a.start}, end={a.end}, matches={matches}")
-            #     if matches:
-            #         print(f"    -> start < day_end? {a.start} < {day_end} = {a.start < day_end}")
-            #         print(f"    -> end > day_date? {a.end} > {day_date} = {a.end > day_date}")
-            
-            day_activities = [a for a in self.activities 
-                            if a.start < day_end and a.end > day_date]
+                painter.drawLine(x, int(timeline_y), x, int(timeline_y + 5))
+                # Draw hour labels every 3 hours
+                if hour % 3 == 0:
+                    painter.setPen(label_pen)
+                    painter.drawText(x + 2, int(timeline_y - 8), f"{hour:02d}")
+                    painter.setPen(border_pen)
+    
+    def _layout_days(self, day_indexes):
+        """Compute block rects, elided labels and styles for the given days."""
+        week_start = self._week_start()
+        timeline_x, timeline_width, hour_width = self._timeline_geometry()
+        metrics = self.fontMetrics()
+        for day_idx in day_indexes:
+            day_date = week_start + timedelta(days=day_idx)
+            day_end = day_date + timedelta(days=1)
+            timeline_y = self.HEADER_HEIGHT + day_idx * self.DAY_HEIGHT + 10
+            row_top = timeline_y + 4
+            row_height = self.DAY_HEIGHT - 20 - 8
             
-            # DEBUG: Uncomment to see activity count
-            # print(f"Found {len(day_activities)} activities for this day}")
+            # Clip each activity to this day, in hours from midnight
+            spans = []
+            for activity in activities_in_range(self.activities, day_date, day_end):
+                start_hour = (max(activity.start, day_date) - day_date).total_seconds() / 3600.0
+                end_hour = (min(activity.end, day_end) - day_date).total_seconds() / 3600.0
+                spans.append((start_hour, end_hour, activity))
             
-            for activity in day_activities:
-                # Calculate which portion of the activity falls within this day
-                # Use the activity's actual start/end times, but clamp to day boundaries
-                
-                # DEBUG: Uncomment to see activity info
-                # print(f"\n--- Activity: {activity.name} ---")
-                # print(f"Full activity: {activity.start} to {activity.end}")
-                # print(f"Current day: {day_date.date()}")
-                
-                # If activity starts before this day, draw from beginning (hour 0)
-                if activity.start.date() < day_date.date():
-                    start_hour = 0.0
-                    # print(f"Activity starts before this day, using start_hour=0")
-                else:
-                    # Activity starts on this day, use actual hour
-                    start_hour = activity.start.hour + activity.start.minute / 60.0
-                    # print(f"Activity starts on this day at {activity.start.hour}:{activity.start.minute}, start_hour={start_hour:.2f}")
-                
-                # If activity ends after this day, draw to end (hour 24)
-                if activity.end.date() > day_date.date():
-                    end_hour = 24.0
-                    # print(f"Activity ends after this day, using end_hour=24")
-                else:
-                    # Activity ends on this day, use actual hour
-                    end_hour = activity.end.hour + activity.end.minute / 60.0
-                    # print(f"Activity ends on this day at {activity.end.hour}:{activity.end.minute}, end_hour={end_hour:.2f}")
-                
-                duration_hours = end_hour - start_hour
-                # print(f"Drawing from hour {start_hour:.2f} to {end_hour:.2f} (duration: {duration_hours:.2f}h)")
-                
-                # Calculate pixel position
-                act_x = timeline_x + start_hour * hour_width
-                act_width = (end_hour - start_hour) * hour_width
-                act_y = timeline_y + 4
-                act_height = timeline_height - 8
-                
-                # Get color from centralized color scheme
-                color = get_activity_color(activity)
-                
-                # Draw activity block
-                painter.setBrush(QBrush(color))
-                painter.setPen(QPen(color.lighter(120), 2))
-                painter.drawRoundedRect(int(act_x), int(act_y), int(act_width), int(act_height), 5, 5)
-                
-                # Draw activity name (if width allows)
-                if act_width > 40:
-                    painter.setPen(QPen(TEXT_COLOR))
-                    text_rect = QRectF(act_x + 5, act_y, act_width - 10, act_height)
-                    painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-                                   activity.name[:15])
+            blocks = []
+            lanes = pack_lanes((s, e, i) for i, (s, e, _) in enumerate(spans))
+            for i, lane, lane_count in lanes:
+                start_hour, end_hour, activity = spans[i]
+                lane_height = row_height / lane_count
+                rect = QRectF(timeline_x + start_hour * hour_width, row_top + lane * lane_height,
+                              (end_hour - start_hour) * hour_width, lane_height)
+                text = None
+                if rect.width() > 40 and lane_height >= metrics.height():
+                    text = metrics.elidedText(activity.name, Qt.TextElideMode.ElideRight,
+                                              int(rect.width() - 10))
+                brush, pen = self._block_style(get_activity_color(activity))
+                blocks.append((activity, rect, text, brush, pen))
+            self._layout[day_idx] = blocks
+    
+    def activity_at(self, pos):
+        """Return the activity whose block contains ``pos``, or None."""
+        for day_idx in range(7):
+            if self._day_rect(day_idx).contains(pos):
+                # Later blocks are painted on top, so search them first
+                for activity, rect, _, _, _ in reversed(self._layout[day_idx]):
+                    if rect.contains(pos.toPointF()):
+                        return activity
+                return None
+        return None
+    
+    def event(self, event):
+        """Show the hovered activity's name and times as a tooltip."""
+        if event.type() == QEvent.Type.ToolTip:
+            activity = self.activity_at(event.pos())
+            if activity is None:
+                QToolTip.hideText()
+                event.ignore()
+            else:
+                QToolTip.showText(event.globalPos(),
+                                  f"{activity.name}\n{activity.start:%a %H:%M} - {activity.end:%a %H:%M}",
+                                  self)
+            return True
+        return super().event(event)
+    
+    def mouseDoubleClickEvent(self, event):
+        """Emit activity_double_clicked for the block under the cursor."""
+        activity = self.activity_at(event.position().toPoint())
+        if activity is None:
+            super().mouseDoubleClickEvent(event)
+            return
+        self.activity_double_clicked.emit(activity.id)
+    
+    @timed("timeline.paintEvent")
+    def paintEvent(self, event):
+        """Blit the cached grid, then paint the laid-out activity blocks."""
+        self._ensure_static_layer()
+        painter = QPainter(self)
+        dirty = event.rect()
+        # Painting is clipped to the dirty region, so this only copies what changed
+        painter.drawPixmap(0, 0, self._static_layer)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        align = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+        for day_idx in range(7):
+            if not dirty.intersects(self._day_rect(day_idx)):
+                continue
+            for activity, rect, text, brush, pen in self._layout[day_idx]:
+                painter.setBrush(brush)
+                painter.setPen(pen)
+                painter.drawRoundedRect(rect, 5, 5)
+                if text:
+                    painter.setPen(self._text_pen)
+                    painter.drawText(rect.adjusted(5, 0, -5, 0), align, text)
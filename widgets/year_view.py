@@ -0,0 +1,73 @@
+"""Year hub view: one completion donut per month plus the yearly total."""
+import calendar
+from datetime import date
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QFrame
+from PyQt6.QtCore import Qt
+from widgets.donut_widget import DonutWidget
+from utils.date_helpers import calculate_period_stats
+from utils.colors import HEATMAP_COLOR
+
+
+class YearHubView(QWidget):
+    """Year view: 12 monthly donuts (completed vs planned) and a yearly total.
+    
+    Reads per-month and per-year bucket totals, so rendering does not
+    depend on how much history there is.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(15)
+        
+        self.title_label = QLabel()
+        self.title_label.setStyleSheet("font-weight: bold; font-size: 14px;")
+        self.summary_label = QLabel()
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.summary_label)
+        
+        donut_frame = QFrame()
+        donut_frame.setFrameShape(QFrame.Shape.StyledPanel)
+        donut_frame.setStyleSheet("""
+            QFrame {
+                background-color: #2d2d2d;
+                border-radius: 8px;
+                padding: 15px;
+            }
+        """)
+        frame_layout = QHBoxLayout(donut_frame)
+        frame_layout.setSpacing(20)
+        
+        grid = QGridLayout()
+        grid.setSpacing(10)
+        self.month_donuts = []
+        for month in range(1, 13):
+            donut = DonutWidget(calendar.month_abbr[month], HEATMAP_COLOR)
+            self.month_donuts.append(donut)
+            grid.addWidget(donut, (month - 1) // 4, (month - 1) % 4)
+        frame_layout.addLayout(grid)
+        
+        self.year_donut = DonutWidget("Year", HEATMAP_COLOR)
+        frame_layout.addWidget(self.year_donut, 0, Qt.AlignmentFlag.AlignVCenter)
+        layout.addWidget(donut_frame)
+        layout.addStretch()
+    
+    def update_activities(self, activities, day=None):
+        """Refresh the view for the year containing ``day`` (default today).
+        
+        Args:
+            activities: List of Activity objects, or a source exposing
+                ``aggregates`` (e.g. ActivityController)
+            day: Any date inside the year to show
+        """
+        year = (day or date.today()).year
+        for month, donut in enumerate(self.month_donuts, start=1):
+            total, completed, _, _ = calculate_period_stats(activities, "month", date(year, month, 1))
+            donut.set_values(completed, total)
+        
+        total, completed, pending, count = calculate_period_stats(activities, "year", date(year, 1, 1))
+        self.year_donut.set_values(completed, total)
+        self.title_label.setText(str(year))
+        self.summary_label.setText(f"Total: {total:.1f}h   Completed: {completed:.1f}h   "
+                                   f"Pending: {pending:.1f}h   Activities: {count}")